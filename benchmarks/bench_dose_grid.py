@@ -0,0 +1,56 @@
+"""
+Benchmark of the vectorized dose grid against looping the scalar mg calculator.
+
+Both compute the mg of THC inhaled for every percentage, dose and consumption method.
+
+Usage:
+    python benchmarks/bench_dose_grid.py [--products 20000] [--doses 0.1 0.25 0.5 1.0]
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from potparser.helpers import METHOD_COEFFICIENTS, dose_grid, mg_calculator  # noqa: E402
+
+
+def scalar_grid(percentages, doses):
+    return [[[mg_calculator(percentage, dose) * coefficient for coefficient in METHOD_COEFFICIENTS.values()]
+             for dose in doses] for percentage in percentages]
+
+
+def best_of(function, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=20000, help="number of THC percentages (default: 20000)")
+    parser.add_argument("--doses", type=float, nargs="+", default=[0.1, 0.25, 0.5, 1.0], help="doses in grams")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    percentages = [round(rng.uniform(5, 35), 1) for _ in range(args.products)]
+    cells = args.products * len(args.doses) * len(METHOD_COEFFICIENTS)
+
+    scalar = best_of(lambda: scalar_grid(percentages, args.doses))
+    vectorized = best_of(lambda: dose_grid(percentages, args.doses))
+    csv_output = best_of(lambda: dose_grid(percentages, args.doses).write_csv(io.StringIO()), repeat=1)
+
+    print(f"{cells} cells ({args.products} percentages x {len(args.doses)} doses x {len(METHOD_COEFFICIENTS)} methods)")
+    print(f"{'scalar loop':<20}{scalar * 1000:>10.2f} ms")
+    print(f"{'vectorized':<20}{vectorized * 1000:>10.2f} ms  {scalar / vectorized:.1f}x")
+    print(f"{'vectorized + csv':<20}{csv_output * 1000:>10.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
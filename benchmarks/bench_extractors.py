@@ -0,0 +1,63 @@
+"""
+Micro-benchmark of the per-page extraction cost.
+
+Compares evaluating the raw xpath strings on every page (how pages were scraped before the extractor
+registry existed) with the precompiled extractors. Both run on the synthetic pages in benchmarks/fixtures.
+
+Usage:
+    python benchmarks/bench_extractors.py [--repeat N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+from lxml import html
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from potparser.webscrapers.extractors import MISSING_KEY, SiteExtractor, get_extractors, remove_substrings  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def legacy_extract(doc: html.HtmlElement, extractor: SiteExtractor) -> dict:
+    """Extracts the strain information by evaluating the uncompiled xpath strings, one `doc.xpath` call per field."""
+    strain_info = {}
+    for key, xpath in extractor.text_fields.items():
+        elements = doc.xpath(xpath.path)
+        if not elements and key in extractor.fallbacks:
+            elements = doc.xpath(extractor.fallbacks[key].path)
+        strain_info[key] = remove_substrings(elements[0].text_content().strip("\n")) if elements else "None"
+    for key, xpath in extractor.list_fields.items():
+        strain_info[key] = [value.replace('\n', '') for value in doc.xpath(xpath.path)]
+    return strain_info
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="pages extracted per measurement (default: 200)")
+    args = parser.parse_args()
+
+    print(f"{'site':<16}{'page':<24}{'parse (ms)':>12}{'raw xpath (ms)':>16}{'compiled (ms)':>15}{'speedup':>9}")
+    for extractor in get_extractors():
+        site_dir = os.path.join(FIXTURES_DIR, extractor.name.lower())
+        for file_name in sorted(os.listdir(site_dir)):
+            with open(os.path.join(site_dir, file_name), "rb") as f:
+                content = f.read()
+            doc = html.fromstring(content)
+            # The legacy extraction predates the missing fields, the scraped fields have to match
+            extracted = extractor.extract(doc)
+            del extracted[MISSING_KEY]
+            assert legacy_extract(doc, extractor) == extracted
+
+            parse = min(timeit.repeat(lambda: html.fromstring(content), number=args.repeat // 10 or 1, repeat=3))
+            parse /= args.repeat // 10 or 1
+            legacy = min(timeit.repeat(lambda: legacy_extract(doc, extractor), number=args.repeat, repeat=3)) / args.repeat
+            compiled = min(timeit.repeat(lambda: extractor.extract(doc), number=args.repeat, repeat=3)) / args.repeat
+            print(f"{extractor.name:<16}{file_name:<24}{parse * 1000:>12.3f}{legacy * 1000:>16.3f}"
+                  f"{compiled * 1000:>15.3f}{legacy / compiled:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark of the parse throughput on the event loop thread versus a ParsePool.
+
+Every fixture page in benchmarks/fixtures is parsed `--pages` times in total, as concurrent tasks on one
+event loop, the way a batch crawl parses the pages it downloads.
+
+Usage:
+    python benchmarks/bench_parse_pool.py [--pages N] [--workers 1 2 4 8 16]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from potparser.webscrapers.extractors import EXTRACTORS  # noqa: E402
+from potparser.webscrapers.parse_pool import ParsePool  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_pages() -> list:
+    pages = []
+    for extractor in EXTRACTORS.values():
+        site_dir = os.path.join(FIXTURES_DIR, extractor.name.lower())
+        for file_name in sorted(os.listdir(site_dir)):
+            with open(os.path.join(site_dir, file_name), "rb") as f:
+                pages.append((extractor, f.read()))
+    return pages
+
+
+async def parse_all(pages: list, count: int, pool: ParsePool = None) -> float:
+    async def parse(extractor, content):
+        if pool is None:
+            return extractor.parse(content, "utf-8")
+        async with pool.slot():
+            return await pool.parse(extractor, content, "utf-8")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(parse(*pages[i % len(pages)]) for i in range(count)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=900, help="pages parsed per measurement (default: 900)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="worker counts to measure")
+    args = parser.parse_args()
+    pages = load_pages()
+
+    baseline = asyncio.run(parse_all(pages, args.pages))
+    print(f"CPUs: {os.cpu_count()}")
+    print(f"{'mode':<24}{'seconds':>10}{'pages/s':>10}{'speedup':>9}")
+    print(f"{'event loop':<24}{baseline:>10.3f}{args.pages / baseline:>10.0f}{1:>8.2f}x")
+    for processes in (False, True):
+        for workers in args.workers:
+            pool = ParsePool(workers, processes=processes)
+            try:
+                asyncio.run(parse_all(pages, workers, pool))  # start the workers
+                elapsed = asyncio.run(parse_all(pages, args.pages, pool))
+            finally:
+                pool.shutdown()
+            mode = f"{'processes' if processes else 'threads'} x{workers}"
+            print(f"{mode:<24}{elapsed:>10.3f}{args.pages / elapsed:>10.0f}{baseline / elapsed:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark of the streaming comparison report against rendering with tabulate.
+
+- tabulate per strain: `create_strain_info_table` for every strain, like printing every lookup.
+- tabulate report: one tabulate call over the rows of every strain, which holds the whole report in memory.
+- streaming <format>: `REPORT_FORMATS[format]` writing the rows while the strains are generated.
+
+Strains are generated one at a time from the synthetic fixture pages and the output goes to os.devnull, so the peak memory
+(tracemalloc) is what the renderer holds.
+
+Usage:
+    python benchmarks/bench_report.py [--strains 20000]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from server import load_fixtures  # noqa: E402
+from tabulate import tabulate  # noqa: E402
+
+from potparser.helpers import StrainRecord  # noqa: E402
+from potparser.utils import REPORT_FORMATS, create_strain_info_table, report_columns  # noqa: E402
+from potparser.webscrapers.extractors import EXTRACTORS  # noqa: E402
+
+
+def measure(render):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    render()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--strains", type=int, default=20000, help="number of strains in the report (default: 20000)")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures()
+    websites = list(EXTRACTORS)
+    pages = {strain_name: [extractor.parse(fixtures[extractor.name.lower()][strain_name], "utf-8")
+                           for extractor in EXTRACTORS.values()]
+             for strain_name in fixtures["leafly"]}
+    fixture_names = sorted(pages)
+
+    def records(count):
+        for idx in range(count):
+            yield StrainRecord.from_results(f"{fixture_names[idx % len(fixture_names)]}-{idx}", websites,
+                                            pages[fixture_names[idx % len(fixture_names)]])
+
+    columns = report_columns(websites)
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        def tabulate_per_strain():
+            for record in records(args.strains):
+                devnull.write(create_strain_info_table(record))
+
+        def tabulate_report():
+            rows = [[cell(record) for _, cell in columns] for record in records(args.strains)]
+            devnull.write(tabulate(rows, headers=[header for header, _ in columns], tablefmt="simple_grid"))
+
+        results = {"tabulate per strain": measure(tabulate_per_strain), "tabulate report": measure(tabulate_report)}
+        for output_format, renderer in REPORT_FORMATS.items():
+            results[f"streaming {output_format}"] = measure(
+                lambda: renderer(devnull, websites).write_all(records(args.strains)))
+        small_peak, _ = measure(lambda: REPORT_FORMATS["grid"](devnull, websites).write_all(records(args.strains // 10)))
+
+    print(f"{args.strains} strains x {len(websites)} websites")
+    print(f"{'':<22}{'peak memory':>14}{'time':>12}{'strains/s':>12}")
+    for name, (peak, elapsed) in results.items():
+        print(f"{name:<22}{peak / 2 ** 20:>10.2f} MiB{elapsed * 1000:>9.0f} ms{args.strains / elapsed:>12.0f}")
+    print(f"streaming grid peak with {args.strains // 10} strains: {small_peak / 2 ** 20:.2f} MiB")
+
+
+if __name__ == '__main__':
+    main()
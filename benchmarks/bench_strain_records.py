@@ -0,0 +1,78 @@
+"""
+Benchmark of holding a large crawl in memory as StrainRecords against the string dicts of scrape_strain_info.
+
+Every strain gets the results of the three synthetic pages of one fixture strain, so the values repeat
+like they do in a real crawl. Memory is measured with tracemalloc.
+
+Usage:
+    python benchmarks/bench_strain_records.py [--strains 20000]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from server import load_fixtures  # noqa: E402
+
+from potparser.helpers import StrainRecord  # noqa: E402
+from potparser.webscrapers.extractors import EXTRACTORS  # noqa: E402
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--strains", type=int, default=20000, help="number of strains held in memory (default: 20000)")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures()
+    websites = list(EXTRACTORS)
+    pages = {strain_name: [json.dumps(extractor.parse(fixtures[extractor.name.lower()][strain_name], "utf-8"))
+                           for extractor in EXTRACTORS.values()]
+             for strain_name in fixtures["leafly"]}
+    fixture_names = sorted(pages)
+
+    # Decode the results again for every strain, like results arriving from separate lookups
+    def build_dicts():
+        return {f"strain-{idx}": [json.loads(page) for page in pages[fixture_names[idx % len(fixture_names)]]]
+                for idx in range(args.strains)}
+
+    def build_records():
+        return [StrainRecord.from_results(f"strain-{idx}", websites,
+                                          [json.loads(page) for page in pages[fixture_names[idx % len(fixture_names)]]])
+                for idx in range(args.strains)]
+
+    dicts, dict_size, dict_time = measure(build_dicts)
+    records, record_size, record_time = measure(build_records)
+
+    start = time.perf_counter()
+    dict_thc = [max(float(info["THC"].rstrip("%").split("-")[-1]) for info in results) for results in dicts.values()]
+    dict_query = time.perf_counter() - start
+    start = time.perf_counter()
+    record_thc = [record.thc_range[1] for record in records]
+    record_query = time.perf_counter() - start
+    assert dict_thc == record_thc
+
+    print(f"{args.strains} strains x {len(websites)} websites")
+    print(f"{'':<14}{'memory':>12}{'build':>12}{'max THC':>12}")
+    print(f"{'dicts':<14}{dict_size / 2 ** 20:>9.1f} MiB{dict_time * 1000:>9.0f} ms{dict_query * 1000:>9.1f} ms")
+    print(f"{'StrainRecord':<14}{record_size / 2 ** 20:>9.1f} MiB{record_time * 1000:>9.0f} ms{record_query * 1000:>9.1f} ms"
+          f"  {dict_size / record_size:.1f}x less memory")
+
+
+if __name__ == '__main__':
+    main()
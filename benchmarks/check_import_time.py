@@ -0,0 +1,90 @@
+"""
+Import time regression check of the fast start paths.
+
+Runs every scenario in fresh interpreters with `python -X importtime`, and fails if the best run imports more
+than the budget allows or imports a module the scenario must not need:
+
+- package: `import potparser`, the lazy exports must not import the submodules.
+- help: the cold start of `potparser --help`.
+- calculator: the mg calculator menu (`potparser.views.percentage_menu`).
+- query: `potparser query` answering from the strain store, which must not need the scraper.
+
+aiohttp, lxml, tabulate and numpy may only be imported once a command scraping, parsing or rendering a table runs.
+
+Usage:
+    python benchmarks/check_import_time.py [--budget-ms 120] [--runs 5]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Set, Tuple
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+SCENARIOS: Dict[str, str] = {
+    "package": "import potparser",
+    "help": "import sys; sys.argv = ['potparser', '--help']\n"
+            "from potparser.cli import main\n"
+            "try:\n    main()\nexcept SystemExit:\n    pass",
+    "calculator": "from potparser.views.percentage_menu import percentage_menu",
+    "query": "from potparser.helpers import StrainStore\n"
+             "from potparser.views.strain_query import query_strains",
+}
+FORBIDDEN = ["aiohttp", "lxml", "tabulate", "numpy"]
+BUDGET_MS = 120.0
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def measure(code: str) -> Tuple[float, Set[str]]:
+    """
+    Runs the code in a fresh interpreter with -X importtime.
+
+    Returns:
+        Tuple[float, Set[str]]: The milliseconds spent importing from the first potparser module on, and the
+        top-level names of every module imported.
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True,
+                             text=True, check=True)
+    total_us, modules, started = 0, set(), False
+    for line in process.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match is None:
+            continue
+        cumulative, indent, module = int(match.group(2)), match.group(3), match.group(4)
+        started = started or module.startswith("potparser")
+        if started:
+            modules.add(module.split(".")[0])
+            if not indent:
+                total_us += cumulative
+    return total_us / 1000, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS,
+                        help="maximum import milliseconds of every scenario (default: 120)")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per scenario, the best counts (default: 5)")
+    args = parser.parse_args()
+
+    failures: List[str] = []
+    for name, code in SCENARIOS.items():
+        runs = [measure(code) for _ in range(args.runs)]
+        best_ms = min(ms for ms, _ in runs)
+        imported = set().union(*(modules for _, modules in runs))
+        forbidden = [module for module in FORBIDDEN if module in imported]
+        print(f"{name}: {best_ms:.1f} ms (budget {args.budget_ms:.0f} ms)"
+              + (f", imports {', '.join(forbidden)}" if forbidden else ""))
+        if best_ms > args.budget_ms:
+            failures.append(f"{name} took {best_ms:.1f} ms to import, more than the budget of {args.budget_ms:.0f} ms")
+        if forbidden:
+            failures.append(f"{name} imports {', '.join(forbidden)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
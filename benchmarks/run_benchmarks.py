@@ -0,0 +1,251 @@
+"""
+Offline benchmark suite for PotParser.
+
+Runs every scenario against the local stand-in server (benchmarks/server.py) and the synthetic pages in
+benchmarks/fixtures, so no request reaches the real websites:
+
+    single_lookup     latency of looking up one strain at a time over one session
+    batch_throughput  lookups per second of a concurrent batch over one pooled session
+    batch_parse_pool  lookups per second of the same batch parsing on the event loop and on a ParsePool
+    interactive_under_bulk  latency of interactive lookups while a bulk batch fills the same session, without
+                      and with a shared RequestScheduler
+    parse_only        cost of parsing and extracting one page, per website
+    table_render      cost of rendering one strain table with create_strain_info_table, from dicts and from a StrainRecord
+
+The results are written as JSON. Comparing them with the results of an earlier run flags every metric that
+got worse by more than the tolerance and exits with status 1.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--output results.json] [--compare baseline.json] [--tolerance 0.2]
+                                        [--latency 0.02] [--jitter 0.01] [--error-rate 0.0]
+                                        [--parse-workers 4] [--parse-processes] [--bulk-strains 400]
+                                        [--per-host-limit 4]
+"""
+import argparse
+import asyncio
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Dict, Iterator, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from server import StandInServer, load_fixtures  # noqa: E402
+
+from potparser.helpers.strain_record import StrainRecord  # noqa: E402
+from potparser.utils.create_table import create_strain_info_table  # noqa: E402
+from potparser.webscrapers.extractors import EXTRACTORS  # noqa: E402
+from potparser.webscrapers.parse_pool import ParsePool  # noqa: E402
+from potparser.webscrapers.scheduler import BULK, RequestScheduler  # noqa: E402
+from potparser.webscrapers.strain_scraper import create_client_session, scrape_strain_info, scrape_strains_info  # noqa: E402
+
+STRAINS = ["blue-dream", "og-kush", "girl-scout-cookies"]
+
+
+@contextlib.contextmanager
+def stand_in_urls(server: StandInServer) -> Iterator[None]:
+    """Points the registered extractors at the stand-in server for the duration of the block."""
+    original = {site: extractor.url_template for site, extractor in EXTRACTORS.items()}
+    try:
+        for site, url_template in server.url_templates().items():
+            EXTRACTORS[site].url_template = url_template
+        yield
+    finally:
+        for site, url_template in original.items():
+            EXTRACTORS[site].url_template = url_template
+
+
+def percentile(samples: List[float], share: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(share * len(samples)))]
+
+
+def time_per_call(function, number: int) -> float:
+    """Returns the best of three mean durations of `function` in milliseconds."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1000
+
+
+async def single_lookup(server: StandInServer, lookups: int) -> Dict[str, float]:
+    samples = []
+    async with create_client_session() as session:
+        for i in range(lookups):
+            start = time.perf_counter()
+            await scrape_strain_info(STRAINS[i % len(STRAINS)], session)
+            samples.append((time.perf_counter() - start) * 1000)
+    return {"mean_ms": statistics.mean(samples), "p50_ms": percentile(samples, 0.5),
+            "p95_ms": percentile(samples, 0.95), "p99_ms": percentile(samples, 0.99)}
+
+
+async def batch_throughput(server: StandInServer, strains: int, concurrency: int) -> Dict[str, float]:
+    strain_names = [f"{STRAINS[i % len(STRAINS)]}-{i}" for i in range(strains)]
+    requests = server.requests
+    start = time.perf_counter()
+    await scrape_strains_info(strain_names, concurrency=concurrency, per_host_limit=concurrency)
+    elapsed = time.perf_counter() - start
+    return {"total_ms": elapsed * 1000, "lookups_per_s": strains / elapsed,
+            "requests_per_s": (server.requests - requests) / elapsed}
+
+
+async def batch_parse_pool(server: StandInServer, strains: int, concurrency: int, workers: int,
+                           processes: bool) -> Dict[str, float]:
+    results = {"loop_lookups_per_s": (await batch_throughput(server, strains, concurrency))["lookups_per_s"]}
+    pool = ParsePool(workers, processes=processes)
+    try:
+        # Start the workers before measuring, a process pool spawns them on its first pages
+        await scrape_strains_info(STRAINS, concurrency=concurrency, per_host_limit=concurrency, parse_pool=pool)
+        start = time.perf_counter()
+        await scrape_strains_info([f"{STRAINS[i % len(STRAINS)]}-{i}" for i in range(strains)],
+                                  concurrency=concurrency, per_host_limit=concurrency, parse_pool=pool)
+        results["pool_lookups_per_s"] = strains / (time.perf_counter() - start)
+    finally:
+        pool.shutdown()
+    return results
+
+
+async def interactive_under_bulk(server: StandInServer, bulk_strains: int, lookups: int, concurrency: int,
+                                 per_host_limit: int) -> Dict[str, float]:
+    results = {}
+    for mode in ("unscheduled", "scheduled"):
+        scheduler = RequestScheduler(per_host_limit, max_running=concurrency) if mode == "scheduled" else None
+        async with create_client_session(concurrency, per_host_limit) as session:
+            bulk = asyncio.ensure_future(scrape_strains_info(
+                [f"{STRAINS[i % len(STRAINS)]}-{i}" for i in range(bulk_strains)], concurrency=concurrency,
+                session=session, scheduler=scheduler, priority=BULK))
+            await asyncio.sleep(0.05)  # let the batch fill the connection pool
+            samples = []
+            for i in range(lookups):
+                start = time.perf_counter()
+                await scrape_strain_info(STRAINS[i % len(STRAINS)], session, scheduler=scheduler)
+                samples.append((time.perf_counter() - start) * 1000)
+            bulk.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await bulk
+        results[f"{mode}_mean_ms"] = statistics.mean(samples)
+        results[f"{mode}_p95_ms"] = percentile(samples, 0.95)
+    return results
+
+
+def parse_only(number: int) -> Dict[str, float]:
+    results = {}
+    for site, pages in load_fixtures().items():
+        extractor = next(extractor for extractor in EXTRACTORS.values() if extractor.name.lower() == site)
+        for strain_name in STRAINS:
+            results[f"{site}_{strain_name}_ms"] = time_per_call(lambda: extractor.parse(pages[strain_name], "utf-8"), number)
+    return results
+
+
+def table_render(number: int) -> Dict[str, float]:
+    results = {}
+    fixtures = load_fixtures()
+    for strain_name in STRAINS:
+        strain_info = [extractor.parse(fixtures[extractor.name.lower()][strain_name], "utf-8")
+                       for extractor in EXTRACTORS.values()]
+        record = StrainRecord.from_results(strain_name, list(EXTRACTORS), strain_info)
+        results[f"{strain_name}_ms"] = time_per_call(lambda: create_strain_info_table(strain_info, strain_name), number)
+        results[f"{strain_name}_record_ms"] = time_per_call(lambda: create_strain_info_table(record), number)
+    return results
+
+
+async def run_network_scenarios(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    async with StandInServer(args.latency, args.jitter, args.error_rate, seed=0) as server:
+        with stand_in_urls(server):
+            return {
+                "single_lookup": await single_lookup(server, args.lookups),
+                "batch_throughput": await batch_throughput(server, args.strains, args.concurrency),
+                "batch_parse_pool": await batch_parse_pool(server, args.strains, args.concurrency, args.parse_workers,
+                                                           args.parse_processes),
+                "interactive_under_bulk": await interactive_under_bulk(server, args.bulk_strains, args.lookups,
+                                                                       args.concurrency, args.per_host_limit),
+            }
+
+
+def get_version() -> str:
+    try:
+        from importlib.metadata import version
+        return version("potparser")
+    except Exception:
+        return "unknown"
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """
+    Returns a line for every metric that got worse by more than the tolerance.
+    Metrics ending in "_per_s" are better when higher, all others when lower.
+    """
+    regressions = []
+    for scenario, metrics in results.items():
+        for metric, value in metrics.items():
+            old = baseline.get(scenario, {}).get(metric)
+            if not old:
+                continue
+            change = value / old - 1
+            worse = change < -tolerance if metric.endswith("_per_s") else change > tolerance
+            if worse:
+                regressions.append(f"{scenario}.{metric}: {old:.3f} -> {value:.3f} ({change:+.0%})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="file to write the JSON results to (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown per metric (default: 0.2)")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds the stand-in delays every response by")
+    parser.add_argument("--jitter", type=float, default=0.01, help="maximum seconds added to or removed from the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a 503")
+    parser.add_argument("--lookups", type=int, default=30, help="lookups in the single_lookup scenario")
+    parser.add_argument("--strains", type=int, default=300, help="strains in the batch_throughput scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrency of the batch_throughput scenario")
+    parser.add_argument("--parse-workers", type=int, default=4, help="workers of the batch_parse_pool scenario")
+    parser.add_argument("--parse-processes", action="store_true",
+                        help="parse on worker processes instead of threads in the batch_parse_pool scenario")
+    parser.add_argument("--bulk-strains", type=int, default=400, help="strains of the interactive_under_bulk batch")
+    parser.add_argument("--per-host-limit", type=int, default=4,
+                        help="connections per website of the interactive_under_bulk session (default: 4)")
+    parser.add_argument("--number", type=int, default=50, help="calls per measurement in the CPU-bound scenarios")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_network_scenarios(args))
+    results["parse_only"] = parse_only(args.number)
+    results["table_render"] = table_render(args.number)
+
+    report = {
+        "meta": {
+            "potparser": get_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "config": {key: value for key, value in vars(args).items() if key not in {"output", "compare"}},
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Local stand-in for Cannaconnection, Leafly and Wikileaf that serves the synthetic pages in benchmarks/fixtures.
+
+Every website is served under its own path prefix with the same URL scheme as the real website:
+
+    /cannaconnection/strains/{strain_name}
+    /leafly/strains/{strain_name}
+    /wikileaf/strain/{strain_name}/
+
+A strain name with a numeric suffix ("blue-dream-17") is served the page of the strain without it, so batch
+benchmarks can look up many distinct strains. Unknown strains get a 404. Latency, jitter and errors can be injected.
+
+Usage:
+    python benchmarks/server.py [--port 8080] [--latency 0.05] [--jitter 0.02] [--error-rate 0.01]
+"""
+import argparse
+import asyncio
+import os
+import random
+import re
+from typing import Dict, Optional
+
+from aiohttp import web
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# URL templates of the real websites mapped to the path served by the stand-in
+URL_SCHEMES = {
+    "Cannaconnection": "/cannaconnection/strains/{strain_name}",
+    "Leafly": "/leafly/strains/{strain_name}",
+    "Wikileaf": "/wikileaf/strain/{strain_name}/",
+}
+
+
+def load_fixtures(fixtures_dir: str = FIXTURES_DIR) -> Dict[str, Dict[str, bytes]]:
+    """Returns the synthetic fixture pages as {website directory: {strain name: page}}."""
+    fixtures = {}
+    for site in URL_SCHEMES:
+        site_dir = os.path.join(fixtures_dir, site.lower())
+        fixtures[site.lower()] = {}
+        for file_name in os.listdir(site_dir):
+            with open(os.path.join(site_dir, file_name), "rb") as f:
+                fixtures[site.lower()][os.path.splitext(file_name)[0]] = f.read()
+    return fixtures
+
+
+class StandInServer():
+    """
+    An aiohttp server serving the synthetic fixture pages.
+
+    Attributes:
+        latency (float): Seconds every response is delayed by.
+        jitter (float): Maximum seconds added to or removed from the latency, drawn uniformly per request.
+        error_rate (float): Share of requests answered with a 503.
+        site_latency (Dict[str, float]): Seconds added to the latency of a website, by its directory, e.g. {"leafly": 1.0}.
+        requests (int): The number of requests served.
+        bytes_sent (int): The number of page bytes served.
+    """
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0, seed: Optional[int] = None) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.site_latency: Dict[str, float] = {}
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.bytes_sent = 0
+        self._random = random.Random(seed)
+        self._fixtures = load_fixtures()
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application()
+        for path in URL_SCHEMES.values():
+            self.app.router.add_get(path, self._handle)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def url_templates(self) -> Dict[str, str]:
+        """Returns the URL template of every website as served by the stand-in."""
+        return {site: self.base_url + path for site, path in URL_SCHEMES.items()}
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        site = request.path.split("/")[1]
+        delay = self.latency + self.site_latency.get(site, 0.0) + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._random.random() < self.error_rate:
+            return web.Response(status=503, text="Service Unavailable")
+
+        strain_name = request.match_info["strain_name"]
+        pages = self._fixtures[site]
+        page = pages.get(strain_name) or pages.get(re.sub(r"-\d+$", "", strain_name))
+        if page is None:
+            return web.Response(status=404, text="Not Found")
+        self.bytes_sent += len(page)
+        return web.Response(body=page, content_type="text/html", charset="utf-8")
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def __aenter__(self) -> "StandInServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    async with StandInServer(args.latency, args.jitter, args.error_rate, args.host, args.port) as server:
+        for site, url_template in server.url_templates().items():
+            print(f"{site:<16}{url_template}")
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds every response is delayed by")
+    parser.add_argument("--jitter", type=float, default=0.0, help="maximum seconds added to or removed from the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a 503")
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,17 @@
+from ._lazy import attach
+
 __all__ = ['parser']
 
-for module in __all__:
-    exec(f"from .{module} import *")
\ No newline at end of file
+__getattr__, __dir__ = attach(__name__, {
+    'parser': ['PotParser'],
+    'helpers.slug_index': ['SlugIndex'],
+    'helpers.strain_record': ['StrainRecord'],
+    'helpers.strain_store': ['StrainStore'],
+    'helpers.url_formatter': ['create_url_ending_name'],
+    'webscrapers.circuit_breaker': ['CircuitBreakerRegistry'],
+    'webscrapers.extractors': ['get_extractors'],
+    'webscrapers.metrics': ['SiteTiming'],
+    'webscrapers.parse_pool': ['ParsePool'],
+    'webscrapers.response_cache': ['ResponseCache'],
+    'webscrapers.strain_scraper': ['iter_strain_info', 'scrape_strain_info', 'scrape_strains_info'],
+})
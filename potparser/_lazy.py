@@ -0,0 +1,48 @@
+import importlib
+import sys
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def attach(package: str, exports: Dict[str, List[str]]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Creates the module level `__getattr__` and `__dir__` of a package whose public names are imported on first use.
+
+    Importing the package itself then costs nothing, and aiohttp, lxml or tabulate are only imported
+    once a name of a module needing them is used. Names shared by a submodule and one of its functions always
+    refer to the function, whichever way and order the submodules are imported in.
+
+    Args:
+        package (str): The name of the package, i.e. `__name__` of its `__init__`.
+        exports (Dict[str, List[str]]): The submodules (relative to the package, may be dotted) mapped to the names
+            the package exposes from them.
+
+    Returns:
+        Tuple[Callable[[str], Any], Callable[[], List[str]]]: The `__getattr__` and `__dir__` of the package.
+    """
+    origins = {name: module for module, names in exports.items() for name in names}
+    namespace = sys.modules[package].__dict__
+
+    class LazyPackage(ModuleType):
+        def __setattr__(self, name: str, value: Any) -> None:
+            # The import system binds every imported submodule under its own name in the package, whoever imports
+            # it. A function of the same name (e.g. helpers.dose_grid) is bound instead, like a star import would.
+            if isinstance(value, ModuleType) and value.__name__ == f"{package}.{name}" and name in exports.get(name, ()):
+                value = getattr(value, name)
+            super().__setattr__(name, value)
+
+    sys.modules[package].__class__ = LazyPackage
+
+    def __getattr__(name: str) -> Any:
+        module = origins.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        imported = importlib.import_module(f"{package}.{module}")
+        for exported in exports[module]:
+            namespace[exported] = getattr(imported, exported)
+        return namespace[name]
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(origins))
+
+    return __getattr__, __dir__
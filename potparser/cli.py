@@ -1,25 +1,52 @@
 from __future__ import print_function
 
+import argparse
 import sys
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-from .utils import print_help
-from .views.percentage_menu import percentage_menu
-from .views.strain_menu import strain_menu
+from .utils import WRITERS, print_help
+from .helpers import DEFAULT_INDEX_PATH, DEFAULT_STORE_PATH, METHOD_COEFFICIENTS, GENETICS_TYPES, SlugIndex, is_float
+from .webscrapers import DEFAULT_CACHE_PATH, CircuitBreakerRegistry, ResponseCache
 
+if TYPE_CHECKING:
+    from .webscrapers.scheduler import RequestScheduler
 
-def handle_user_input(choice: str) -> bool:
+# Seconds every website gets to answer in the commands running unattended, unless --site-timeout is given
+UNATTENDED_SITE_TIMEOUT = 15.0
+
+# Connections to a single website of the commands without --per-host-limit, like the session default
+DEFAULT_PER_HOST_LIMIT = 10
+
+# The views are imported by the commands using them, so `potparser --help` and the mg calculator start without
+# importing aiohttp, lxml or tabulate.
+
+
+def handle_user_input(choice: str, cache: Optional[ResponseCache] = None, timings: bool = False,
+                      slug_index: Optional[SlugIndex] = None, site_timeout: Optional[float] = None,
+                      deadline: Optional[float] = None, quorum: Optional[int] = None,
+                      breakers: Optional[CircuitBreakerRegistry] = None, scheduler: Optional["RequestScheduler"] = None) -> bool:
     """
     Handles the user's input and executes the corresponding functionality based on the choice.
 
     Args:
         choice (str): The user's input.
+        cache (ResponseCache, optional): The response cache used for strain lookups.
+        timings (bool): Whether to print the timings of every strain lookup.
+        slug_index (SlugIndex, optional): The index resolving strain names per website.
+        site_timeout (float, optional): Seconds every website gets to answer.
+        deadline (float, optional): Seconds a strain lookup may take in total.
+        quorum (int, optional): The number of websites whose answer is enough.
+        breakers (CircuitBreakerRegistry, optional): Circuit breakers that stop requesting a failing website.
+        scheduler (RequestScheduler, optional): The scheduler every request waits for a slot of its website from.
 
     Returns:
         bool: True if the user input was valid and the corresponding functionality executed; False otherwise.
     """
     if choice.strip() == "1":
-        strain_menu()
+        from .views.strain_menu import strain_menu
+        strain_menu(cache, timings, slug_index, site_timeout, deadline, quorum, breakers, scheduler)
     elif choice.strip() == "2":
+        from .views.percentage_menu import percentage_menu
         percentage_menu()
     elif choice.lower().strip() == 'help':
         print_help()
@@ -30,7 +57,9 @@ def handle_user_input(choice: str) -> bool:
     return True
 
 
-def main_menu() -> None:
+def main_menu(cache: Optional[ResponseCache] = None, timings: bool = False, slug_index: Optional[SlugIndex] = None,
+              site_timeout: Optional[float] = None, deadline: Optional[float] = None, quorum: Optional[int] = None,
+              breakers: Optional[CircuitBreakerRegistry] = None, scheduler: Optional["RequestScheduler"] = None) -> None:
     """
     Displays the main menu for the program and handles user input.
 
@@ -40,6 +69,16 @@ def main_menu() -> None:
     If the user types 'exit', the program terminates.
     If the user types any other input, the function prints an error message and displays the menu options again.
 
+    Args:
+        cache (ResponseCache, optional): The response cache used for strain lookups.
+        timings (bool): Whether to print the timings of every strain lookup.
+        slug_index (SlugIndex, optional): The index resolving strain names per website.
+        site_timeout (float, optional): Seconds every website gets to answer.
+        deadline (float, optional): Seconds a strain lookup may take in total.
+        quorum (int, optional): The number of websites whose answer is enough.
+        breakers (CircuitBreakerRegistry, optional): Circuit breakers that stop requesting a failing website.
+        scheduler (RequestScheduler, optional): The scheduler every request waits for a slot of its website from.
+
     Returns:
         None
     """
@@ -47,7 +86,8 @@ def main_menu() -> None:
         print("[1] Fetch strain percentage\n[2] Calculate mg based on percentage")
         choice = input("Enter your choice (1-2): ")
         if choice.isdigit() and int(choice) <= 2:
-            back_to_menu = handle_user_input(choice)
+            back_to_menu = handle_user_input(choice, cache, timings, slug_index, site_timeout, deadline,
+                                             quorum, breakers, scheduler)
             if not back_to_menu:
                 continue
         elif choice.lower().strip() == 'help':
@@ -58,8 +98,457 @@ def main_menu() -> None:
             print("Invalid choice. Please try again.")
 
 
-def main():
-    main_menu()
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parses the command line arguments.
+
+    Args:
+        argv (List[str], optional): The arguments to parse, defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(prog="potparser", description="A strain webscraper")
+    parser.add_argument("--cache", nargs="?", const=DEFAULT_CACHE_PATH, default=None, metavar="PATH",
+                        help=f"cache scraped pages on disk (default path: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--cache-ttl", type=float, default=7 * 24 * 60 * 60, metavar="SECONDS",
+                        help="seconds a cached page is used without revalidation (default: one week)")
+    parser.add_argument("--cache-size", type=int, default=10000, metavar="ENTRIES",
+                        help="maximum number of cached pages (default: 10000)")
+    parser.add_argument("--index", nargs="?", const=DEFAULT_INDEX_PATH, default=None, metavar="PATH",
+                        help="resolve strain names with a slug index built by 'potparser index refresh' "
+                             f"(default path: {DEFAULT_INDEX_PATH})")
+    parser.add_argument("--site-timeout", type=float, default=None, metavar="SECONDS",
+                        help=f"seconds every website gets to answer (default: {UNATTENDED_SITE_TIMEOUT:g} for serve and "
+                             "crawl, no limit otherwise)")
+    parser.add_argument("--deadline", type=float, default=None, metavar="SECONDS",
+                        help="seconds a strain lookup in the menu or the service may take in total, slower websites are left out")
+    parser.add_argument("--quorum", type=int, default=None, metavar="N",
+                        help="return a strain in the menu or the service as soon as N websites answered")
+    parser.add_argument("--timings", action="store_true",
+                        help="print where the time of every strain lookup went under the strain table")
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND",
+                                       help="run a command instead of the interactive menu")
+
+    scrape_parser = subparsers.add_parser(
+        "scrape", help="scrape a list of strains and stream the results",
+        description="Scrapes every strain listed in the input (one name per line) and writes every strain as soon as "
+                    "it is done. Exits with 0 if every strain was found, with 1 if some strains are not known to any "
+                    "website and with 3 if websites did not answer for some strains.")
+    scrape_parser.add_argument("--input", default="-", metavar="FILE",
+                               help="file listing one strain name per line, '-' reads stdin (default)")
+    scrape_parser.add_argument("--output", default="-", metavar="FILE",
+                               help="file to write the results to, '-' writes to stdout (default)")
+    scrape_parser.add_argument("--format", choices=sorted(WRITERS), default="jsonl", help="output format (default: jsonl)")
+    scrape_parser.add_argument("--concurrency", type=int, default=32,
+                               help="maximum number of requests running at the same time (default: 32)")
+    scrape_parser.add_argument("--per-host-limit", type=int, default=8,
+                               help="maximum number of connections to a single website (default: 8)")
+    policy = scrape_parser.add_mutually_exclusive_group()
+    policy.add_argument("--fail-fast", dest="fail_fast", action="store_true",
+                        help="stop at the first strain that was not found or could not be scraped")
+    policy.add_argument("--continue", dest="fail_fast", action="store_false",
+                        help="scrape every strain even if some are not found or fail (default)")
+
+    grid_parser = subparsers.add_parser(
+        "dose-grid", help="calculate the THC content for many percentages, doses and consumption methods",
+        description="Reads one THC percentage per line and writes the mg of THC for every dose and consumption "
+                    "method. Needs NumPy (pip install .[grid]).")
+    grid_parser.add_argument("--input", default="-", metavar="FILE",
+                             help="file listing one THC percentage per line, '-' reads stdin (default)")
+    grid_parser.add_argument("--output", default="-", metavar="FILE",
+                             help="file to write the grid to, '-' writes to stdout (default)")
+    grid_parser.add_argument("--format", choices=["csv", "jsonl"], default="csv", help="output format (default: csv)")
+    grid_parser.add_argument("--doses", type=float, nargs="+", default=[0.1, 0.25, 0.5, 1.0], metavar="GRAMS",
+                             help="doses in grams (default: 0.1 0.25 0.5 1.0)")
+    grid_parser.add_argument("--method", action="append", default=None, metavar="NAME=SHARE",
+                             help="consumption method and the share of THC it delivers, can be repeated "
+                                  f"(default: {', '.join(f'{name}={share:.3f}' for name, share in METHOD_COEFFICIENTS.items())})")
+
+    report_parser = subparsers.add_parser(
+        "report", help="render a comparison report of scraped strains",
+        description="Reads the JSON Lines written by 'potparser scrape' and writes one row per strain with the THC and "
+                    "CBD range and the fields of every website. Rows are written while the input is read, so reports "
+                    "of any size use the same memory.")
+    report_parser.add_argument("--input", default="-", metavar="FILE",
+                               help="JSON Lines written by 'potparser scrape', '-' reads stdin (default)")
+    report_parser.add_argument("--output", default="-", metavar="FILE",
+                               help="file to write the report to, '-' writes to stdout (default)")
+    report_parser.add_argument("--format", choices=["grid", "markdown", "html", "csv"], default="grid",
+                               help="output format (default: grid)")
+    report_parser.add_argument("--width", type=int, default=None,
+                               help="fixed width of every column instead of sampling the widths from the first rows")
+    report_parser.add_argument("--sample", type=int, default=100, metavar="ROWS",
+                               help="number of rows the column widths are sampled from (default: 100)")
+    report_parser.add_argument("--max-width", type=int, default=40,
+                               help="maximum sampled width of a column (default: 40)")
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="run a local HTTP service looking up strains",
+        description="Serves /strain/{name}, /dose?thc=&grams=, /health, /stats and /metrics. Concurrent lookups of the "
+                    "same strain share one scrape and recent results are kept in memory.")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8080, help="port to listen on (default: 8080)")
+    serve_parser.add_argument("--max-entries", type=int, default=1024,
+                              help="maximum number of strains kept in memory (default: 1024)")
+    serve_parser.add_argument("--ttl", type=float, default=600.0, metavar="SECONDS",
+                              help="seconds a strain is served from memory (default: 600)")
+    serve_parser.add_argument("--concurrency", type=int, default=100,
+                              help="maximum number of connections to the websites (default: 100)")
+    serve_parser.add_argument("--per-host-limit", type=int, default=10,
+                              help="maximum number of connections to a single website (default: 10)")
+
+    crawl_parser = subparsers.add_parser(
+        "crawl", help="re-crawl the catalogue and log the strains that changed",
+        description="Crawls every strain of the input and/or the slug index (--index) on every website with conditional "
+                    "requests and appends every strain whose information changed to a JSON Lines change log. An "
+                    "interrupted crawl over the same strains resumes where it stopped.")
+    crawl_parser.add_argument("--input", default=None, metavar="FILE",
+                              help="file listing one strain name per line, '-' reads stdin")
+    # The crawler's default paths are resolved by run_crawl, importing the crawler would import aiohttp
+    crawl_parser.add_argument("--state", default=None, metavar="FILE",
+                              help="crawl state database (default: crawl.sqlite3 in the directory of the default cache)")
+    crawl_parser.add_argument("--changelog", default=None, metavar="FILE",
+                              help="change log to append to (default: changes.jsonl in the directory of the default cache)")
+    crawl_parser.add_argument("--rate", type=float, default=1.0,
+                              help="requests per second sent to every website (default: 1)")
+    crawl_parser.add_argument("--burst", type=float, default=None,
+                              help="requests a website may get at once after being idle (default: 1)")
+    crawl_parser.add_argument("--concurrency", type=int, default=8,
+                              help="maximum number of requests running at the same time (default: 8)")
+    crawl_parser.add_argument("--no-resume", dest="resume", action="store_false",
+                              help="start over instead of resuming an interrupted crawl")
+
+    query_parser = subparsers.add_parser(
+        "query", help="find strains by THC, CBD, genetics, effects or flavours in the local strain store",
+        description="Answers from the local strain store without scraping. The store is filled from the output of "
+                    "'potparser scrape' (--load) or by scraping strain names (--fill), and outdated strains are "
+                    "scraped again with --refresh-older-than. A strain matches a THC or CBD filter if the range "
+                    "of any website reaches it, and every --effect, --flavour and --helps-with must match.")
+    query_parser.add_argument("--db", default=DEFAULT_STORE_PATH, metavar="FILE",
+                              help=f"strain store database (default: {DEFAULT_STORE_PATH})")
+    query_parser.add_argument("--thc-min", type=float, default=None, metavar="PERCENT", help="minimum THC percentage")
+    query_parser.add_argument("--thc-max", type=float, default=None, metavar="PERCENT", help="maximum THC percentage")
+    query_parser.add_argument("--cbd-min", type=float, default=None, metavar="PERCENT", help="minimum CBD percentage")
+    query_parser.add_argument("--cbd-max", type=float, default=None, metavar="PERCENT", help="maximum CBD percentage")
+    query_parser.add_argument("--genetics", choices=GENETICS_TYPES, default=None,
+                              help="genetics type most websites report")
+    query_parser.add_argument("--effect", action="append", default=[], dest="effects",
+                              help="effect the strain must have, e.g. Relaxed (repeatable)")
+    query_parser.add_argument("--flavour", action="append", default=[], dest="flavours",
+                              help="flavour the strain must have, e.g. Citrus (repeatable)")
+    query_parser.add_argument("--helps-with", action="append", default=[],
+                              help="condition the strain must help with, e.g. Stress (repeatable)")
+    query_parser.add_argument("--limit", type=int, default=None, help="maximum number of strains written")
+    query_parser.add_argument("--format", choices=["grid", "markdown", "html", "csv", "jsonl", "names"],
+                              default="grid", help="output format (default: grid)")
+    query_parser.add_argument("--output", default="-", metavar="FILE",
+                              help="file to write the strains to, '-' writes to stdout (default)")
+    query_parser.add_argument("--load", default=None, metavar="FILE",
+                              help="store the strains of JSON Lines written by 'potparser scrape' first, '-' reads stdin")
+    query_parser.add_argument("--fill", default=None, metavar="FILE",
+                              help="scrape the strains of a file listing one name per line into the store first, "
+                                   "'-' reads stdin")
+    query_parser.add_argument("--refresh-older-than", type=float, default=None, metavar="DAYS",
+                              help="scrape the stored strains last scraped more than DAYS ago again first")
+    query_parser.add_argument("--concurrency", type=int, default=100,
+                              help="maximum number of requests running at the same time while scraping (default: 100)")
+
+    index_parser = subparsers.add_parser(
+        "index", help="build or query the slug index",
+        description="Manages the local index of the strain names every website uses. With --index, strain names are "
+                    "resolved against it before any request is sent.")
+    index_commands = index_parser.add_subparsers(dest="index_command", metavar="ACTION", required=True)
+    refresh_parser = index_commands.add_parser("refresh", help="rebuild the index from the sitemaps of the websites")
+    refresh_parser.add_argument("--path", default=DEFAULT_INDEX_PATH, help=f"index file (default: {DEFAULT_INDEX_PATH})")
+    suggest_parser = index_commands.add_parser("suggest", help="print the strain names most similar to a name")
+    suggest_parser.add_argument("name", help="the strain name")
+    suggest_parser.add_argument("--path", default=DEFAULT_INDEX_PATH, help=f"index file (default: {DEFAULT_INDEX_PATH})")
+    suggest_parser.add_argument("--limit", type=int, default=5, help="maximum number of suggestions (default: 5)")
+    args = parser.parse_args(argv)
+    if args.site_timeout is None and args.command in ("serve", "crawl"):
+        args.site_timeout = UNATTENDED_SITE_TIMEOUT
+    return args
+
+
+def parse_methods(methods: Optional[List[str]]) -> Optional[Dict[str, float]]:
+    """
+    Parses "NAME=SHARE" method arguments into a coefficient table.
+
+    Args:
+        methods (List[str], optional): The method arguments.
+
+    Returns:
+        Optional[Dict[str, float]]: The consumption methods mapped to their share, None if no methods were given.
+    """
+    if not methods:
+        return None
+    coefficients = {}
+    for method in methods:
+        name, _, share = method.partition("=")
+        if not name or not is_float(share):
+            raise argparse.ArgumentTypeError(f"invalid method {method!r}, expected NAME=SHARE")
+        coefficients[name] = float(share)
+    return coefficients
+
+
+def create_scheduler(args: argparse.Namespace) -> "RequestScheduler":
+    """
+    Creates the request scheduler shared by every strain lookup of the process, whichever command or menu sends it.
+
+    The slots per website and the overall limit follow the command's --per-host-limit and --concurrency, if it
+    has them. A command only sends requests of one priority class, so no slots are kept for interactive requests.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        RequestScheduler: The scheduler.
+    """
+    from .webscrapers.scheduler import RequestScheduler
+    return RequestScheduler(getattr(args, "per_host_limit", DEFAULT_PER_HOST_LIMIT),
+                            max_running=getattr(args, "concurrency", None), interactive_reserve=0)
+
+
+def run_dose_grid(args: argparse.Namespace) -> int:
+    """
+    Runs the dose-grid command.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        int: The exit code.
+    """
+    try:
+        coefficients = parse_methods(args.method)
+    except argparse.ArgumentTypeError as error:
+        print(error, file=sys.stderr)
+        return 2
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("potparser dose-grid needs NumPy, install it with: pip install .[grid]", file=sys.stderr)
+        return 2
+    from .views.dose_grid_export import export_dose_grid
+    input_file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        return export_dose_grid(input_file, output, args.doses, args.format, coefficients)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output is not sys.stdout:
+            output.close()
+
+
+def run_report(args: argparse.Namespace) -> int:
+    """
+    Runs the report command.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        int: The exit code.
+    """
+    from .views.report_export import export_report
+    input_file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        return export_report(input_file, output, args.format, args.width, args.sample, args.max_width)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output is not sys.stdout:
+            output.close()
+
+
+def run_index(args: argparse.Namespace) -> int:
+    """
+    Runs the index command.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        int: The exit code.
+    """
+    if args.index_command == "refresh":
+        import asyncio
+        from .webscrapers.sitemap_scraper import build_slug_index
+        slug_index = asyncio.run(build_slug_index())
+        if not len(slug_index):
+            print("No website sitemap listed any strain, the index was not written.", file=sys.stderr)
+            return 1
+        slug_index.save(args.path)
+        for site in slug_index.sites:
+            print(f"{site}: {len(slug_index.slugs(site))} strains")
+        print(f"Index written to {args.path}")
+        return 0
+    try:
+        slug_index = SlugIndex.load(args.path)
+    except FileNotFoundError:
+        print(f"No index at {args.path}, build it with: potparser index refresh", file=sys.stderr)
+        return 1
+    for site in slug_index.sites:
+        print(f"{site}: {slug_index.resolve(args.name, site) or '-'}")
+    suggestions = slug_index.suggest_all(args.name, args.limit)
+    if suggestions:
+        print("Similar: " + ", ".join(suggestions))
+    return 0
+
+
+def run_scrape(args: argparse.Namespace, cache: Optional[ResponseCache] = None,
+               slug_index: Optional[SlugIndex] = None, breakers: Optional[CircuitBreakerRegistry] = None,
+               scheduler: Optional["RequestScheduler"] = None) -> int:
+    """
+    Runs the scrape command.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+        cache (ResponseCache, optional): The response cache used for strain lookups.
+        slug_index (SlugIndex, optional): The index resolving strain names per website.
+        breakers (CircuitBreakerRegistry, optional): Circuit breakers that stop requesting a failing website.
+        scheduler (RequestScheduler, optional): The scheduler every request waits for a slot of its website from.
+
+    Returns:
+        int: The exit code.
+    """
+    from .views.batch_scrape import batch_scrape
+    input_file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        return batch_scrape(input_file, output, args.format, args.concurrency, args.per_host_limit,
+                            args.fail_fast, cache, slug_index, args.site_timeout, breakers, scheduler)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output is not sys.stdout:
+            output.close()
+
+
+def run_crawl(args: argparse.Namespace, slug_index: Optional[SlugIndex] = None, scheduler: Optional["RequestScheduler"] = None) -> int:
+    """
+    Runs the crawl command.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+        slug_index (SlugIndex, optional): An index whose strains are crawled.
+        scheduler (RequestScheduler, optional): The scheduler every request waits for a slot of its website from.
+
+    Returns:
+        int: The exit code.
+    """
+    from .views.catalogue_crawl import catalogue_crawl
+    from .webscrapers.crawler import DEFAULT_CHANGELOG_PATH, DEFAULT_STATE_PATH
+    input_file = None
+    if args.input is not None:
+        input_file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        return catalogue_crawl(args.state or DEFAULT_STATE_PATH, args.changelog or DEFAULT_CHANGELOG_PATH, input_file,
+                               slug_index, args.rate, args.burst, args.concurrency, args.site_timeout, args.resume,
+                               scheduler)
+    finally:
+        if input_file is not None and input_file is not sys.stdin:
+            input_file.close()
+
+
+def run_query(args: argparse.Namespace, cache: Optional[ResponseCache] = None,
+              slug_index: Optional[SlugIndex] = None, breakers: Optional[CircuitBreakerRegistry] = None,
+              scheduler: Optional["RequestScheduler"] = None) -> int:
+    """
+    Runs the query command. Strains are only scraped with --fill or --refresh-older-than.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+        cache (ResponseCache, optional): The response cache used for strain lookups.
+        slug_index (SlugIndex, optional): The index resolving strain names per website.
+        breakers (CircuitBreakerRegistry, optional): Circuit breakers that stop requesting a failing website.
+        scheduler (RequestScheduler, optional): The scheduler every request waits for a slot of its website from.
+
+    Returns:
+        int: The exit code.
+    """
+    from .helpers import StrainStore
+    from .views.strain_query import load_records, query_strains
+    store = StrainStore(args.db)
+    try:
+        if args.load is not None:
+            input_file = sys.stdin if args.load == "-" else open(args.load, encoding="utf-8")
+            try:
+                print(f"{load_records(store, input_file)} strains loaded", file=sys.stderr)
+            except ValueError as error:
+                print(f"Invalid input, {error}", file=sys.stderr)
+                return 1
+            finally:
+                if input_file is not sys.stdin:
+                    input_file.close()
+        if args.fill is not None or args.refresh_older_than is not None:
+            from .parser import PotParser
+            strain_names: List[str] = []
+            if args.fill is not None:
+                input_file = sys.stdin if args.fill == "-" else open(args.fill, encoding="utf-8")
+                try:
+                    strain_names = [line.strip() for line in input_file if line.strip()]
+                finally:
+                    if input_file is not sys.stdin:
+                        input_file.close()
+            parser = PotParser(cache=cache, slug_index=slug_index, site_timeout=args.site_timeout, breakers=breakers,
+                               scheduler=scheduler, store=store)
+            max_age = None if args.refresh_older_than is None else args.refresh_older_than * 24 * 60 * 60
+            print(f"{parser.refresh(strain_names, max_age, args.concurrency)} strains scraped", file=sys.stderr)
+        filters = {"min_thc": args.thc_min, "max_thc": args.thc_max, "min_cbd": args.cbd_min, "max_cbd": args.cbd_max,
+                   "genetics": args.genetics, "effects": args.effects, "flavours": args.flavours,
+                   "helps_with": args.helps_with}
+        output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+        try:
+            return query_strains(store, output, args.format, filters, args.limit)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+    finally:
+        store.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    if args.command == "index":
+        sys.exit(run_index(args))
+    slug_index = None
+    if args.index is not None:
+        try:
+            slug_index = SlugIndex.load(args.index)
+        except FileNotFoundError:
+            print(f"No index at {args.index}, build it with: potparser index refresh", file=sys.stderr)
+            sys.exit(2)
+    cache = None
+    if args.cache is not None:
+        cache = ResponseCache(args.cache, args.cache_ttl, args.cache_size)
+    breakers = CircuitBreakerRegistry()
+    scheduler = None if args.command in ("report", "dose-grid") else create_scheduler(args)
+    try:
+        if args.command == "scrape":
+            sys.exit(run_scrape(args, cache, slug_index, breakers, scheduler))
+        if args.command == "crawl":
+            sys.exit(run_crawl(args, slug_index, scheduler))
+        if args.command == "report":
+            sys.exit(run_report(args))
+        if args.command == "query":
+            sys.exit(run_query(args, cache, slug_index, breakers, scheduler))
+        if args.command == "dose-grid":
+            sys.exit(run_dose_grid(args))
+        if args.command == "serve":
+            from .parser import PotParser
+            from .views.strain_service import serve
+            parser = PotParser(cache=cache, slug_index=slug_index, site_timeout=args.site_timeout,
+                               deadline=args.deadline, quorum=args.quorum, breakers=breakers, scheduler=scheduler)
+            serve(parser, args.host, args.port, args.max_entries, args.ttl, args.concurrency, args.per_host_limit)
+            return
+        main_menu(cache, args.timings, slug_index, args.site_timeout, args.deadline, args.quorum, breakers, scheduler)
+    finally:
+        if cache is not None:
+            cache.close()
 
 
 if __name__ == '__main__':
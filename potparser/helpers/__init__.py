@@ -1,4 +1,15 @@
-__all__ = ['float_helpers', 'mg_calculator', 'url_formatter']
+from .._lazy import attach
 
-for module in __all__:
-    exec(f"from .{module} import *")
\ No newline at end of file
+__all__ = ['dose_grid', 'float_helpers', 'mg_calculator', 'slug_index', 'strain_record', 'strain_store', 'url_formatter']
+
+__getattr__, __dir__ = attach(__name__, {
+    'dose_grid': ['DoseGrid', 'dose_grid'],
+    'float_helpers': ['fix_float', 'is_float'],
+    'mg_calculator': ['METHOD_COEFFICIENTS', 'mg_calculator'],
+    'slug_index': ['DEFAULT_INDEX_PATH', 'SlugIndex', 'acronym', 'trigrams'],
+    'strain_record': ['NOT_A_PERCENTAGE', 'PERCENTAGE_PATTERN', 'SourceRecord', 'StrainRecord', 'format_percentage',
+                      'intern_strings', 'parse_percentage'],
+    'strain_store': ['DEFAULT_STORE_PATH', 'GENETICS_TYPES', 'OTHER_KINDS', 'StrainStore', 'genetics_type',
+                     'normalize_term'],
+    'url_formatter': ['create_url_ending_name'],
+})
@@ -0,0 +1,103 @@
+import csv
+import json
+from typing import Dict, Iterator, Optional, Sequence, TextIO, Tuple
+
+from .mg_calculator import METHOD_COEFFICIENTS
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError("The dose grid needs NumPy, install it with: pip install .[grid]") from error
+    return numpy
+
+
+class DoseGrid():
+    """
+    The THC content of every combination of percentage, dose and consumption method, computed in one vectorized pass.
+
+    Attributes:
+        percentages (numpy.ndarray): The THC percentages, shape (P,).
+        doses (numpy.ndarray): The doses in grams, shape (D,).
+        methods (Tuple[str, ...]): The consumption methods, M of them.
+        mg (numpy.ndarray): The mg of THC in every dose, shape (P, D).
+        inhaled (numpy.ndarray): The estimated mg of THC inhaled, shape (P, D, M).
+    """
+    def __init__(self, percentages: Sequence[float], doses: Sequence[float],
+                 coefficients: Optional[Dict[str, float]] = None) -> None:
+        """
+        Args:
+            percentages (Sequence[float]): The THC percentages (e.g. 20 for 20%), one per product.
+            doses (Sequence[float]): The doses in grams.
+            coefficients (Dict[str, float], optional): The consumption methods mapped to the share of THC they deliver,
+                defaults to METHOD_COEFFICIENTS.
+        """
+        numpy = _import_numpy()
+        coefficients = METHOD_COEFFICIENTS if coefficients is None else coefficients
+        self.percentages = numpy.asarray(percentages, dtype=float)
+        self.doses = numpy.asarray(doses, dtype=float)
+        self.methods = tuple(coefficients)
+        # Same formula as mg_calculator, broadcast over every percentage and dose
+        self.mg = self.percentages[:, None] * 10 * self.doses[None, :]
+        self.inhaled = self.mg[:, :, None] * numpy.fromiter(coefficients.values(), dtype=float, count=len(coefficients))
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        """The shape (percentages, doses, methods) of the grid."""
+        return self.inhaled.shape
+
+    @property
+    def loss(self):
+        """The estimated mg of THC lost due to heating, shape (P, D, M)."""
+        return self.mg[:, :, None] - self.inhaled
+
+    def iter_rows(self, chunk_size: int = 4096) -> Iterator[Tuple[float, float, str, float, float, float]]:
+        """
+        Yields the grid row by row, converting `chunk_size` percentages at a time to Python values.
+
+        Yields:
+            Tuple[float, float, str, float, float, float]: The percentage, dose, method, mg in the dose,
+            mg inhaled and mg lost due to heating.
+        """
+        doses = self.doses.tolist()
+        for start in range(0, len(self.percentages), chunk_size):
+            stop = start + chunk_size
+            percentages = self.percentages[start:stop].tolist()
+            mg = self.mg[start:stop].tolist()
+            inhaled = self.inhaled[start:stop].tolist()
+            loss = (self.mg[start:stop, :, None] - self.inhaled[start:stop]).tolist()
+            for p_idx, percentage in enumerate(percentages):
+                for d_idx, dose in enumerate(doses):
+                    for m_idx, method in enumerate(self.methods):
+                        yield (percentage, dose, method, mg[p_idx][d_idx],
+                               inhaled[p_idx][d_idx][m_idx], loss[p_idx][d_idx][m_idx])
+
+    def write_csv(self, output: TextIO) -> None:
+        """Writes the grid as CSV, one row per percentage, dose and method."""
+        writer = csv.writer(output)
+        writer.writerow(["percentage", "dose_g", "method", "thc_mg", "inhaled_mg", "heating_loss_mg"])
+        writer.writerows(self.iter_rows())
+
+    def write_jsonl(self, output: TextIO) -> None:
+        """Writes the grid as JSON Lines, one object per percentage, dose and method."""
+        keys = ("percentage", "dose_g", "method", "thc_mg", "inhaled_mg", "heating_loss_mg")
+        for row in self.iter_rows():
+            output.write(json.dumps(dict(zip(keys, row))) + "\n")
+
+
+def dose_grid(percentages: Sequence[float], doses: Sequence[float],
+              coefficients: Optional[Dict[str, float]] = None) -> DoseGrid:
+    """
+    Calculates the THC content of every combination of percentage, dose and consumption method at once.
+
+    Args:
+        percentages (Sequence[float]): The THC percentages (e.g. 20 for 20%), one per product.
+        doses (Sequence[float]): The doses in grams.
+        coefficients (Dict[str, float], optional): The consumption methods mapped to the share of THC they deliver,
+            defaults to METHOD_COEFFICIENTS.
+
+    Returns:
+        DoseGrid: The grid, its `inhaled` array has the shape (percentages, doses, methods).
+    """
+    return DoseGrid(percentages, doses, coefficients)
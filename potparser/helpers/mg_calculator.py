@@ -1,3 +1,12 @@
+# Share of the THC in the flower that is inhaled, per consumption method
+# reference: https://www.latimes.com/projects/la-me-weed-101-thc-calculator/
+METHOD_COEFFICIENTS = {
+    "Joint": 0.36877076411960132890,
+    "Bong": 0.39867109634551495017,
+    "Vaporizer": 0.54152823920265780731,
+}
+
+
 def mg_calculator(percentage: int, dose: float) -> float:
     """
     Calculate the number of milligrams (mg) in a dose based on the percentage and dose provided.
@@ -10,4 +19,4 @@ def mg_calculator(percentage: int, dose: float) -> float:
         float: The number of milligrams in the dose calculated as percentage * 10 * dose.
     """
     mg = percentage * 10 * dose
-    return mg
\ No newline at end of file
+    return mg
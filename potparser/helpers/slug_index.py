@@ -0,0 +1,180 @@
+import gzip
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .url_formatter import create_url_ending_name
+
+DEFAULT_INDEX_PATH = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+                                  "potparser", "slugs.json.gz")
+
+
+def trigrams(slug: str) -> Set[str]:
+    """
+    Returns the trigrams of a URL ending name, every word padded with spaces like pg_trgm does.
+
+    Args:
+        slug (str): The URL ending name, e.g. "girl-scout-cookies".
+
+    Returns:
+        Set[str]: The trigrams, e.g. {"  g", " gi", "gir", "irl", "rl ", ...}.
+    """
+    grams = set()
+    for word in slug.split("-"):
+        if word:
+            padded = f"  {word} "
+            grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def acronym(slug: str) -> Optional[str]:
+    """Returns the initials of a URL ending name with two or more words, e.g. "gsc" for "girl-scout-cookies"."""
+    words = [word for word in slug.split("-") if word]
+    if len(words) < 2:
+        return None
+    return "".join(word[0] for word in words)
+
+
+class SlugIndex():
+    """
+    A local index of the URL ending names (slugs) every website uses for its strains.
+
+    Strain names are resolved to the slug of each website before any request is sent: an exact slug or
+    an acronym ("GSC" for "girl-scout-cookies"). Names that resolve to nothing on a website need no request
+    to it, similar slugs by trigram similarity are only suggested, since "kush" or "gelato-33" are close to
+    other strains. Websites the index holds no slugs for are scraped with the name as given.
+
+    The index is stored as gzipped JSON holding the sorted slugs of every website.
+    """
+    def __init__(self, sites: Optional[Dict[str, Iterable[str]]] = None, min_score: float = 0.6) -> None:
+        """
+        Args:
+            sites (Dict[str, Iterable[str]], optional): Website names mapped to the slugs they use.
+            min_score (float): The minimum trigram similarity (Dice coefficient, 0 to 1) a suggestion needs.
+        """
+        self.min_score = min_score
+        self._slugs: Dict[str, Set[str]] = {}
+        self._trigrams: Dict[str, Dict[str, List[str]]] = {}
+        self._trigram_counts: Dict[str, Dict[str, int]] = {}
+        self._acronyms: Dict[str, Dict[str, List[str]]] = {}
+        for site, slugs in (sites or {}).items():
+            self.add(site, slugs)
+
+    @property
+    def sites(self) -> List[str]:
+        """The names of the websites in the index."""
+        return list(self._slugs)
+
+    def __len__(self) -> int:
+        return sum(len(slugs) for slugs in self._slugs.values())
+
+    def slugs(self, site: str) -> Set[str]:
+        """Returns the slugs of a website."""
+        return self._slugs.get(site, set())
+
+    def add(self, site: str, slugs: Iterable[str]) -> None:
+        """
+        Adds slugs of a website to the index.
+
+        Args:
+            site (str): The name of the website, e.g. "Leafly".
+            slugs (Iterable[str]): The slugs the website uses.
+        """
+        known = self._slugs.setdefault(site, set())
+        postings = self._trigrams.setdefault(site, {})
+        counts = self._trigram_counts.setdefault(site, {})
+        acronyms = self._acronyms.setdefault(site, {})
+        for slug in slugs:
+            if slug in known:
+                continue
+            known.add(slug)
+            grams = trigrams(slug)
+            counts[slug] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(slug)
+            initials = acronym(slug)
+            if initials is not None:
+                acronyms.setdefault(initials, []).append(slug)
+
+    def suggest(self, strain_name: str, site: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Returns the slugs of a website most similar to a strain name.
+
+        Args:
+            strain_name (str): The strain name as entered, e.g. "Girl Scout Cookie".
+            site (str): The name of the website.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            List[Tuple[str, float]]: The slugs with at least `min_score` similarity (0 to 1), most similar first.
+        """
+        query = trigrams(create_url_ending_name(strain_name))
+        if not query:
+            return []
+        shared: Dict[str, int] = {}
+        postings = self._trigrams.get(site, {})
+        counts = self._trigram_counts.get(site, {})
+        for gram in query:
+            for slug in postings.get(gram, ()):
+                shared[slug] = shared.get(slug, 0) + 1
+        scores = [(slug, 2 * count / (len(query) + counts[slug])) for slug, count in shared.items()]
+        scores = [(slug, score) for slug, score in scores if score >= self.min_score]
+        scores.sort(key=lambda item: (-item[1], item[0]))
+        return scores[:limit]
+
+    def suggest_all(self, strain_name: str, limit: int = 5) -> List[str]:
+        """Returns the slugs of any website most similar to a strain name, most similar first."""
+        scores: Dict[str, float] = {}
+        for site in self._slugs:
+            for slug, score in self.suggest(strain_name, site, limit):
+                scores[slug] = max(score, scores.get(slug, 0.0))
+        return sorted(scores, key=lambda slug: (-scores[slug], slug))[:limit]
+
+    def resolve(self, strain_name: str, site: str) -> Optional[str]:
+        """
+        Resolves a strain name to the slug a website uses for it, by exact name or acronym. Similar names are
+        left to `suggest`, they may well be a different strain.
+
+        Args:
+            strain_name (str): The strain name as entered, e.g. "GSC".
+            site (str): The name of the website.
+
+        Returns:
+            Optional[str]: The slug, the name as URL ending name if the index has no slugs for the website,
+            or None if the website has no matching strain.
+        """
+        slug = create_url_ending_name(strain_name)
+        known = self._slugs.get(site)
+        if not known or slug in known:
+            return slug
+        initials = self._acronyms[site].get(slug.replace("-", ""))
+        if initials:
+            return min(initials, key=len)
+        return None
+
+    def resolve_all(self, strain_name: str, sites: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Resolves a strain name for every given website, see `resolve`."""
+        return {site: self.resolve(strain_name, site) for site in sites}
+
+    def save(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        """Writes the index to a gzipped JSON file."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        data = {"version": 1, "sites": {site: sorted(slugs) for site, slugs in self._slugs.items()}}
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH, min_score: float = 0.6) -> "SlugIndex":
+        """
+        Reads an index written by `save`.
+
+        Args:
+            path (str): The path of the index file.
+            min_score (float): The minimum trigram similarity a suggestion needs.
+
+        Returns:
+            SlugIndex: The index.
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["sites"], min_score)
@@ -0,0 +1,243 @@
+import json
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .float_helpers import fix_float
+
+PERCENTAGE_PATTERN = re.compile(r"\d*\.\d+|\d+")
+
+# Reason a percentage field is missing if the website's text holds no number, e.g. "High"
+NOT_A_PERCENTAGE = "not_a_percentage"
+
+@lru_cache(maxsize=4096)
+def parse_percentage(text: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Parses a percentage or percentage range as scraped from a website. Websites repeat the same texts,
+    so the results are cached.
+
+    Args:
+        text (str, optional): The scraped text, e.g. "19%", "20-25%", "<1%" or "None".
+
+    Returns:
+        Tuple[Optional[float], Optional[float]]: The minimum and maximum percentage, e.g. (20.0, 25.0),
+        or (None, None) if the text holds no number.
+    """
+    if not text or text == "None":
+        return None, None
+    numbers = PERCENTAGE_PATTERN.findall(text.replace(",", "."))
+    if not numbers:
+        return None, None
+    low, high = fix_float(numbers[0]), fix_float(numbers[-1])
+    if text.lstrip().startswith("<"):
+        low = 0.0
+    return min(low, high), max(low, high)
+
+
+def format_percentage(low: Optional[float], high: Optional[float]) -> str:
+    """Formats a percentage range the way the websites show it, e.g. "19%" or "20-25%", and "None" if unknown."""
+    if low is None or high is None:
+        return "None"
+    if low == high:
+        return f"{low:g}%"
+    return f"{low:g}-{high:g}%"
+
+
+@lru_cache(maxsize=4096)
+def _shared_tuple(values: Tuple[str, ...]) -> Tuple[str, ...]:
+    return values
+
+
+def intern_strings(values: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Returns the values as a tuple of interned strings. Equal tuples are shared between records while they are among
+    the most recently used lists, so the memory held for sharing stays bounded.
+    """
+    return _shared_tuple(tuple(sys.intern(value) for value in values))
+
+
+class SourceRecord():
+    """
+    The strain information scraped from one website, with the percentages parsed once into floats.
+
+    The floats serve the ranges and queries, the website's own text (e.g. "<1%" or "High") is kept for display.
+
+    Attributes:
+        site (str): The name of the website, e.g. "Leafly".
+        genetics (str, optional): The genetic lineage, e.g. "Hybrid".
+        thc_min (float, optional), thc_max (float, optional): The THC percentage range.
+        cbd_min (float, optional), cbd_max (float, optional): The CBD percentage range.
+        thc_text (str, optional), cbd_text (str, optional): The THC and CBD percentages as the website wrote them.
+        slug (str, optional): The URL ending name a slug index resolved the strain name to on the website.
+        effects (Tuple[str, ...]): The positive and negative effects.
+        other (Tuple[str, ...]): Additional information like flavours, medical aspects or the suitable time.
+        missing (Tuple[Tuple[str, str], ...]): The missing fields and the reason they are missing.
+    """
+    __slots__ = ("site", "genetics", "thc_min", "thc_max", "cbd_min", "cbd_max", "effects", "other", "missing",
+                 "thc_text", "cbd_text", "slug")
+
+    def __init__(self, site: str, genetics: Optional[str] = None,
+                 thc: Tuple[Optional[float], Optional[float]] = (None, None),
+                 cbd: Tuple[Optional[float], Optional[float]] = (None, None),
+                 effects: Sequence[str] = (), other: Sequence[str] = (),
+                 missing: Iterable[Tuple[str, str]] = (), thc_text: Optional[str] = None,
+                 cbd_text: Optional[str] = None, slug: Optional[str] = None) -> None:
+        self.site = sys.intern(site)
+        self.genetics = None if genetics is None else sys.intern(genetics)
+        self.thc_min, self.thc_max = thc
+        self.cbd_min, self.cbd_max = cbd
+        self.effects = intern_strings(effects)
+        self.other = intern_strings(other)
+        self.missing = tuple(missing)
+        self.thc_text = None if thc_text is None else sys.intern(thc_text)
+        self.cbd_text = None if cbd_text is None else sys.intern(cbd_text)
+        self.slug = slug
+
+    @classmethod
+    def from_strain_info(cls, site: str, strain_info: Dict[str, Any]) -> "SourceRecord":
+        """
+        Creates a record from the strain information of a website as returned by `scrape_strain_info`.
+
+        Args:
+            site (str): The name of the website.
+            strain_info (Dict[str, Any]): The strain information of the website.
+
+        Returns:
+            SourceRecord: The record.
+        """
+        missing = dict(strain_info.get("Missing", {}))
+        percentages = {}
+        texts = {}
+        for key in ("THC", "CBD"):
+            text = strain_info.get(key)
+            texts[key] = text if isinstance(text, str) and text.strip() and text != "None" else None
+            percentages[key] = parse_percentage(texts[key])
+            if percentages[key][0] is None and key not in missing and strain_info.get(key, "None") != "None":
+                missing[key] = NOT_A_PERCENTAGE
+        genetics = strain_info.get("Genetics")
+        effects = strain_info.get("Effects")
+        other = strain_info.get("Other")
+        return cls(site, None if genetics in (None, "None") else genetics, percentages["THC"], percentages["CBD"],
+                   effects if isinstance(effects, (list, tuple)) else (), other if isinstance(other, (list, tuple)) else (),
+                   missing.items(), texts["THC"], texts["CBD"], strain_info.get("Slug"))
+
+    @property
+    def thc(self) -> str:
+        """The THC percentage as the website wrote it, e.g. "THC 18-22%", else the parsed range and "None" if unknown."""
+        return format_percentage(self.thc_min, self.thc_max) if self.thc_text is None else self.thc_text
+
+    @property
+    def cbd(self) -> str:
+        """The CBD percentage as the website wrote it, e.g. "<1%", else the parsed range and "None" if unknown."""
+        return format_percentage(self.cbd_min, self.cbd_max) if self.cbd_text is None else self.cbd_text
+
+    def reason(self, key: str) -> Optional[str]:
+        """Returns why a field ("Genetics", "THC", "CBD", "Effects" or "Other") is missing, or None if it is not."""
+        return next((reason for field, reason in self.missing if field == key), None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the record as a plain dictionary of JSON types."""
+        return {
+            "site": self.site,
+            "genetics": self.genetics,
+            "thc": self.thc_text,
+            "thc_min": self.thc_min,
+            "thc_max": self.thc_max,
+            "cbd": self.cbd_text,
+            "cbd_min": self.cbd_min,
+            "cbd_max": self.cbd_max,
+            "effects": list(self.effects),
+            "other": list(self.other),
+            "missing": dict(self.missing),
+            "slug": self.slug,
+        }
+
+    def to_strain_info(self) -> Dict[str, Union[str, List[str], Dict[str, str]]]:
+        """Returns the record in the dictionary format of `scrape_strain_info`."""
+        return {
+            "Genetics": "None" if self.genetics is None else self.genetics,
+            "THC": self.thc,
+            "CBD": self.cbd,
+            "Effects": list(self.effects),
+            "Other": list(self.other),
+            "Missing": dict(self.missing),
+            **({} if self.slug is None else {"Slug": self.slug}),
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SourceRecord):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"SourceRecord(site={self.site!r}, genetics={self.genetics!r}, thc={self.thc!r}, cbd={self.cbd!r})"
+
+
+class StrainRecord():
+    """
+    The strain information scraped from every website for one strain.
+
+    Attributes:
+        name (str): The name of the strain as looked up.
+        sources (Tuple[SourceRecord, ...]): One record per website, in the order of the websites.
+    """
+    __slots__ = ("name", "sources")
+
+    def __init__(self, name: str, sources: Iterable[SourceRecord]) -> None:
+        self.name = name
+        self.sources = tuple(sources)
+
+    @classmethod
+    def from_results(cls, name: str, websites: Sequence[str], results: Sequence[Dict[str, Any]]) -> "StrainRecord":
+        """
+        Creates a record from the results of `scrape_strain_info`.
+
+        Args:
+            name (str): The name of the strain.
+            websites (Sequence[str]): The names of the websites, in the order of the results.
+            results (Sequence[Dict[str, Any]]): The strain information of every website.
+
+        Returns:
+            StrainRecord: The record.
+        """
+        return cls(name, (SourceRecord.from_strain_info(site, strain_info) for site, strain_info in zip(websites, results)))
+
+    def source(self, site: str) -> Optional[SourceRecord]:
+        """Returns the record of a website, or None if the website was not scraped."""
+        return next((source for source in self.sources if source.site == site), None)
+
+    @property
+    def sites(self) -> List[str]:
+        """The names of the websites, in the order of the sources."""
+        return [source.site for source in self.sources]
+
+    @property
+    def thc_range(self) -> Tuple[Optional[float], Optional[float]]:
+        """The lowest and highest THC percentage any website reports."""
+        lows = [source.thc_min for source in self.sources if source.thc_min is not None]
+        highs = [source.thc_max for source in self.sources if source.thc_max is not None]
+        return (min(lows) if lows else None), (max(highs) if highs else None)
+
+    @property
+    def cbd_range(self) -> Tuple[Optional[float], Optional[float]]:
+        """The lowest and highest CBD percentage any website reports."""
+        lows = [source.cbd_min for source in self.sources if source.cbd_min is not None]
+        highs = [source.cbd_max for source in self.sources if source.cbd_max is not None]
+        return (min(lows) if lows else None), (max(highs) if highs else None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the record as a plain dictionary of JSON types."""
+        return {"strain": self.name, "sources": [source.to_dict() for source in self.sources]}
+
+    def to_json(self) -> str:
+        """Returns the record as a compact JSON string."""
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, StrainRecord):
+            return NotImplemented
+        return self.name == other.name and self.sources == other.sources
+
+    def __repr__(self) -> str:
+        return f"StrainRecord(name={self.name!r}, sources={list(self.sources)!r})"
@@ -0,0 +1,310 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .strain_record import SourceRecord, StrainRecord
+from .url_formatter import create_url_ending_name
+
+DEFAULT_STORE_PATH = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+                                  "potparser", "strains.sqlite3")
+
+GENETICS_TYPES = ("indica", "sativa", "hybrid")
+
+# What the "Other" field of every website lists
+OTHER_KINDS = {"Cannaconnection": "flavour", "Leafly": "helps_with", "Wikileaf": "best_use_time"}
+
+
+def genetics_type(genetics: Optional[str]) -> Optional[str]:
+    """
+    Normalizes a website's genetics text to "indica", "sativa" or "hybrid".
+
+    Args:
+        genetics (str, optional): The scraped text, e.g. "Sativa-dominant (70%)", "Hybrid (60% Indica)" or "55% Indica".
+
+    Returns:
+        Optional[str]: The genetics type, None if the text names none.
+    """
+    if not genetics:
+        return None
+    text = genetics.lower()
+    if "hybrid" in text or ("indica" in text and "sativa" in text):
+        return "hybrid"
+    if "indica" in text:
+        return "indica"
+    if "sativa" in text:
+        return "sativa"
+    return None
+
+
+def normalize_term(term: str) -> str:
+    """Normalizes an effect, flavour or other term for lookups, e.g. " Relaxed " -> "relaxed"."""
+    return " ".join(term.lower().split())
+
+
+class StrainStore():
+    """
+    A local SQLite database of scraped strains, for attribute queries without scraping.
+
+    Every strain is stored with the record of every website. The THC and CBD ranges over all websites and the
+    genetics type most websites agree on are indexed per strain, the effects and the "Other" terms (flavours,
+    "helps with", best use time) per term, so queries like "THC above 20% and Relaxed" are answered from indexes.
+
+    Websites whose record holds no data (e.g. a timeout during a refresh) keep the data stored before.
+    """
+    def __init__(self, path: str = DEFAULT_STORE_PATH) -> None:
+        """
+        Opens (and if needed creates) the store.
+
+        Args:
+            path (str): The path of the SQLite database file, ":memory:" keeps the store in memory.
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA foreign_keys = ON;
+            CREATE TABLE IF NOT EXISTS strains (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE,
+                thc_min REAL,
+                thc_max REAL,
+                cbd_min REAL,
+                cbd_max REAL,
+                genetics_type TEXT,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS sources (
+                strain_id INTEGER NOT NULL REFERENCES strains (id) ON DELETE CASCADE,
+                site TEXT NOT NULL,
+                genetics TEXT,
+                genetics_type TEXT,
+                thc_min REAL,
+                thc_max REAL,
+                cbd_min REAL,
+                cbd_max REAL,
+                effects TEXT NOT NULL,
+                other TEXT NOT NULL,
+                missing TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                thc_text TEXT,
+                cbd_text TEXT,
+                PRIMARY KEY (strain_id, site)
+            );
+            CREATE TABLE IF NOT EXISTS terms (
+                kind TEXT NOT NULL,
+                term TEXT NOT NULL,
+                strain_id INTEGER NOT NULL REFERENCES strains (id) ON DELETE CASCADE,
+                site TEXT NOT NULL,
+                PRIMARY KEY (kind, term, strain_id, site)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS strains_thc_max ON strains (thc_max);
+            CREATE INDEX IF NOT EXISTS strains_thc_min ON strains (thc_min);
+            CREATE INDEX IF NOT EXISTS strains_cbd_max ON strains (cbd_max);
+            CREATE INDEX IF NOT EXISTS strains_cbd_min ON strains (cbd_min);
+            CREATE INDEX IF NOT EXISTS strains_genetics_type ON strains (genetics_type);
+            CREATE INDEX IF NOT EXISTS strains_updated_at ON strains (updated_at);
+            CREATE INDEX IF NOT EXISTS terms_strain ON terms (strain_id, site);
+        """)
+        # Stores created before the websites' percentage texts were kept get the columns, empty until refreshed
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(sources)")}
+        for column in ("thc_text", "cbd_text"):
+            if column not in columns:
+                self._connection.execute(f"ALTER TABLE sources ADD COLUMN {column} TEXT")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM strains").fetchone()[0]
+
+    @staticmethod
+    def _has_data(source: SourceRecord) -> bool:
+        return bool(source.genetics or source.thc_text or source.cbd_text or source.thc_min is not None
+                    or source.cbd_min is not None or source.effects or source.other)
+
+    def _put(self, record: StrainRecord, now: float) -> bool:
+        sources = [source for source in record.sources if self._has_data(source)]
+        if not sources:
+            return False
+        name = create_url_ending_name(record.name)
+        self._connection.execute(
+            "INSERT INTO strains (name, updated_at) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET updated_at = ?",
+            (name, now, now))
+        strain_id = self._connection.execute("SELECT id FROM strains WHERE name = ?", (name,)).fetchone()[0]
+        for source in sources:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sources (strain_id, site, genetics, genetics_type, thc_min, thc_max, cbd_min, "
+                "cbd_max, effects, other, missing, updated_at, thc_text, cbd_text) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (strain_id, source.site, source.genetics, genetics_type(source.genetics), source.thc_min,
+                 source.thc_max, source.cbd_min, source.cbd_max, json.dumps(source.effects, ensure_ascii=False),
+                 json.dumps(source.other, ensure_ascii=False), json.dumps(dict(source.missing)), now,
+                 source.thc_text, source.cbd_text))
+            self._connection.execute("DELETE FROM terms WHERE strain_id = ? AND site = ?", (strain_id, source.site))
+            terms = {("effect", normalize_term(effect)) for effect in source.effects}
+            terms.update((OTHER_KINDS.get(source.site, "other"), normalize_term(other)) for other in source.other)
+            self._connection.executemany("INSERT INTO terms VALUES (?, ?, ?, ?)",
+                                         [(kind, term, strain_id, source.site) for kind, term in terms])
+        self._update_summary(strain_id)
+        return True
+
+    def put(self, record: StrainRecord) -> bool:
+        """
+        Stores the record of a strain under its URL ending name.
+
+        Args:
+            record (StrainRecord): The record, e.g. from `PotParser.get_record`.
+
+        Returns:
+            bool: False if no website of the record holds data and nothing was stored.
+        """
+        with self._lock, self._connection:
+            return self._put(record, time.time())
+
+    def put_all(self, records: Iterable[StrainRecord], batch_size: int = 1000) -> int:
+        """
+        Stores every record, committing once per `batch_size` records.
+
+        Returns:
+            int: The number of records stored.
+        """
+        stored = 0
+        records = iter(records)
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                return stored
+            with self._lock, self._connection:
+                now = time.time()
+                stored += sum(self._put(record, now) for record in batch)
+
+    def _update_summary(self, strain_id: int) -> None:
+        # The ranges and the genetics type over every stored website of the strain
+        rows = self._connection.execute(
+            "SELECT thc_min, thc_max, cbd_min, cbd_max, genetics_type FROM sources WHERE strain_id = ? ORDER BY site",
+            (strain_id,)).fetchall()
+        summary = []
+        for idx, pick in ((0, min), (1, max), (2, min), (3, max)):
+            values = [row[idx] for row in rows if row[idx] is not None]
+            summary.append(pick(values) if values else None)
+        types = Counter(row[4] for row in rows if row[4] is not None).most_common()
+        # A tie between different types means the websites disagree, which makes it a hybrid
+        kind = None if not types else types[0][0] if len(types) == 1 or types[0][1] > types[1][1] else "hybrid"
+        self._connection.execute(
+            "UPDATE strains SET thc_min = ?, thc_max = ?, cbd_min = ?, cbd_max = ?, genetics_type = ? WHERE id = ?",
+            (*summary, kind, strain_id))
+
+    def _records(self, where: str = "", parameters: Sequence[Any] = (), limit: Optional[int] = None) -> List[StrainRecord]:
+        # One join instead of a query per strain, the rows of a strain arrive together and in the order of the strains
+        sql = f"SELECT id, name, thc_max FROM strains {where} ORDER BY thc_max IS NULL, thc_max DESC, name"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        rows = self._connection.execute(
+            "SELECT matches.name, site, genetics, sources.thc_min, sources.thc_max, sources.cbd_min, sources.cbd_max, "
+            f"effects, other, missing, thc_text, cbd_text FROM ({sql}) AS matches JOIN sources ON sources.strain_id = matches.id "
+            "ORDER BY matches.thc_max IS NULL, matches.thc_max DESC, matches.name, site", parameters)
+        # Effect lists and missing fields repeat across strains, every distinct one is decoded once
+        decoded: Dict[str, Any] = {}
+
+        def load(text: str) -> Any:
+            value = decoded.get(text)
+            if value is None:
+                value = decoded[text] = json.loads(text)
+            return value
+
+        records: List[StrainRecord] = []
+        for name, group in groupby(rows, key=itemgetter(0)):
+            records.append(StrainRecord(name, [
+                SourceRecord(site, genetics, (thc_min, thc_max), (cbd_min, cbd_max), load(effects), load(other),
+                             load(missing).items(), thc_text, cbd_text)
+                for _, site, genetics, thc_min, thc_max, cbd_min, cbd_max, effects, other, missing, thc_text, cbd_text
+                in group]))
+        return records
+
+    def get(self, strain_name: str) -> Optional[StrainRecord]:
+        """Returns the stored record of a strain, or None if it is not stored."""
+        with self._lock:
+            records = self._records("WHERE name = ?", (create_url_ending_name(strain_name),))
+        return records[0] if records else None
+
+    def query(self, min_thc: Optional[float] = None, max_thc: Optional[float] = None,
+              min_cbd: Optional[float] = None, max_cbd: Optional[float] = None, genetics: Optional[str] = None,
+              effects: Iterable[str] = (), flavours: Iterable[str] = (), helps_with: Iterable[str] = (),
+              limit: Optional[int] = None) -> List[StrainRecord]:
+        """
+        Returns the stored strains matching every given condition, highest THC first.
+
+        A strain's THC and CBD range spans the lowest and highest percentage any website reports, and it matches
+        a percentage condition if that range reaches it, e.g. `min_thc=20` matches "18-24%".
+
+        Args:
+            min_thc (float, optional): The THC percentage some website reports at least.
+            max_thc (float, optional): The THC percentage some website reports at most.
+            min_cbd (float, optional): The CBD percentage some website reports at least.
+            max_cbd (float, optional): The CBD percentage some website reports at most.
+            genetics (str, optional): "indica", "sativa" or "hybrid", as most websites report it.
+            effects (Iterable[str]): Effects some website lists, all of them must match, e.g. ["Relaxed", "Happy"].
+            flavours (Iterable[str]): Flavours (Cannaconnection's "Other"), all of them must match.
+            helps_with (Iterable[str]): Conditions the strain helps with (Leafly's "Other"), all of them must match.
+            limit (int, optional): The maximum number of strains returned.
+
+        Returns:
+            List[StrainRecord]: The records of the matching strains.
+
+        Raises:
+            ValueError: If `genetics` is not one of GENETICS_TYPES.
+        """
+        conditions, parameters = [], []
+        for column, operator, value in (("thc_max", ">=", min_thc), ("thc_min", "<=", max_thc),
+                                        ("cbd_max", ">=", min_cbd), ("cbd_min", "<=", max_cbd)):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                parameters.append(value)
+        if genetics is not None:
+            if genetics.lower() not in GENETICS_TYPES:
+                raise ValueError(f"genetics must be one of {', '.join(GENETICS_TYPES)}, not {genetics!r}")
+            conditions.append("genetics_type = ?")
+            parameters.append(genetics.lower())
+        for kind, terms in (("effect", effects), ("flavour", flavours), ("helps_with", helps_with)):
+            for term in terms:
+                conditions.append("id IN (SELECT strain_id FROM terms WHERE kind = ? AND term = ?)")
+                parameters.extend((kind, normalize_term(term)))
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        with self._lock:
+            return self._records(where, parameters, limit)
+
+    def sites(self) -> List[str]:
+        """Returns the names of the websites any stored strain has a record of."""
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT DISTINCT site FROM sources ORDER BY site")]
+
+    def stale(self, max_age: float) -> List[str]:
+        """Returns the names of the strains last stored more than `max_age` seconds ago, oldest first."""
+        with self._lock:
+            rows = self._connection.execute("SELECT name FROM strains WHERE updated_at < ? ORDER BY updated_at",
+                                            (time.time() - max_age,))
+            return [row[0] for row in rows]
+
+    def delete(self, strain_name: str) -> None:
+        """Removes a strain from the store."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM strains WHERE name = ?", (create_url_ending_name(strain_name),))
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def info(self) -> Dict[str, Any]:
+        """Returns the number of strains and websites stored and the time of the oldest and newest entry."""
+        with self._lock:
+            strains, oldest, newest = self._connection.execute(
+                "SELECT COUNT(*), MIN(updated_at), MAX(updated_at) FROM strains").fetchone()
+        return {"strains": strains, "sites": self.sites(), "oldest": oldest, "newest": newest}
@@ -1,12 +1,64 @@
 import asyncio
-from typing import Dict, List, Union
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import aiohttp
 
 from .helpers import create_url_ending_name
-from .webscrapers.strain_scraper import scrape_strain_info
+from .helpers.slug_index import SlugIndex
+from .helpers.strain_record import StrainRecord
+from .helpers.strain_store import StrainStore
+from .webscrapers.circuit_breaker import CircuitBreakerRegistry
+from .webscrapers.extractors import get_extractors
+from .webscrapers.metrics import SiteTiming
+from .webscrapers.parse_pool import ParsePool
+from .webscrapers.response_cache import ResponseCache
+from .webscrapers.scheduler import INTERACTIVE, RequestScheduler
+from .webscrapers.strain_scraper import iter_strain_info, scrape_strain_info, scrape_strains_info
 
 
 class PotParser():
     """A scraper for cannabis strain information."""
+    def __init__(self, cache: Optional[ResponseCache] = None, stream: bool = False,
+                 parse_pool: Optional[ParsePool] = None, metrics: Optional[Callable[[SiteTiming], None]] = None,
+                 slug_index: Optional[SlugIndex] = None, site_timeout: Optional[float] = None,
+                 deadline: Optional[float] = None, quorum: Optional[int] = None,
+                 breakers: Optional[CircuitBreakerRegistry] = None, scheduler: Optional[RequestScheduler] = None,
+                 priority: int = INTERACTIVE, store: Optional[StrainStore] = None) -> None:
+        """
+        Args:
+            cache (ResponseCache, optional): A response cache shared by all lookups. Pages are always downloaded if omitted.
+            stream (bool): Whether to parse pages while they are downloaded and stop once every field has been found.
+                The built-in websites' effects have no container, so their pages are read to the end either way.
+            parse_pool (ParsePool, optional): A pool of workers to parse pages on. Pages are parsed on the event loop thread if omitted.
+            metrics (Callable[[SiteTiming], None], optional): A callback receiving the timings, byte count and status of every
+                website's lookup, e.g. a `DictMetricsSink` or a `MetricsRegistry`.
+            slug_index (SlugIndex, optional): An index resolving strain names to the URL ending name of every website,
+                so acronyms and misspellings are found and websites without the strain are not requested.
+            site_timeout (float, optional): Seconds every website gets to answer. Websites are waited for as long as they take if omitted.
+            deadline (float, optional): Seconds a single strain lookup may take in total.
+            quorum (int, optional): The number of websites whose answer is enough for a single strain lookup.
+            breakers (CircuitBreakerRegistry, optional): Circuit breakers that stop requesting a website after repeated failures.
+            scheduler (RequestScheduler, optional): A scheduler every request waits for a slot of its website from. Share one
+                between the parsers of interactive lookups and background batches, so the batches queue behind the lookups.
+            priority (int): The priority class of this parser's requests, INTERACTIVE, PREFETCH or BULK.
+            store (StrainStore, optional): A local strain database every record is saved to, which `query` answers from.
+
+        Fields that could not be scraped are listed under the "Missing" key of every website's result, with the
+        reason, e.g. "timeout", "not_found" or "circuit_open".
+        """
+        self.cache = cache
+        self.stream = stream
+        self.parse_pool = parse_pool
+        self.metrics = metrics
+        self.slug_index = slug_index
+        self.site_timeout = site_timeout
+        self.deadline = deadline
+        self.quorum = quorum
+        self.breakers = breakers
+        self.scheduler = scheduler
+        self.priority = priority
+        self.store = store
+
     def get_strain(self, strain_name: str) -> List[List[Dict[str, Union[str, List[str]]]]]:
         """
         Scrape information on a given cannabis strain.
@@ -19,6 +71,196 @@ class PotParser():
             information on a different aspect of the strain, such as its effects, flavors, and medicinal uses.
             First Dict contains information from Cannaconnection second Dict contains information from Leafly and Dict List contains information from Wikileaf
         """
+        result = asyncio.run(self.aget_strain(strain_name))
+        return result
+
+    def get_strains(self, strain_names: Iterable[str], concurrency: int = 100, per_host_limit: int = 10) -> Dict[str, List[Dict[str, Union[str, List[str]]]]]:
+        """
+        Scrape information on many cannabis strains at once, sharing one pooled HTTP session.
+
+        Args:
+            strain_names (Iterable[str]): The names of the strains to scrape information for.
+            concurrency (int): The maximum number of requests running at the same time.
+            per_host_limit (int): The maximum number of connections open to a single website.
+
+        Returns:
+            Dict[str, List[Dict[str, Union[str, List[str]]]]]: A dictionary mapping every strain name to the
+            same list of dictionaries `get_strain` returns for it.
+        """
+        return asyncio.run(self.aget_strains(strain_names, concurrency=concurrency, per_host_limit=per_host_limit))
+
+    async def aget_strain(self, strain_name: str, session: Optional[aiohttp.ClientSession] = None) -> List[Dict[str, Union[str, List[str]]]]:
+        """
+        Scrape information on a given cannabis strain from within a running event loop.
+
+        Args:
+            strain_name (str): The name of the strain to scrape information for.
+            session (aiohttp.ClientSession, optional): A session owned by the caller to send the requests with.
+
+        Returns:
+            List[Dict[str, Union[str, List[str]]]]: The same list of dictionaries `get_strain` returns.
+        """
         url_name = create_url_ending_name(strain_name)
-        result = asyncio.run(scrape_strain_info(url_name))
-        return result
\ No newline at end of file
+        return await scrape_strain_info(url_name, session, self.cache, self.stream, self.parse_pool, self.metrics,
+                                        self.slug_index, self.site_timeout, self.deadline, self.quorum, self.breakers,
+                                        self.scheduler, self.priority)
+
+    def get_record(self, strain_name: str) -> StrainRecord:
+        """
+        Scrape information on a given cannabis strain into a compact record with the percentages parsed.
+
+        Args:
+            strain_name (str): The name of the strain to scrape information for.
+
+        Returns:
+            StrainRecord: One SourceRecord per website, in the order `get_strain` returns them.
+        """
+        return asyncio.run(self.aget_record(strain_name))
+
+    def get_records(self, strain_names: Iterable[str], concurrency: int = 100, per_host_limit: int = 10) -> Dict[str, StrainRecord]:
+        """
+        Scrape information on many cannabis strains at once into compact records, see `get_record`.
+
+        Args:
+            strain_names (Iterable[str]): The names of the strains to scrape information for.
+            concurrency (int): The maximum number of requests running at the same time.
+            per_host_limit (int): The maximum number of connections open to a single website.
+
+        Returns:
+            Dict[str, StrainRecord]: A dictionary mapping every strain name to its record.
+        """
+        return asyncio.run(self.aget_records(strain_names, concurrency=concurrency, per_host_limit=per_host_limit))
+
+    async def aget_record(self, strain_name: str, session: Optional[aiohttp.ClientSession] = None) -> StrainRecord:
+        """The coroutine version of `get_record`, accepting a session owned by the caller."""
+        websites = [extractor.name for extractor in get_extractors()]
+        record = StrainRecord.from_results(strain_name, websites, await self.aget_strain(strain_name, session))
+        if self.store is not None:
+            self.store.put(record)
+        return record
+
+    async def aget_records(self, strain_names: Iterable[str], session: Optional[aiohttp.ClientSession] = None,
+                           concurrency: int = 100, per_host_limit: int = 10) -> Dict[str, StrainRecord]:
+        """The coroutine version of `get_records`, accepting a session owned by the caller."""
+        websites = [extractor.name for extractor in get_extractors()]
+        results = await self.aget_strains(strain_names, session, concurrency, per_host_limit)
+        records = {strain_name: StrainRecord.from_results(strain_name, websites, strain_results)
+                   for strain_name, strain_results in results.items()}
+        if self.store is not None:
+            self.store.put_all(records.values())
+        return records
+
+    def query(self, min_thc: Optional[float] = None, max_thc: Optional[float] = None,
+              min_cbd: Optional[float] = None, max_cbd: Optional[float] = None, genetics: Optional[str] = None,
+              effects: Iterable[str] = (), flavours: Iterable[str] = (), helps_with: Iterable[str] = (),
+              limit: Optional[int] = None) -> List[StrainRecord]:
+        """
+        Find strains by their attributes in the local store, without scraping. See `StrainStore.query`.
+
+        Args:
+            min_thc (float, optional), max_thc (float, optional): The THC percentage range, e.g. `min_thc=20`.
+            min_cbd (float, optional), max_cbd (float, optional): The CBD percentage range.
+            genetics (str, optional): "indica", "sativa" or "hybrid".
+            effects (Iterable[str]): Effects the strains must have, e.g. ["Relaxed"].
+            flavours (Iterable[str]): Flavours the strains must have, e.g. ["Citrus"].
+            helps_with (Iterable[str]): Conditions the strains must help with, e.g. ["Stress"].
+            limit (int, optional): The maximum number of strains returned.
+
+        Returns:
+            List[StrainRecord]: The stored records of the matching strains, highest THC first.
+        """
+        if self.store is None:
+            raise ValueError("querying strains needs a parser with a store, e.g. PotParser(store=StrainStore())")
+        return self.store.query(min_thc, max_thc, min_cbd, max_cbd, genetics, effects, flavours, helps_with, limit)
+
+    def refresh(self, strain_names: Optional[Iterable[str]] = None, max_age: Optional[float] = None,
+                concurrency: int = 100, per_host_limit: int = 10) -> int:
+        """
+        Scrape strains into the local store, to fill it or to bring outdated entries up to date.
+
+        Args:
+            strain_names (Iterable[str], optional): The names of the strains to scrape.
+            max_age (float, optional): Also scrape every stored strain last scraped more than this many seconds ago.
+            concurrency (int): The maximum number of requests running at the same time.
+            per_host_limit (int): The maximum number of connections open to a single website.
+
+        Returns:
+            int: The number of strains stored, strains no website knows are not stored.
+        """
+        if self.store is None:
+            raise ValueError("refreshing strains needs a parser with a store, e.g. PotParser(store=StrainStore())")
+        names = dict.fromkeys(strain_names or ())
+        if max_age is not None:
+            names.update(dict.fromkeys(self.store.stale(max_age)))
+        if not names:
+            return 0
+        websites = [extractor.name for extractor in get_extractors()]
+        results = self.get_strains(names, concurrency=concurrency, per_host_limit=per_host_limit)
+        return self.store.put_all(StrainRecord.from_results(strain_name, websites, strain_results)
+                                  for strain_name, strain_results in results.items())
+
+    def suggest(self, strain_name: str, limit: int = 5) -> List[str]:
+        """
+        Suggest strain names similar to a given one, using the slug index.
+
+        Args:
+            strain_name (str): The strain name, e.g. a misspelled one.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            List[str]: The URL ending names of the most similar strains of every website, most similar first.
+            Empty if the parser has no slug index.
+        """
+        if self.slug_index is None:
+            return []
+        return self.slug_index.suggest_all(strain_name, limit)
+
+    async def aget_strains(self, strain_names: Iterable[str], session: Optional[aiohttp.ClientSession] = None,
+                           concurrency: int = 100, per_host_limit: int = 10) -> Dict[str, List[Dict[str, Union[str, List[str]]]]]:
+        """
+        Scrape information on many cannabis strains at once from within a running event loop.
+
+        Args:
+            strain_names (Iterable[str]): The names of the strains to scrape information for.
+            session (aiohttp.ClientSession, optional): A session owned by the caller to send the requests with.
+                A pooled session is created if omitted.
+            concurrency (int): The maximum number of requests running at the same time.
+            per_host_limit (int): The maximum number of connections open to a single website, if the session is created here.
+
+        Returns:
+            Dict[str, List[Dict[str, Union[str, List[str]]]]]: The same dictionary `get_strains` returns.
+        """
+        url_names = {strain_name: create_url_ending_name(strain_name) for strain_name in strain_names}
+        results = await scrape_strains_info(url_names.values(), concurrency, per_host_limit, self.cache, self.stream,
+                                            session, self.parse_pool, self.metrics, self.slug_index, self.site_timeout,
+                                            self.breakers, self.scheduler, self.priority)
+        return {strain_name: results[url_name] for strain_name, url_name in url_names.items()}
+
+    async def iter_strains(self, strain_names: Iterable[str], session: Optional[aiohttp.ClientSession] = None,
+                           concurrency: int = 100, per_host_limit: int = 10) -> AsyncIterator[Tuple[str, str, Dict[str, Union[str, List[str]]]]]:
+        """
+        Scrape information on many cannabis strains at once and yield every website's result as soon as it is done.
+
+        Args:
+            strain_names (Iterable[str]): The names of the strains to scrape information for.
+            session (aiohttp.ClientSession, optional): A session owned by the caller to send the requests with.
+                A pooled session is created if omitted.
+            concurrency (int): The maximum number of requests running at the same time.
+            per_host_limit (int): The maximum number of connections open to a single website, if the session is created here.
+
+        Yields:
+            Tuple[str, str, Dict[str, Union[str, List[str]]]]: The strain name, the website name
+            (e.g. "Leafly") and the information scraped from that website.
+        """
+        strain_names_by_url_name: Dict[str, List[str]] = {}
+        for strain_name in strain_names:
+            strain_names_by_url_name.setdefault(create_url_ending_name(strain_name), []).append(strain_name)
+        results = iter_strain_info(strain_names_by_url_name, session, concurrency, per_host_limit, self.cache,
+                                   self.stream, self.parse_pool, self.metrics, self.slug_index, self.site_timeout,
+                                   self.breakers, self.scheduler, self.priority)
+        try:
+            async for url_name, website, strain_info in results:
+                for strain_name in strain_names_by_url_name[url_name]:
+                    yield strain_name, website, strain_info
+        finally:
+            await results.aclose()
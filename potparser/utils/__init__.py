@@ -1,4 +1,12 @@
-__all__ = ['create_table', 'help_printer']
+from .._lazy import attach
 
-for module in __all__:
-    exec(f"from .{module} import *")
\ No newline at end of file
+__all__ = ['create_table', 'help_printer', 'report_renderer', 'strain_writers']
+
+__getattr__, __dir__ = attach(__name__, {
+    'create_table': ['OTHER_LABELS', 'create_mg_info_table', 'create_strain_info_table', 'create_timings_table',
+                     'missing_text'],
+    'help_printer': ['MESSAGE', 'print_help'],
+    'report_renderer': ['CsvReport', 'GridReport', 'HtmlReport', 'MarkdownReport', 'REPORT_FORMATS', 'ReportRenderer',
+                        'report_columns'],
+    'strain_writers': ['CsvWriter', 'FIELDS', 'JsonLinesWriter', 'WRITERS'],
+})
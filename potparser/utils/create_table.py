@@ -1,27 +1,54 @@
-from tabulate import tabulate
+from typing import Any, Dict, List, Union
 
-from ..helpers import mg_calculator
+from ..helpers import METHOD_COEFFICIENTS, SourceRecord, StrainRecord, mg_calculator
 
 
-def create_strain_info_table(strain_scraper_result, strain_name: str = "") -> str:
+# Label of the "Other" field of every website
+OTHER_LABELS = {"Cannaconnection": "Flavour:", "Leafly": "Helps with:", "Wikileaf": "Best use time:"}
+
+
+def _render(table: List[List[Any]], headers: List[str]) -> str:
+    # tabulate is imported on the first table, so the menus start without it
+    from tabulate import tabulate
+    return tabulate(table, headers=headers, tablefmt="simple_grid")
+
+
+def missing_text(source: SourceRecord, key: str) -> str:
+    """
+    The table text of a field missing from a website, "None" if the page simply does not hold it,
+    else "None" with the reason, e.g. "None (timeout)".
+
+    Args:
+        source (SourceRecord): The record of the website.
+        key (str): The field, "Genetics", "THC", "CBD", "Effects" or "Other".
+
+    Returns:
+        str: The text shown in place of the field.
+    """
+    reason = source.reason(key)
+    if reason is None or reason == "not_on_page":
+        return "None"
+    return f"None ({reason.replace('_', ' ')})"
+
+
+def create_strain_info_table(strain_scraper_result: Union[StrainRecord, List[Dict[str, Any]]], strain_name: str = "") -> str:
     """
     Given a strain name and its web scraper results, create a table with the following headers:
     - Strain Name (formatted with titlecase and spaces instead of dashes)
-    - Cannaconnection
-    - Leafly
-    - Wikileaf
+    - One column per website, e.g. Cannaconnection, Leafly and Wikileaf
 
     The table includes information about genetics, THC/CBD content, effects, and other attributes of the strain.
+    Fields that could not be scraped show why, e.g. "None (timeout)". The results are not modified.
 
     Args:
-    - strain_name: a string representing the name of the strain
-    - strain_scraper_result: a list of 3 dictionaries, each containing information about the strain
+    - strain_scraper_result: a StrainRecord, or a list of dictionaries (one per registered website) as returned by scrape_strain_info
+    - strain_name: a string representing the name of the strain, defaults to the name of the StrainRecord
 
     Returns:
     - A formatted string containing the table with the strain information
 
     Example usage:
-    >>> result = create_strain_info_table("blue-dream", [{'Genetics': 'Sativa-dominant (70%)', 'THC': '19%', 'CBD': '0.1%', 'Effects': ['Motivated', 'Sociable', 'Cerebral'], 'Other': ['Berry', 'Sweet', 'Herbal', 'Pine']}, {'Genetics': 'Hybrid', 'THC': '18%', 'CBD': '0%', 'Effects': ['Creative', 'Uplifted', 'Energetic', 'Dry mouth', 'Paranoid', 'Dry eyes'], 'Other': ['Stress', 'Anxiety', 'Depression']}, {'Genetics': '60% Sativa', 'THC': '24%', 'CBD': '1%', 'Effects': ['Creative', 'Relaxed', 'Energetic'], 'Other': ['Afternoon']}])
+    >>> result = create_strain_info_table([{'Genetics': 'Sativa-dominant (70%)', 'THC': '19%', 'CBD': '0.1%', 'Effects': ['Motivated', 'Sociable', 'Cerebral'], 'Other': ['Berry', 'Sweet', 'Herbal', 'Pine']}, {'Genetics': 'Hybrid', 'THC': '18%', 'CBD': '0%', 'Effects': ['Creative', 'Uplifted', 'Energetic', 'Dry mouth', 'Paranoid', 'Dry eyes'], 'Other': ['Stress', 'Anxiety', 'Depression']}, {'Genetics': '60% Sativa', 'THC': '24%', 'CBD': '1%', 'Effects': ['Creative', 'Relaxed', 'Energetic'], 'Other': ['Afternoon']}], "blue-dream")
     >>> print(result)
     ┌──────────────┬───────────────────────┬─────────────┬────────────────┐
     │ Blue Dream   │ Cannaconnection       │ Leafly      │ Wikileaf       │
@@ -46,25 +73,28 @@ def create_strain_info_table(strain_scraper_result, strain_name: str = "") -> st
     │              │ Pine                  │             │                │
     └──────────────┴───────────────────────┴─────────────┴────────────────┘
     """
-    # Join lists as strings in the dictionary
-    for idx, values in enumerate(strain_scraper_result):
-        for key, value in values.items():
-            if isinstance(value, list):
-                if idx == 0 and key == "Other":
-                    values[key] = "Flavour:\n" + "\n".join(value)
-                elif idx == 1 and key == "Other":
-                    values[key] = "Helps with:\n" + "\n".join(value)
-                elif idx == 2 and key == "Other":
-                    values[key] = "Best use time:\n" + "\n".join(value)
-                else:
-                    values[key] = "\n".join(value)
-
-    # Create the table from the dictionary
-    headers = [strain_name.replace(
-        "-", " ").title(), "Cannaconnection", "Leafly", "Wikileaf"]
-    table = [[key]+[value.get(key) for value in strain_scraper_result]
-             for key in ['Genetics', 'THC', 'CBD', 'Effects', 'Other']]
-    return tabulate(table, headers=headers, tablefmt="simple_grid")
+    if isinstance(strain_scraper_result, StrainRecord):
+        record = strain_scraper_result
+    else:
+        from ..webscrapers.extractors import get_extractors  # lxml is only needed for the dict input
+        websites = [extractor.name for extractor in get_extractors()]
+        record = StrainRecord.from_results(strain_name, websites, strain_scraper_result)
+
+    rows = {"Genetics": [], "THC": [], "CBD": [], "Effects": [], "Other": []}
+    for source in record.sources:
+        rows["Genetics"].append(source.genetics or missing_text(source, "Genetics"))
+        rows["THC"].append(missing_text(source, "THC") if source.thc == "None" else source.thc)
+        rows["CBD"].append(missing_text(source, "CBD") if source.cbd == "None" else source.cbd)
+        rows["Effects"].append("\n".join(source.effects) if source.effects else missing_text(source, "Effects"))
+        if source.other:
+            label = OTHER_LABELS.get(source.site)
+            rows["Other"].append("\n".join((label, *source.other) if label else source.other))
+        else:
+            rows["Other"].append(missing_text(source, "Other"))
+
+    headers = [(strain_name or record.name).replace("-", " ").title(), *record.sites]
+    table = [[key, *values] for key, values in rows.items()]
+    return _render(table, headers)
 
 
 def create_mg_info_table(percentage: int, amount: float) -> str:
@@ -81,13 +111,29 @@ def create_mg_info_table(percentage: int, amount: float) -> str:
     """
     mg: float = mg_calculator(percentage, amount)
 
-    # reference: https://www.latimes.com/projects/la-me-weed-101-thc-calculator/
-    joint: float = mg * 0.36877076411960132890
-    bong: float = mg * 0.39867109634551495017
-    vaporizer: float = mg * 0.54152823920265780731
-
     headers = [f"THC: {percentage}%", "Estimated THC\ninhaled (mg)",
                "THC loss due\nto heating (mg)"]
-    table = [["Joint", f"{joint:9.0f}", f"{mg-joint:9.0f}"],
-             ["Bong", f"{bong:9.0f}", f"{mg-bong:9.0f}"], ["Vaporizer", f"{vaporizer:9.0f}", f"{mg-vaporizer:9.0f}"]]
-    return tabulate(table, headers=headers, tablefmt="simple_grid")
+    table = []
+    for method, coefficient in METHOD_COEFFICIENTS.items():
+        inhaled: float = mg * coefficient
+        table.append([method, f"{inhaled:9.0f}", f"{mg-inhaled:9.0f}"])
+    return _render(table, headers)
+
+
+def create_timings_table(timings: List[Dict[str, Any]]) -> str:
+    """
+    Generate a table breaking down where the time of a strain lookup went, one row per website.
+
+    Args:
+        timings (List[Dict[str, Any]]): The timings of every website as returned by `SiteTiming.as_dict`.
+
+    Returns:
+        str: A formatted table with the status, page size and duration of every phase in milliseconds.
+    """
+    headers = ["Website", "Status", "KiB", "Queue", "DNS", "Connect", "TTFB", "Download", "Parse", "Total (ms)"]
+    table = []
+    for timing in timings:
+        status = "cached" if timing["cache"] == "hit" else timing["status"] or timing.get("error")
+        table.append([timing["site"], status, f"{timing['bytes'] / 1024:.1f}"] +
+                     [f"{timing[phase] * 1000:.1f}" for phase in ("queue", "dns", "connect", "ttfb", "download", "parse", "total")])
+    return _render(table, headers)
@@ -0,0 +1,201 @@
+import csv
+import html
+from typing import Callable, Iterable, List, Optional, Sequence, TextIO, Tuple, Union
+
+from ..helpers import StrainRecord, format_percentage
+from .create_table import missing_text
+
+Column = Tuple[str, Callable[[StrainRecord], str]]
+
+
+def _source_cell(site: str, key: str) -> Callable[[StrainRecord], str]:
+    def cell(record: StrainRecord) -> str:
+        source = record.source(site)
+        if source is None:
+            return ""
+        if key == "Genetics":
+            return source.genetics or missing_text(source, key)
+        if key == "THC":
+            return missing_text(source, key) if source.thc == "None" else source.thc
+        if key == "CBD":
+            return missing_text(source, key) if source.cbd == "None" else source.cbd
+        return ", ".join(source.effects) if source.effects else missing_text(source, key)
+    return cell
+
+
+def report_columns(sites: Sequence[str], fields: Sequence[str] = ("Genetics", "THC", "CBD", "Effects")) -> List[Column]:
+    """
+    Returns the columns of a comparison report: the strain, the THC and CBD range over every website and the fields
+    of every website.
+
+    Args:
+        sites (Sequence[str]): The names of the websites, in column order.
+        fields (Sequence[str]): The fields shown for every website, out of Genetics, THC, CBD and Effects.
+
+    Returns:
+        List[Column]: The header of every column with the function rendering its cell from a StrainRecord.
+    """
+    columns: List[Column] = [
+        ("Strain", lambda record: record.name.replace("-", " ").title()),
+        ("THC", lambda record: format_percentage(*record.thc_range)),
+        ("CBD", lambda record: format_percentage(*record.cbd_range)),
+    ]
+    columns.extend((f"{site} {field}", _source_cell(site, field)) for site in sites for field in fields)
+    return columns
+
+
+class ReportRenderer():
+    """
+    Writes a comparison report of many strains, one row per strain, while the strains arrive.
+
+    Rows are written as soon as the column widths are known, so memory does not grow with the number of strains.
+    The widths are either fixed, or sampled from the first `sample_rows` rows, which are the only rows held back.
+    Cells wider than their column are cut off in formats that align columns.
+    """
+    uses_widths = True
+
+    def __init__(self, output: TextIO, sites: Sequence[str], widths: Optional[Union[int, Sequence[int]]] = None,
+                 sample_rows: int = 100, max_width: int = 40, columns: Optional[List[Column]] = None) -> None:
+        """
+        Args:
+            output (TextIO): The file to write the report to.
+            sites (Sequence[str]): The names of the websites, in column order.
+            widths (Union[int, Sequence[int]], optional): The width of every column, or one width for all columns.
+                Sampled from the first rows if omitted.
+            sample_rows (int): The number of rows the widths are sampled from.
+            max_width (int): The maximum sampled width of a column.
+            columns (List[Column], optional): The columns of the report, defaults to `report_columns(sites)`.
+        """
+        self.output = output
+        self.columns = columns if columns is not None else report_columns(sites)
+        self.headers = [header for header, _ in self.columns]
+        self.sample_rows = sample_rows
+        self.max_width = max_width
+        self.rows = 0
+        self.widths: Optional[List[int]] = None
+        if isinstance(widths, int):
+            self.widths = [widths] * len(self.columns)
+        elif widths is not None:
+            if len(widths) != len(self.columns):
+                raise ValueError(f"expected {len(self.columns)} column widths, got {len(widths)}")
+            self.widths = list(widths)
+        elif not self.uses_widths:
+            self.widths = [0] * len(self.columns)
+        self._sampled: List[List[str]] = []
+        self._started = False
+
+    def _start(self) -> None:
+        if self.widths is None:
+            self.widths = [min(self.max_width, max([len(header), *(len(row[idx]) for row in self._sampled)]))
+                           for idx, header in enumerate(self.headers)]
+        if self.uses_widths:
+            self.widths = [max(width, 1) for width in self.widths]  # a column shows at least the "…" of a cut cell
+        self._write_header()
+        self._started = True
+        for cells in self._sampled:
+            self._write_row(cells)
+        self._sampled = []
+
+    def write(self, record: StrainRecord) -> None:
+        """Writes the row of a strain, or holds it back while the column widths are sampled."""
+        cells = [cell(record) for _, cell in self.columns]
+        self.rows += 1
+        if self._started:
+            self._write_row(cells)
+            return
+        self._sampled.append(cells)
+        if self.widths is not None or len(self._sampled) >= self.sample_rows:
+            self._start()
+
+    def write_all(self, records: Iterable[StrainRecord]) -> int:
+        """Writes the rows of every strain and closes the report, returns the number of rows written."""
+        for record in records:
+            self.write(record)
+        self.close()
+        return self.rows
+
+    def close(self) -> None:
+        """Writes the held back rows and the end of the report, the output is left open."""
+        if not self._started:
+            self._start()
+        self._write_footer()
+        self.output.flush()
+
+    def _write_header(self) -> None:
+        raise NotImplementedError
+
+    def _write_row(self, cells: List[str]) -> None:
+        raise NotImplementedError
+
+    def _write_footer(self) -> None:
+        pass
+
+
+def _fit(cell: str, width: int) -> str:
+    width = max(width, 1)
+    if len(cell) <= width:
+        return cell.ljust(width)
+    return cell[:width - 1] + "…"
+
+
+class GridReport(ReportRenderer):
+    """A text grid with box drawing characters like `create_strain_info_table`."""
+    def _rule(self, left: str, middle: str, right: str) -> str:
+        return left + middle.join("─" * (width + 2) for width in self.widths) + right + "\n"
+
+    def _line(self, cells: Sequence[str]) -> str:
+        return "│ " + " │ ".join(_fit(cell, width) for cell, width in zip(cells, self.widths)) + " │\n"
+
+    def _write_header(self) -> None:
+        self.output.write(self._rule("┌", "┬", "┐") + self._line(self.headers) + self._rule("├", "┼", "┤"))
+
+    def _write_row(self, cells: List[str]) -> None:
+        self.output.write(self._line(cells))
+
+    def _write_footer(self) -> None:
+        self.output.write(self._rule("└", "┴", "┘"))
+
+
+class MarkdownReport(ReportRenderer):
+    """A Markdown table. Cells are padded to the column widths but never cut off."""
+    @staticmethod
+    def _escape(cell: str) -> str:
+        return cell.replace("|", "\\|")
+
+    def _write_header(self) -> None:
+        self._write_row(self.headers)
+        self.output.write("|" + "|".join("-" * (max(width, 3) + 2) for width in self.widths) + "|\n")
+
+    def _write_row(self, cells: List[str]) -> None:
+        self.output.write("| " + " | ".join(self._escape(cell).ljust(width)
+                                             for cell, width in zip(cells, self.widths)) + " |\n")
+
+
+class HtmlReport(ReportRenderer):
+    """An HTML table, the browser sizes the columns."""
+    uses_widths = False
+
+    def _write_header(self) -> None:
+        self.output.write("<table>\n<thead>\n<tr>" + "".join(f"<th>{html.escape(header)}</th>" for header in self.headers)
+                          + "</tr>\n</thead>\n<tbody>\n")
+
+    def _write_row(self, cells: List[str]) -> None:
+        self.output.write("<tr>" + "".join(f"<td>{html.escape(cell)}</td>" for cell in cells) + "</tr>\n")
+
+    def _write_footer(self) -> None:
+        self.output.write("</tbody>\n</table>\n")
+
+
+class CsvReport(ReportRenderer):
+    """CSV with a header row."""
+    uses_widths = False
+
+    def _write_header(self) -> None:
+        self._writer = csv.writer(self.output)
+        self._writer.writerow(self.headers)
+
+    def _write_row(self, cells: List[str]) -> None:
+        self._writer.writerow(cells)
+
+
+REPORT_FORMATS = {"grid": GridReport, "markdown": MarkdownReport, "html": HtmlReport, "csv": CsvReport}
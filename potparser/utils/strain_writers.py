@@ -0,0 +1,58 @@
+import csv
+import json
+from typing import Dict, List, TextIO, Union
+
+FIELDS = ['Genetics', 'THC', 'CBD', 'Effects', 'Other']
+
+
+class JsonLinesWriter():
+    """Writes every strain as one JSON object per line, holding the strain name and the results of every website."""
+    def __init__(self, output: TextIO) -> None:
+        self.output = output
+
+    def write(self, strain_name: str, websites: List[str], results: List[Dict[str, Union[str, List[str]]]]) -> None:
+        """
+        Writes the results of one strain and flushes the output.
+
+        Args:
+            strain_name (str): The name of the strain.
+            websites (List[str]): The names of the websites, in the order of the results.
+            results (List[Dict[str, Union[str, List[str]]]]): The strain information of every website.
+        """
+        record = {"strain": strain_name, **dict(zip(websites, results))}
+        self.output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.output.flush()
+
+
+class CsvWriter():
+    """
+    Writes one CSV row per strain and website, lists are joined with "; ".
+    The "Missing" column lists the missing fields with the reason, e.g. "THC: timeout; CBD: timeout", the last one
+    the page a slug index resolved the strain to, empty without an index.
+    """
+    def __init__(self, output: TextIO) -> None:
+        self.output = output
+        self._writer = csv.writer(output)
+        self._writer.writerow(["Strain", "Website"] + FIELDS + ["Missing", "Slug"])
+
+    def write(self, strain_name: str, websites: List[str], results: List[Dict[str, Union[str, List[str]]]]) -> None:
+        """
+        Writes the results of one strain and flushes the output.
+
+        Args:
+            strain_name (str): The name of the strain.
+            websites (List[str]): The names of the websites, in the order of the results.
+            results (List[Dict[str, Union[str, List[str]]]]): The strain information of every website.
+        """
+        for website, strain_info in zip(websites, results):
+            row = [strain_name, website]
+            for key in FIELDS:
+                value = strain_info.get(key, 'None')
+                row.append("; ".join(value) if isinstance(value, list) else value)
+            row.append("; ".join(f"{key}: {reason}" for key, reason in strain_info.get("Missing", {}).items()))
+            row.append(strain_info.get("Slug", ""))
+            self._writer.writerow(row)
+        self.output.flush()
+
+
+WRITERS = {"jsonl": JsonLinesWriter, "csv": CsvWriter}
@@ -0,0 +1,146 @@
+from __future__ import print_function
+
+import asyncio
+import sys
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+
+from ..helpers import SlugIndex
+from ..parser import PotParser
+from ..utils import WRITERS
+from ..webscrapers import (FAILURE_REASONS, MISSING_KEY, CircuitBreakerRegistry, RequestScheduler, ResponseCache,
+                           SiteExtractor, get_extractors)
+
+# How a strain turned out, see `classify_strain`
+FOUND = "found"  # at least one website has information on the strain
+NOT_FOUND = "not_found"  # every website answered, none of them knows the strain
+FAILED = "failed"  # no website has information on the strain, and at least one of them did not answer
+
+# Exit codes of the scrape command
+EXIT_NOT_FOUND = 1
+EXIT_FAILED = 3
+
+
+def read_strain_names(input_file: TextIO) -> List[str]:
+    """
+    Reads one strain name per line, skipping blank lines, comments starting with '#' and duplicates.
+
+    Args:
+        input_file (TextIO): The file to read the strain names from.
+
+    Returns:
+        List[str]: The strain names in the order they were read.
+    """
+    strain_names = (line.strip() for line in input_file)
+    return list(dict.fromkeys(name for name in strain_names if name and not name.startswith("#")))
+
+
+def classify_strain(extractors: List[SiteExtractor], site_results: Dict[str, dict]) -> str:
+    """
+    Tells apart strains the websites do not know from strains they could not be asked about.
+
+    Args:
+        extractors (List[SiteExtractor]): The extractors of the websites.
+        site_results (Dict[str, dict]): The strain information of every website, by website name.
+
+    Returns:
+        str: FOUND, NOT_FOUND or FAILED.
+    """
+    if not all(extractor.is_empty(site_results[extractor.name]) for extractor in extractors):
+        return FOUND
+    for strain_info in site_results.values():
+        if FAILURE_REASONS.intersection(strain_info.get(MISSING_KEY, {}).values()):
+            return FAILED
+    return NOT_FOUND
+
+
+async def scrape_to_writer(parser: PotParser, strain_names: Iterable[str], writer, concurrency: int,
+                           per_host_limit: int, fail_fast: bool) -> Tuple[int, int, int]:
+    """
+    Scrapes the strains concurrently and writes every strain as soon as all websites answered for it.
+
+    Args:
+        parser (PotParser): The parser to scrape with.
+        strain_names (Iterable[str]): The names of the strains to scrape.
+        writer: The writer to write every strain with, see `WRITERS`.
+        concurrency (int): The maximum number of requests running at the same time.
+        per_host_limit (int): The maximum number of connections open to a single website.
+        fail_fast (bool): Whether to stop at the first strain that was not found or could not be scraped.
+
+    Returns:
+        Tuple[int, int, int]: The number of strains written, how many of them none of the websites knows and
+            how many of them could not be scraped because websites did not answer.
+    """
+    extractors = get_extractors()
+    websites = [extractor.name for extractor in extractors]
+    pending: Dict[str, Dict[str, dict]] = {}
+    written = not_found = failed = 0
+
+    strains = parser.iter_strains(strain_names, concurrency=concurrency, per_host_limit=per_host_limit)
+    try:
+        async for strain_name, website, strain_info in strains:
+            site_results = pending.setdefault(strain_name, {})
+            site_results[website] = strain_info
+            if len(site_results) < len(websites):
+                continue
+            del pending[strain_name]
+            writer.write(strain_name, websites, [site_results[website] for website in websites])
+            written += 1
+            outcome = classify_strain(extractors, site_results)
+            if outcome == FOUND:
+                continue
+            if outcome == NOT_FOUND:
+                not_found += 1
+            else:
+                failed += 1
+            if fail_fast:
+                break
+    finally:
+        await strains.aclose()
+    return written, not_found, failed
+
+
+def batch_scrape(input_file: TextIO, output: TextIO, output_format: str = "jsonl", concurrency: int = 32,
+                 per_host_limit: int = 8, fail_fast: bool = False, cache: Optional[ResponseCache] = None,
+                 slug_index: Optional[SlugIndex] = None, site_timeout: Optional[float] = None,
+                 breakers: Optional[CircuitBreakerRegistry] = None, scheduler: Optional[RequestScheduler] = None) -> int:
+    """
+    Scrapes every strain listed in the input file and streams the results to the output without user interaction.
+
+    A summary is printed to stderr once all strains are done.
+
+    Args:
+        input_file (TextIO): The file listing one strain name per line.
+        output (TextIO): The file to write the results to.
+        output_format (str): "jsonl" or "csv".
+        concurrency (int): The maximum number of requests running at the same time.
+        per_host_limit (int): The maximum number of connections open to a single website.
+        fail_fast (bool): Whether to stop at the first strain that was not found or could not be scraped.
+        cache (ResponseCache, optional): The response cache used for the lookups.
+        slug_index (SlugIndex, optional): The index resolving the strain names per website.
+        site_timeout (float, optional): Seconds every website gets to answer.
+        breakers (CircuitBreakerRegistry, optional): Circuit breakers that stop requesting a failing website.
+        scheduler (RequestScheduler, optional): The scheduler every request waits for a slot of its website from.
+
+    Returns:
+        int: The exit code, 0 if every strain was found, EXIT_FAILED if websites did not answer for some strains
+            and EXIT_NOT_FOUND if the websites answered but do not know some strains.
+    """
+    strain_names = read_strain_names(input_file)
+    writer = WRITERS[output_format](output)
+    parser = PotParser(cache=cache, slug_index=slug_index, site_timeout=site_timeout, breakers=breakers,
+                       scheduler=scheduler)
+    written, not_found, failed = asyncio.run(
+        scrape_to_writer(parser, strain_names, writer, concurrency, per_host_limit, fail_fast))
+
+    summary = f"{written} of {len(strain_names)} strains scraped, {not_found} not found, {failed} failed"
+    if fail_fast and (not_found or failed):
+        cause = "was not found" if not_found else "could not be scraped"
+        summary += f", stopped at the first strain that {cause} (--fail-fast)"
+    if breakers is not None:
+        failing = [site for site, state in breakers.states().items() if state != "closed"]
+        if failing:
+            summary += f", stopped requesting {', '.join(failing)} after repeated failures"
+    print(summary, file=sys.stderr)
+    if failed:
+        return EXIT_FAILED
+    return EXIT_NOT_FOUND if not_found or written < len(strain_names) else 0
@@ -0,0 +1,61 @@
+from __future__ import print_function
+
+import asyncio
+import sys
+from typing import Optional, TextIO
+
+from ..helpers import SlugIndex, create_url_ending_name
+from ..webscrapers import CatalogueCrawler, ChangeLog, CrawlState, ParsePool, RequestScheduler, catalogue_pairs
+from .batch_scrape import read_strain_names
+
+
+def catalogue_crawl(state_path: str, changelog_path: str, input_file: Optional[TextIO] = None,
+                    slug_index: Optional[SlugIndex] = None, rate: float = 1.0, burst: Optional[float] = None,
+                    concurrency: int = 8, site_timeout: Optional[float] = None, resume: bool = True,
+                    scheduler: Optional[RequestScheduler] = None) -> int:
+    """
+    Re-crawls the catalogue of every website and appends the strains that changed to the change log.
+
+    A summary is printed to stderr once the crawl is done.
+
+    Args:
+        state_path (str): The SQLite file holding the crawl state.
+        changelog_path (str): The JSON Lines file to append the changes to.
+        input_file (TextIO, optional): A file listing one strain name per line, crawled on every website.
+        slug_index (SlugIndex, optional): An index whose strains are crawled on their websites.
+        rate (float): The requests per second sent to every website.
+        burst (float, optional): The requests a website may get at once after being idle.
+        concurrency (int): The maximum number of requests running at the same time.
+        site_timeout (float, optional): Seconds every page gets to download.
+        resume (bool): Whether to resume an interrupted crawl over the same strains.
+        scheduler (RequestScheduler, optional): The scheduler every request waits for a slot of its website from.
+
+    Returns:
+        int: The exit code, 0 if every page was crawled and 1 if any request failed.
+    """
+    strain_names = [create_url_ending_name(name) for name in read_strain_names(input_file)] if input_file else []
+    pairs = catalogue_pairs(strain_names, slug_index)
+    if not pairs:
+        print("Nothing to crawl, pass --input or --index.", file=sys.stderr)
+        return 2
+
+    state = CrawlState(state_path)
+    changelog = ChangeLog(changelog_path)
+    crawler = CatalogueCrawler(state, changelog, rate, burst, concurrency, site_timeout, ParsePool(), scheduler=scheduler)
+    try:
+        stats = asyncio.run(crawler.crawl(pairs, resume=resume))
+    finally:
+        crawler.parse_pool.shutdown()
+        changelog.close()
+        state.close()
+
+    changes = sum(stats.get(change, 0) for change in ("added", "updated", "removed"))
+    print(f"{len(pairs)} pages: {stats.get('skipped', 0)} already crawled, {stats.get('not_modified', 0)} not modified, "
+          f"{stats.get('unchanged_content', 0) + stats.get('unchanged_info', 0)} unchanged, "
+          f"{stats.get('added', 0)} added, {stats.get('updated', 0)} updated, {stats.get('removed', 0)} removed, "
+          f"{stats.get('not_found', 0)} not found, {stats.get('errors', 0)} failed", file=sys.stderr)
+    if changes:
+        print(f"{changes} changes appended to {changelog_path}", file=sys.stderr)
+    if stats.get("errors"):
+        print("The failed pages are retried by the next crawl over the same strains.", file=sys.stderr)
+    return 1 if stats.get("errors") else 0
@@ -0,0 +1,59 @@
+from __future__ import print_function
+
+import sys
+from typing import Dict, List, Optional, Sequence, TextIO
+
+from ..helpers import dose_grid, fix_float, is_float
+
+
+def read_percentages(input_file: TextIO) -> List[float]:
+    """
+    Reads one THC percentage per line, skipping blank lines and comments starting with '#'.
+
+    Args:
+        input_file (TextIO): The file to read the percentages from.
+
+    Returns:
+        List[float]: The percentages in the order they were read.
+
+    Raises:
+        ValueError: If a line is not a number.
+    """
+    percentages = []
+    for line_number, line in enumerate(input_file, 1):
+        line = line.strip().rstrip("%")
+        if not line or line.startswith("#"):
+            continue
+        if not is_float(line):
+            raise ValueError(f"line {line_number}: {line!r} is not a percentage")
+        percentages.append(fix_float(line))
+    return percentages
+
+
+def export_dose_grid(input_file: TextIO, output: TextIO, doses: Sequence[float], output_format: str = "csv",
+                     coefficients: Optional[Dict[str, float]] = None) -> int:
+    """
+    Calculates the THC content of every percentage in the input file for every dose and consumption method
+    and writes the grid to the output.
+
+    Args:
+        input_file (TextIO): The file listing one THC percentage per line.
+        output (TextIO): The file to write the grid to.
+        doses (Sequence[float]): The doses in grams.
+        output_format (str): "csv" or "jsonl".
+        coefficients (Dict[str, float], optional): The consumption methods mapped to the share of THC they deliver.
+
+    Returns:
+        int: The exit code, 0 on success and 1 if the input could not be read.
+    """
+    try:
+        percentages = read_percentages(input_file)
+    except ValueError as error:
+        print(f"Invalid input, {error}", file=sys.stderr)
+        return 1
+    grid = dose_grid(percentages, doses, coefficients)
+    if output_format == "csv":
+        grid.write_csv(output)
+    else:
+        grid.write_jsonl(output)
+    return 0
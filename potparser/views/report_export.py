@@ -0,0 +1,69 @@
+from __future__ import print_function
+
+import json
+import sys
+from typing import Iterator, Optional, Sequence, TextIO, Union
+
+from ..helpers import StrainRecord
+from ..utils import REPORT_FORMATS
+
+
+def read_records(input_file: TextIO) -> Iterator[StrainRecord]:
+    """
+    Reads the JSON Lines written by `potparser scrape` one strain at a time.
+
+    Args:
+        input_file (TextIO): The file holding one {"strain": name, website: strain information, ...} object per line.
+
+    Yields:
+        StrainRecord: The record of every strain, with the websites in the order of the first line.
+
+    Raises:
+        ValueError: If a line is not such an object.
+    """
+    websites = None
+    for line_number, line in enumerate(input_file, 1):
+        if not line.strip():
+            continue
+        try:
+            results = json.loads(line)
+            strain_name = results.pop("strain")
+        except (ValueError, KeyError, AttributeError, TypeError):
+            raise ValueError(f"line {line_number} is not a strain written by potparser scrape") from None
+        if websites is None:
+            websites = list(results)
+        yield StrainRecord.from_results(strain_name, websites, [results.get(website, {}) for website in websites])
+
+
+def export_report(input_file: TextIO, output: TextIO, output_format: str = "grid",
+                  widths: Optional[Union[int, Sequence[int]]] = None, sample_rows: int = 100, max_width: int = 40) -> int:
+    """
+    Renders a comparison report of every strain in the input file while it is read.
+
+    Args:
+        input_file (TextIO): The JSON Lines written by `potparser scrape`.
+        output (TextIO): The file to write the report to.
+        output_format (str): "grid", "markdown", "html" or "csv".
+        widths (Union[int, Sequence[int]], optional): Fixed column widths, sampled from the first rows if omitted.
+        sample_rows (int): The number of rows the column widths are sampled from.
+        max_width (int): The maximum sampled width of a column.
+
+    Returns:
+        int: The exit code, 0 on success and 1 if the input could not be read.
+    """
+    records = read_records(input_file)
+    try:
+        first = next(records, None)
+        if first is None:
+            print("No strains in the input.", file=sys.stderr)
+            return 1
+        report = REPORT_FORMATS[output_format](output, first.sites, widths, sample_rows, max_width)
+        report.write(first)
+        for record in records:
+            report.write(record)
+    except ValueError as error:
+        print(f"Invalid input, {error}", file=sys.stderr)
+        return 1
+    report.close()
+    print(f"{report.rows} strains written", file=sys.stderr)
+    return 0
@@ -2,14 +2,33 @@ from __future__ import print_function
 
 import asyncio
 import sys
+from typing import Optional
 
-from ..helpers import create_url_ending_name
-from ..utils import create_strain_info_table, print_help
-from ..webscrapers import scrape_strain_info
+from ..helpers import SlugIndex, StrainRecord, create_url_ending_name
+from ..utils import create_strain_info_table, create_timings_table, print_help
+from ..webscrapers import (CircuitBreakerRegistry, DictMetricsSink, RequestScheduler, ResponseCache, get_extractors,
+                           scrape_strain_info)
 
 
-def strain_menu() -> None:
-    """Prompts the user to enter a strain name and fetches information about that strain."""
+def print_suggestions(strain_name: str, slug_index: SlugIndex) -> None:
+    """Prints the strain names of the slug index most similar to a strain name that was not found."""
+    suggestions = slug_index.suggest_all(strain_name)
+    if suggestions:
+        print("Did you mean: " + ", ".join(slug.replace("-", " ").title() for slug in suggestions) + "?")
+
+
+def strain_menu(cache: Optional[ResponseCache] = None, timings: bool = False, slug_index: Optional[SlugIndex] = None,
+                site_timeout: Optional[float] = None, deadline: Optional[float] = None, quorum: Optional[int] = None,
+                breakers: Optional[CircuitBreakerRegistry] = None, scheduler: Optional[RequestScheduler] = None) -> None:
+    """
+    Prompts the user to enter a strain name and fetches information about that strain, using the response cache if given.
+    If timings is True, a breakdown of the time spent on every website is printed under the strain table.
+    If a slug index is given, strain names are resolved per website, the strain each website was looked up as is
+    printed if it differs from the name entered, and similar names are suggested for the websites without a match.
+    The site timeout, deadline, quorum and circuit breakers bound how long a lookup waits for slow or failing websites.
+    Every request waits for a slot of its website from the scheduler, if given.
+    """
+    metrics = DictMetricsSink() if timings else None
     while True:
         strain_name = input("Enter your strain name: ")
         if strain_name.lower().strip() == 'exit':
@@ -21,9 +40,25 @@ def strain_menu() -> None:
         else:
             if strain_name.strip() != '':
                 url_ending_name = create_url_ending_name(strain_name)
-                result = asyncio.run(scrape_strain_info(url_ending_name))
-                table = create_strain_info_table(result, strain_name)
+                if slug_index is not None and not any(slug_index.resolve_all(url_ending_name, slug_index.sites).values()):
+                    print(f"No website knows the strain {strain_name.strip()!r}.")
+                    print_suggestions(strain_name, slug_index)
+                    continue
+                result = asyncio.run(scrape_strain_info(url_ending_name, cache=cache, metrics=metrics,
+                                                        slug_index=slug_index, site_timeout=site_timeout,
+                                                        deadline=deadline, quorum=quorum, breakers=breakers,
+                                                        scheduler=scheduler))
+                record = StrainRecord.from_results(strain_name, [extractor.name for extractor in get_extractors()], result)
+                table = create_strain_info_table(record, strain_name)
                 print(table)
+                for source in record.sources:
+                    if source.slug is not None and source.slug != url_ending_name:
+                        print(f"{source.site}: looked up as {source.slug.replace('-', ' ').title()}")
+                if slug_index is not None and any(source.slug is None for source in record.sources):
+                    print_suggestions(strain_name, slug_index)
+                if metrics is not None:
+                    print(create_timings_table(metrics.records))
+                    metrics.clear()
     else:
         print(
             "Invalid input. Please enter a Strain, or type 'back', 'exit', or 'help'.")
@@ -0,0 +1,59 @@
+from __future__ import print_function
+
+import sys
+from typing import Any, Dict, Optional, TextIO
+
+from ..helpers import StrainStore
+from ..utils import REPORT_FORMATS
+from .report_export import read_records
+
+
+def load_records(store: StrainStore, input_file: TextIO) -> int:
+    """
+    Stores every strain of the JSON Lines written by `potparser scrape`, without scraping.
+
+    Args:
+        store (StrainStore): The store to fill.
+        input_file (TextIO): The JSON Lines written by `potparser scrape`.
+
+    Returns:
+        int: The number of strains stored.
+
+    Raises:
+        ValueError: If a line is not a strain written by `potparser scrape`.
+    """
+    return store.put_all(read_records(input_file))
+
+
+def query_strains(store: StrainStore, output: TextIO, output_format: str = "grid",
+                  filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> int:
+    """
+    Writes the stored strains matching the filters.
+
+    Args:
+        store (StrainStore): The store to query.
+        output (TextIO): The file to write the strains to.
+        output_format (str): "grid", "markdown", "html" or "csv" for a comparison report, "jsonl" for one
+            `StrainRecord.to_json` per line or "names" for one strain name per line.
+        filters (Dict[str, Any], optional): The keyword arguments of `StrainStore.query`, e.g. {"min_thc": 20}.
+        limit (int, optional): The maximum number of strains written.
+
+    Returns:
+        int: The exit code, 0 if any strain matched, 1 if none did and 2 if the store is empty.
+    """
+    if not len(store):
+        print(f"No strains in {store.path}, fill it with: potparser query --fill FILE or --load FILE", file=sys.stderr)
+        return 2
+    try:
+        records = store.query(limit=limit, **(filters or {}))
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 2
+    if output_format == "names":
+        output.writelines(record.name + "\n" for record in records)
+    elif output_format == "jsonl":
+        output.writelines(record.to_json() + "\n" for record in records)
+    elif records:
+        REPORT_FORMATS[output_format](output, store.sites()).write_all(records)
+    print(f"{len(records)} strains found", file=sys.stderr)
+    return 0 if records else 1
@@ -0,0 +1,168 @@
+import math
+import time
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+from ..helpers import METHOD_COEFFICIENTS, StrainRecord, create_url_ending_name, is_float, mg_calculator
+from ..parser import PotParser
+from ..webscrapers import (DEADLINE, FAILURE_REASONS, QUORUM_REACHED, LRUCache, MetricsRegistry, RequestScheduler, SingleFlight,
+                           create_client_session)
+
+# Websites left out by the parser's deadline or quorum are a result of its settings, not a failure worth retrying
+CUT_OFF_REASONS = frozenset({DEADLINE, QUORUM_REACHED})
+RETRY_REASONS = FAILURE_REASONS - CUT_OFF_REASONS
+
+
+class StrainService():
+    """
+    A long-running HTTP service looking up strains with one shared client session.
+
+    Concurrent lookups of the same strain share one scrape, and recent results are kept in an in-memory LRU.
+    Results with websites that failed (e.g. timed out) are returned but not kept, so the next lookup retries them.
+    Results missing websites the parser's deadline or quorum left out are kept like complete ones, unless no
+    website answered at all.
+
+    Endpoints:
+    - GET /strain/{name}: The strain information of every website, as `StrainRecord.to_dict`.
+    - GET /dose?thc=&grams=: The mg of THC in a dose and the mg inhaled per consumption method.
+    - GET /health: "ok", or "degraded" while a website's circuit breaker is open.
+    - GET /stats: Cache hit rate, in-flight and coalesced lookups, and the request queues of the scheduler.
+    - GET /metrics: The timings of every website in the Prometheus text format.
+    """
+    def __init__(self, parser: Optional[PotParser] = None, max_entries: int = 1024, ttl: Optional[float] = 600.0,
+                 concurrency: int = 100, per_host_limit: int = 10) -> None:
+        """
+        Args:
+            parser (PotParser, optional): The parser to look up strains with. Its metrics callback is replaced by the
+                service's MetricsRegistry, and it gets a RequestScheduler if it has none. A parser with default settings
+                is used if omitted.
+            max_entries (int): The maximum number of strains kept in memory.
+            ttl (float, optional): Seconds a strain is served from memory. Strains are kept until evicted if None.
+            concurrency (int): The maximum number of connections of the shared client session.
+            per_host_limit (int): The maximum number of connections to a single website.
+        """
+        self.parser = parser if parser is not None else PotParser()
+        self.metrics = MetricsRegistry()
+        self.parser.metrics = self.metrics
+        if self.parser.scheduler is None:
+            self.parser.scheduler = RequestScheduler(per_host_limit, max_running=concurrency,
+                                                     interactive_reserve=1 if min(per_host_limit, concurrency) > 1 else 0)
+        self.results = LRUCache(max_entries, ttl)
+        self.lookups = SingleFlight()
+        self.concurrency = concurrency
+        self.per_host_limit = per_host_limit
+        self.started_at = time.monotonic()
+        self.session = None
+
+    async def _start(self, app: web.Application) -> None:
+        self.session = create_client_session(self.concurrency, self.per_host_limit)
+        self.started_at = time.monotonic()
+
+    async def _stop(self, app: web.Application) -> None:
+        if self.session is not None:
+            await self.session.close()
+
+    async def _scrape(self, slug: str) -> StrainRecord:
+        record = await self.parser.aget_record(slug, self.session)
+        reasons = [{reason for _, reason in source.missing} for source in record.sources]
+        # A deadline that passed before any website answered leaves nothing worth keeping
+        if not any(source_reasons & RETRY_REASONS for source_reasons in reasons) and \
+                not all(source_reasons and source_reasons <= CUT_OFF_REASONS for source_reasons in reasons):
+            self.results.put(slug, record)
+        return record
+
+    async def get_record(self, strain_name: str) -> StrainRecord:
+        """
+        Returns the record of a strain from memory, or scrapes it once for every concurrent caller.
+
+        Args:
+            strain_name (str): The name of the strain.
+
+        Returns:
+            StrainRecord: The record, named by the strain's URL ending name.
+        """
+        slug = create_url_ending_name(strain_name)
+        record = self.results.get(slug)
+        if record is None:
+            record = await self.lookups.do(slug, lambda: self._scrape(slug))
+        return record
+
+    async def handle_strain(self, request: web.Request) -> web.Response:
+        strain_name = request.match_info["name"]
+        if not strain_name.strip():
+            raise web.HTTPBadRequest(text="Missing strain name")
+        return web.json_response((await self.get_record(strain_name)).to_dict())
+
+    async def handle_dose(self, request: web.Request) -> web.Response:
+        # inf and nan parse as floats but have no dose (and no JSON representation)
+        thc, grams = (float(value) if is_float(value) else math.nan
+                      for value in (request.query.get("thc", ""), request.query.get("grams", "")))
+        if not (math.isfinite(thc) and math.isfinite(grams) and thc >= 0 and grams >= 0):
+            raise web.HTTPBadRequest(
+                text="Expected the query parameters thc (percentage) and grams as finite non-negative numbers")
+        mg = mg_calculator(thc, grams)
+        methods = {method: {"inhaled_mg": mg * coefficient, "heating_loss_mg": mg - mg * coefficient}
+                   for method, coefficient in METHOD_COEFFICIENTS.items()}
+        return web.json_response({"thc": thc, "grams": grams, "thc_mg": mg, "methods": methods})
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the counters shown by /stats."""
+        return {
+            "uptime_seconds": time.monotonic() - self.started_at,
+            "cache": {
+                "entries": len(self.results),
+                "max_entries": self.results.max_entries,
+                "hits": self.results.hits,
+                "misses": self.results.misses,
+                "hit_rate": self.results.hit_rate,
+            },
+            "lookups": {
+                "in_flight": self.lookups.in_flight,
+                "scrapes": self.lookups.calls,
+                "coalesced": self.lookups.coalesced,
+            },
+            "requests": self.parser.scheduler.stats(),
+        }
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats())
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        breakers = self.parser.breakers.states() if self.parser.breakers is not None else {}
+        failing = sorted(site for site, state in breakers.items() if state != "closed")
+        return web.json_response({"status": "degraded" if failing else "ok", "failing_websites": failing,
+                                  "session": self.session is not None and not self.session.closed})
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.metrics.render(), content_type="text/plain")
+
+    def create_app(self) -> web.Application:
+        """Creates the aiohttp application, the shared client session lives as long as the application runs."""
+        app = web.Application()
+        app.on_startup.append(self._start)
+        app.on_cleanup.append(self._stop)
+        app.router.add_get("/strain/{name}", self.handle_strain)
+        app.router.add_get("/dose", self.handle_dose)
+        app.router.add_get("/health", self.handle_health)
+        app.router.add_get("/stats", self.handle_stats)
+        app.router.add_get("/metrics", self.handle_metrics)
+        return app
+
+
+def serve(parser: Optional[PotParser] = None, host: str = "127.0.0.1", port: int = 8080, max_entries: int = 1024,
+          ttl: Optional[float] = 600.0, concurrency: int = 100, per_host_limit: int = 10) -> None:
+    """
+    Runs the strain service until it is interrupted, see `StrainService`.
+
+    Args:
+        parser (PotParser, optional): The parser to look up strains with.
+        host (str): The interface to listen on.
+        port (int): The port to listen on.
+        max_entries (int): The maximum number of strains kept in memory.
+        ttl (float, optional): Seconds a strain is served from memory.
+        concurrency (int): The maximum number of connections to the websites.
+        per_host_limit (int): The maximum number of connections to a single website.
+    """
+    service = StrainService(parser, max_entries, ttl, concurrency, per_host_limit)
+    web.run_app(service.create_app(), host=host, port=port)
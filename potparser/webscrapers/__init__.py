@@ -1,4 +1,23 @@
-__all__ = ['strain_scraper']
+from .._lazy import attach
 
-for module in __all__:
-    exec(f"from .{module} import *")
\ No newline at end of file
+__all__ = ['circuit_breaker', 'coalescing', 'crawler', 'extractors', 'metrics', 'parse_pool', 'rate_limit', 'response_cache', 'scheduler', 'sitemap_scraper', 'strain_scraper']
+
+__getattr__, __dir__ = attach(__name__, {
+    'circuit_breaker': ['CircuitBreaker', 'CircuitBreakerRegistry'],
+    'coalescing': ['LRUCache', 'SingleFlight'],
+    'crawler': ['ADDED', 'DEFAULT_CHANGELOG_PATH', 'DEFAULT_STATE_PATH', 'CatalogueCrawler', 'ChangeLog', 'CrawlState',
+                'REMOVED', 'UPDATED', 'catalogue_pairs', 'info_hash'],
+    'extractors': ['CIRCUIT_OPEN', 'CONNECTION_ERROR', 'DEADLINE', 'DISCARDED_TAGS', 'EXTRACTORS', 'FAILURE_REASONS',
+                   'HTTP_ERROR', 'IncrementalExtraction', 'MISSING_KEY', 'NOT_FOUND', 'NOT_ON_PAGE', 'PARSE_ERROR',
+                   'QUORUM_REACHED', 'SLUG_KEY', 'SiteExtractor', 'TIMEOUT', 'UNRESOLVED', 'get_extractors', 'parse_page',
+                   'register_extractor', 'remove_substrings'],
+    'metrics': ['DEFAULT_BUCKETS', 'DictMetricsSink', 'MetricsRegistry', 'PHASES', 'SiteTiming', 'create_trace_config'],
+    'parse_pool': ['ParsePool'],
+    'rate_limit': ['HostRateLimiter', 'TokenBucket'],
+    'response_cache': ['DEFAULT_CACHE_PATH', 'ResponseCache'],
+    'scheduler': ['BULK', 'INTERACTIVE', 'PREFETCH', 'PRIORITIES', 'RequestScheduler'],
+    'sitemap_scraper': ['LOC_XPATH', 'SITEMAP_INDEX_XPATH', 'STRAIN_SITEMAP_HINTS', 'build_slug_index',
+                        'fetch_site_slugs'],
+    'strain_scraper': ['STREAM_CHUNK_SIZE', 'create_client_session', 'get_strain_info', 'iter_strain_info',
+                       'scrape_strain_info', 'scrape_strains_info'],
+})
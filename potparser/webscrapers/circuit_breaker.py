@@ -0,0 +1,79 @@
+import time
+from typing import Dict, Optional
+
+
+class CircuitBreaker():
+    """
+    Stops sending requests to a website after repeated failures and probes it again later.
+
+    - closed: Requests are sent. After `failure_threshold` failures in a row the breaker opens.
+    - open: No requests are sent until `reset_timeout` seconds have passed, then one probe request is let through.
+    - half_open: A probe is running. Its success closes the breaker, its failure opens it again. A probe
+      that never reports back (e.g. it was cancelled) is followed by another one after `reset_timeout` seconds.
+    """
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """
+        Args:
+            failure_threshold (int): The number of failures in a row that open the breaker.
+            reset_timeout (float): Seconds the breaker stays open before a probe request is let through.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """The state of the breaker: "closed", "open" or "half_open"."""
+        if self._opened_at is None:
+            return "closed"
+        return "half_open" if self._probing else "open"
+
+    def allow(self) -> bool:
+        """Returns whether a request may be sent now. Letting a probe through counts as sending it."""
+        if self._opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self._opened_at >= self.reset_timeout:
+            self._opened_at = now
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Records a request the website answered, closing the breaker."""
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Records a request that failed, opening the breaker after too many failures or a failed probe."""
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class CircuitBreakerRegistry():
+    """One circuit breaker per website, created on first use with the same settings."""
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """
+        Args:
+            failure_threshold (int): The number of failures in a row that open a website's breaker.
+            reset_timeout (float): Seconds a breaker stays open before a probe request is let through.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, site: str) -> CircuitBreaker:
+        """Returns the circuit breaker of a website."""
+        breaker = self.breakers.get(site)
+        if breaker is None:
+            breaker = self.breakers[site] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        """Returns the state of every website's breaker."""
+        return {site: breaker.state for site, breaker in self.breakers.items()}
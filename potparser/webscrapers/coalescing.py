@@ -0,0 +1,105 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlight():
+    """
+    Coalesces concurrent calls for the same key into one in-flight call.
+
+    The first caller of a key starts the call as its own task, every caller arriving while it runs awaits
+    the same task. Callers that are cancelled (e.g. a client that disconnected) do not cancel the call
+    for the others.
+
+    Attributes:
+        calls (int): The number of calls started.
+        coalesced (int): The number of callers that joined a call already in flight.
+    """
+    def __init__(self) -> None:
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        """The number of calls currently running."""
+        return len(self._tasks)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the result of the call running for the key, starting it if none is running.
+
+        Args:
+            key (Hashable): The key identifying the call, e.g. a strain's URL ending name.
+            call (Callable[[], Awaitable[Any]]): Creates the awaitable to run if no call is in flight for the key.
+
+        Returns:
+            Any: The result of the call.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._tasks[key] = task
+            self.calls += 1
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+
+class LRUCache():
+    """
+    A bounded in-memory cache that evicts the least recently used entry and optionally expires entries.
+
+    Attributes:
+        hits (int): The number of lookups served from the cache.
+        misses (int): The number of lookups that found no (fresh) entry.
+    """
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None) -> None:
+        """
+        Args:
+            max_entries (int): The maximum number of entries kept.
+            ttl (float, optional): Seconds an entry is served after it was stored. Entries never expire if omitted.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of lookups served from the cache, 0 before the first lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Returns the entry of the key and marks it as recently used, or None if there is no fresh entry."""
+        entry = self._entries.get(key)
+        if entry is None or (self.ttl is not None and time.monotonic() - entry[0] > self.ttl):
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Stores an entry, evicting the least recently used entries beyond `max_entries`."""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        self._entries.clear()
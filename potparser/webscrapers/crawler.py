@@ -0,0 +1,393 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+from .extractors import EXTRACTORS, MISSING_KEY, PARSE_ERROR, SiteExtractor
+from .parse_pool import ParsePool
+from .rate_limit import HostRateLimiter
+from .response_cache import DEFAULT_CACHE_PATH, ResponseCache
+from .scheduler import BULK, RequestScheduler
+from .strain_scraper import create_client_session
+
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), "crawl.sqlite3")
+DEFAULT_CHANGELOG_PATH = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), "changes.jsonl")
+
+# Kinds of change log entries
+ADDED = "added"  # the page appeared or holds strain information for the first time
+UPDATED = "updated"  # the strain information of the page changed
+REMOVED = "removed"  # the page is gone (404)
+
+
+def info_hash(strain_info: Dict[str, Any]) -> str:
+    """Returns a hash of the extracted strain information, ignoring why fields are missing."""
+    data = {key: value for key, value in strain_info.items() if key != MISSING_KEY}
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def catalogue_pairs(strain_names: Iterable[str] = (), slug_index: Optional[Any] = None,
+                    extractors: Optional[List[SiteExtractor]] = None) -> List[Tuple[str, str]]:
+    """
+    Returns the (website, slug) pairs to crawl.
+
+    Args:
+        strain_names (Iterable[str]): URL ending names to crawl on every website.
+        slug_index (SlugIndex, optional): An index whose slugs of every website are crawled as well.
+        extractors (List[SiteExtractor], optional): The websites to crawl. Defaults to every registered website.
+
+    Returns:
+        List[Tuple[str, str]]: The pairs, without duplicates.
+    """
+    sites = [extractor.name for extractor in (extractors if extractors is not None else EXTRACTORS.values())]
+    pairs = [(site, name) for name in strain_names for site in sites]
+    if slug_index is not None:
+        pairs.extend((site, slug) for site in sites for slug in sorted(slug_index.slugs(site)))
+    return list(dict.fromkeys(pairs))
+
+
+class CrawlState():
+    """
+    The durable state of the catalogue crawler in a SQLite database.
+
+    - pages: The content hash, strain information hash and validators of every (website, slug) seen.
+    - runs / done: Every crawl run over a slug list and the (website, slug) pairs it has finished,
+      so an interrupted run resumes where it stopped.
+    """
+    def __init__(self, path: str = DEFAULT_STATE_PATH) -> None:
+        """
+        Args:
+            path (str): The path of the SQLite database file, ":memory:" keeps the state in memory.
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS pages (
+                site TEXT NOT NULL,
+                slug TEXT NOT NULL,
+                content_hash TEXT,
+                info_hash TEXT,
+                info TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                checked_at REAL NOT NULL,
+                changed_at REAL,
+                PRIMARY KEY (site, slug)
+            );
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                pairs_hash TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                started_at REAL NOT NULL,
+                finished_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS done (
+                run_id INTEGER NOT NULL,
+                site TEXT NOT NULL,
+                slug TEXT NOT NULL,
+                PRIMARY KEY (run_id, site, slug)
+            );
+        """)
+
+    def start_run(self, pairs: List[Tuple[str, str]], resume: bool = True) -> Tuple[int, set]:
+        """
+        Starts a run over the (website, slug) pairs, or resumes the last unfinished run over the same pairs.
+
+        Returns:
+            Tuple[int, set]: The id of the run and the pairs it has already finished.
+        """
+        pairs_hash = hashlib.sha256("\n".join(f"{site}/{slug}" for site, slug in sorted(pairs)).encode()).hexdigest()
+        row = self._connection.execute(
+            "SELECT id FROM runs WHERE pairs_hash = ? AND finished_at IS NULL ORDER BY id DESC LIMIT 1",
+            (pairs_hash,)).fetchone() if resume else None
+        if row is not None:
+            done = set(self._connection.execute("SELECT site, slug FROM done WHERE run_id = ?", (row[0],)))
+            return row[0], done
+        cursor = self._connection.execute("INSERT INTO runs (pairs_hash, total, started_at) VALUES (?, ?, ?)",
+                                          (pairs_hash, len(pairs), time.time()))
+        self._connection.commit()
+        return cursor.lastrowid, set()
+
+    def finish_run(self, run_id: int) -> None:
+        """Marks a run as finished and forgets its finished pairs."""
+        self._connection.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (time.time(), run_id))
+        self._connection.execute("DELETE FROM done WHERE run_id = ?", (run_id,))
+        self._connection.commit()
+
+    def get(self, site: str, slug: str) -> Optional[Dict[str, Any]]:
+        """Returns the stored state of a page, or None if it was never crawled."""
+        row = self._connection.execute(
+            "SELECT content_hash, info_hash, info, etag, last_modified FROM pages WHERE site = ? AND slug = ?",
+            (site, slug)).fetchone()
+        if row is None:
+            return None
+        content_hash, page_info_hash, info, etag, last_modified = row
+        return {"content_hash": content_hash, "info_hash": page_info_hash,
+                "info": None if info is None else json.loads(info), "etag": etag, "last_modified": last_modified}
+
+    def put(self, site: str, slug: str, content_hash: Optional[str], page_info_hash: Optional[str],
+            info: Optional[Dict[str, Any]], etag: Optional[str], last_modified: Optional[str], changed: bool) -> None:
+        """Stores the state of a crawled page. Committed by `commit`, together with the pairs marked done."""
+        now = time.time()
+        self._connection.execute("""
+            INSERT INTO pages (site, slug, content_hash, info_hash, info, etag, last_modified, checked_at, changed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (site, slug) DO UPDATE SET
+                content_hash = excluded.content_hash, info_hash = excluded.info_hash, info = excluded.info,
+                etag = excluded.etag, last_modified = excluded.last_modified, checked_at = excluded.checked_at,
+                changed_at = CASE WHEN ? THEN excluded.changed_at ELSE pages.changed_at END
+        """, (site, slug, content_hash, page_info_hash, None if info is None else json.dumps(info, ensure_ascii=False),
+              etag, last_modified, now, now if changed else None, changed))
+
+    def touch(self, site: str, slug: str) -> None:
+        """Records that a page was checked and found unchanged."""
+        self._connection.execute("UPDATE pages SET checked_at = ? WHERE site = ? AND slug = ?", (time.time(), site, slug))
+
+    def mark_done(self, run_id: int, site: str, slug: str) -> None:
+        """Records that a run finished a pair. Committed by `commit`."""
+        self._connection.execute("INSERT OR IGNORE INTO done (run_id, site, slug) VALUES (?, ?, ?)", (run_id, site, slug))
+
+    def commit(self) -> None:
+        self._connection.commit()
+
+    def close(self) -> None:
+        self._connection.commit()
+        self._connection.close()
+
+
+class ChangeLog():
+    """
+    An append-only JSON Lines file with one entry per (website, slug) whose strain information changed.
+
+    Every entry holds a sequence number, the time, the kind of change (ADDED, UPDATED or REMOVED), the website,
+    the slug, the fields that changed, the new strain information and its hash. Entries are written at least
+    once: after a crash, the entries of the last uncommitted batch may be written again, and a last entry that
+    was only partly written is dropped when the log is opened again.
+    """
+    def __init__(self, path: str = DEFAULT_CHANGELOG_PATH) -> None:
+        """
+        Opens the change log, continuing the sequence numbers of the entries already in it.
+
+        Args:
+            path (str): The path of the JSON Lines file.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.seq = 0
+        if os.path.exists(path):
+            with open(path, "rb+") as f:
+                self.seq = self._recover(f)
+        self._file = open(path, "a", encoding="utf-8")
+
+    @staticmethod
+    def _recover(f: BinaryIO, block_size: int = 64 * 1024) -> int:
+        """
+        Drops an incomplete last line left by a crash and returns the sequence number of the last entry.
+
+        Only the end of the file is read, backwards in blocks until a complete entry is found.
+        """
+        position = f.seek(0, os.SEEK_END)
+        tail = b""
+        truncated = False
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            tail = f.read(step) + tail
+            if not truncated:
+                newline = tail.rfind(b"\n")
+                if newline == -1 and position > 0:
+                    continue
+                f.truncate(position + newline + 1)
+                tail = tail[:newline + 1]
+                truncated = True
+            lines = tail.split(b"\n")[:-1]
+            # The first line may continue in the previous block
+            for line in reversed(lines if position == 0 else lines[1:]):
+                try:
+                    return int(json.loads(line)["seq"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+            tail = lines[0] + b"\n" if lines and position > 0 else b""
+        return 0
+
+    def append(self, change: str, site: str, slug: str, info: Optional[Dict[str, Any]],
+               previous: Optional[Dict[str, Any]], page_info_hash: Optional[str]) -> None:
+        """Appends an entry, it is written to disk by `flush`."""
+        self.seq += 1
+        fields = sorted(key for key in set(info or {}) | set(previous or {})
+                        if key != MISSING_KEY and (info or {}).get(key) != (previous or {}).get(key))
+        entry = {"seq": self.seq, "time": time.time(), "change": change, "site": site, "slug": slug,
+                 "fields": fields, "info": info, "hash": page_info_hash}
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def flush(self) -> None:
+        """Writes the appended entries to disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+
+class CatalogueCrawler():
+    """
+    Re-crawls a catalogue of (website, slug) pairs and records only what changed.
+
+    Every page is requested conditionally with the validators of the last crawl. A downloaded page whose
+    content hash matches the stored one is not parsed again. A parsed page whose strain information
+    differs from the stored one is written to the change log. Requests to every host are rate limited
+    with a token bucket. Progress is checkpointed every `commit_every` pages, so an interrupted crawl over
+    the same pairs resumes where it stopped. Pages that could not be downloaded or parsed are not logged and
+    stay pending: a run with failures is left unfinished, so the next crawl over the same pairs retries only them.
+    """
+    def __init__(self, state: CrawlState, changelog: ChangeLog, rate: float = 1.0, burst: Optional[float] = None,
+                 concurrency: int = 8, site_timeout: Optional[float] = 30.0, parse_pool: Optional[ParsePool] = None,
+                 commit_every: int = 50, scheduler: Optional[RequestScheduler] = None) -> None:
+        """
+        Args:
+            state (CrawlState): The durable crawl state.
+            changelog (ChangeLog): The change log to append changes to.
+            rate (float): The requests per second sent to every host.
+            burst (float, optional): The requests a host may get at once after being idle.
+            concurrency (int): The maximum number of requests running at the same time.
+            site_timeout (float, optional): Seconds a page gets to download.
+            parse_pool (ParsePool, optional): A pool to parse the pages on instead of the event loop thread.
+            commit_every (int): The number of pages after which the change log and the checkpoint are written to disk.
+            scheduler (RequestScheduler, optional): A scheduler shared with interactive lookups. The crawl's requests
+                then wait for BULK slots, so they only use the capacity the interactive lookups leave.
+        """
+        self.state = state
+        self.changelog = changelog
+        self.rate_limiter = HostRateLimiter(rate, burst)
+        self.concurrency = concurrency
+        self.site_timeout = site_timeout
+        self.parse_pool = parse_pool
+        self.commit_every = commit_every
+        self.scheduler = scheduler
+        self.stats: Dict[str, int] = {}
+
+    def _count(self, key: str) -> None:
+        self.stats[key] = self.stats.get(key, 0) + 1
+
+    async def _crawl_page(self, session: aiohttp.ClientSession, extractor: SiteExtractor, slug: str) -> bool:
+        """Crawls a page, returns False if it could not be downloaded or parsed and has to be crawled again."""
+        stored = self.state.get(extractor.name, slug)
+        url = extractor.url(slug)
+        timeout = aiohttp.ClientTimeout(total=self.site_timeout)
+        async with session.get(url, headers=ResponseCache.revalidation_headers(stored), timeout=timeout) as response:
+            if response.status == 304 and stored is not None:
+                self._count("not_modified")
+                self.state.touch(extractor.name, slug)
+                return True
+            if response.status == 404:
+                self._count("not_found")
+                if stored is not None and stored["info"] is not None:
+                    self.changelog.append(REMOVED, extractor.name, slug, None, stored["info"], None)
+                    self.state.put(extractor.name, slug, None, None, None, None, None, changed=True)
+                    self._count(REMOVED)
+                return True
+            if response.status >= 400:
+                self._count("errors")
+                return False
+            content = await response.read()
+            encoding = response.get_encoding()
+            etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+        content_hash = hashlib.sha256(content).hexdigest()
+        if stored is not None and stored["content_hash"] == content_hash:
+            self._count("unchanged_content")
+            self.state.put(extractor.name, slug, content_hash, stored["info_hash"], stored["info"], etag, last_modified,
+                           changed=False)
+            return True
+
+        self._count("parsed")
+        if self.parse_pool is None:
+            strain_info = extractor.parse(content, encoding)
+        else:
+            strain_info = await self.parse_pool.parse(extractor, content, encoding)
+        if PARSE_ERROR in strain_info[MISSING_KEY].values():
+            self._count("errors")
+            return False
+        page_info_hash = info_hash(strain_info)
+        if stored is not None and stored["info_hash"] == page_info_hash:
+            self._count("unchanged_info")
+            self.state.put(extractor.name, slug, content_hash, page_info_hash, stored["info"], etag, last_modified,
+                           changed=False)
+            return True
+
+        change = ADDED if stored is None or stored["info"] is None else UPDATED
+        self.changelog.append(change, extractor.name, slug, strain_info, None if stored is None else stored["info"],
+                              page_info_hash)
+        self.state.put(extractor.name, slug, content_hash, page_info_hash, strain_info, etag, last_modified, changed=True)
+        self._count(change)
+        return True
+
+    async def crawl(self, pairs: Iterable[Tuple[str, str]], session: Optional[aiohttp.ClientSession] = None,
+                    resume: bool = True) -> Dict[str, int]:
+        """
+        Crawls every (website, slug) pair once.
+
+        Args:
+            pairs (Iterable[Tuple[str, str]]): The website names and URL ending names to crawl.
+            session (aiohttp.ClientSession, optional): A session to send the requests with. A pooled session is
+                created (and closed afterwards) if omitted.
+            resume (bool): Whether to resume the last unfinished crawl over the same pairs.
+
+        Returns:
+            Dict[str, int]: How many pages were skipped (finished before resuming), not modified (304), unchanged
+            (same content or same strain information), parsed, added, updated, removed, not found or failed.
+        """
+        pairs = list(dict.fromkeys((site, slug) for site, slug in pairs if site in EXTRACTORS))
+        if session is None:
+            async with create_client_session(self.concurrency, self.concurrency) as session:
+                return await self.crawl(pairs, session, resume)
+
+        run_id, done = self.state.start_run(pairs, resume)
+        self.stats = {"skipped": len(done)}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        finished = 0
+
+        async def crawl_pair(site: str, slug: str) -> None:
+            nonlocal finished
+            async with semaphore:
+                try:
+                    extractor = EXTRACTORS[site]
+                    await self.rate_limiter.acquire(extractor.url(slug))
+                    if self.scheduler is None:
+                        crawled = await self._crawl_page(session, extractor, slug)
+                    else:
+                        async with self.scheduler.slot(extractor.url(slug), BULK):
+                            crawled = await self._crawl_page(session, extractor, slug)
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    self._count("errors")
+                    crawled = False
+            if not crawled:
+                return  # stays pending, the resumed run tries it again
+            self.state.mark_done(run_id, site, slug)
+            finished += 1
+            if finished % self.commit_every == 0:
+                self.changelog.flush()
+                self.state.commit()
+
+        tasks = [asyncio.create_task(crawl_pair(site, slug)) for site, slug in pairs if (site, slug) not in done]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.changelog.flush()
+            self.state.commit()
+        if not self.stats.get("errors"):
+            self.state.finish_run(run_id)
+        return self.stats
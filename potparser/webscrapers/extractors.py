@@ -0,0 +1,338 @@
+import re
+from typing import Dict, List, Optional, Set, Union
+
+from lxml import etree, html
+
+
+# Key of the strain information mapping every missing field to the reason it is missing
+MISSING_KEY = "Missing"
+
+# Key of the strain information holding the slug a slug index resolved the strain name to
+SLUG_KEY = "Slug"
+
+# Reasons a field is missing
+NOT_FOUND = "not_found"  # the website has no page for the strain (404)
+NOT_ON_PAGE = "not_on_page"  # the page does not hold the field
+PARSE_ERROR = "parse_error"  # the page could not be parsed
+HTTP_ERROR = "http_error"  # the website answered with an error status
+CONNECTION_ERROR = "connection_error"  # the request failed
+TIMEOUT = "timeout"  # the website did not answer within the per-site timeout
+CIRCUIT_OPEN = "circuit_open"  # the website failed repeatedly and is not requested for now
+UNRESOLVED = "unresolved"  # the slug index knows no matching strain of the website
+DEADLINE = "deadline"  # the overall deadline of the lookup passed first
+QUORUM_REACHED = "quorum_reached"  # enough other websites answered first
+
+# Reasons meaning the website did not answer, as opposed to answering without the field
+FAILURE_REASONS = frozenset({HTTP_ERROR, CONNECTION_ERROR, TIMEOUT, CIRCUIT_OPEN, DEADLINE, QUORUM_REACHED})
+
+
+def remove_substrings(string: str) -> str:
+    """
+    Removes words from a string.
+
+    Parameters:
+        string (str): The input string.
+
+    Returns:
+        str: The modified string with the specified words removed.
+    """
+    remove_words = {"THC", "CBD", "CBG"}
+    return " ".join(word for word in string.split() if word not in remove_words)
+
+
+class SiteExtractor():
+    """
+    Extracts strain information from the pages of one website.
+
+    The xpath expressions are compiled once when the extractor is created and reused for every page.
+    Text fields take the text content of the first matching element, list fields take every matching
+    string with newlines removed. A text field that matches nothing falls back to its fallback expression.
+    """
+    def __init__(self, name: str, url_template: str, text_fields: Dict[str, str], list_fields: Dict[str, str],
+                 fallbacks: Optional[Dict[str, str]] = None, containers: Optional[Dict[str, str]] = None,
+                 sitemap_url: Optional[str] = None) -> None:
+        """
+        Args:
+            name (str): The name of the website, e.g. "Leafly".
+            url_template (str): The URL of a strain page with a "{strain_name}" placeholder.
+            text_fields (Dict[str, str]): Field names mapped to xpath expressions selecting an element.
+            list_fields (Dict[str, str]): Field names mapped to xpath expressions selecting strings.
+            fallbacks (Dict[str, str], optional): Text field names mapped to the xpath expression used if the field is missing.
+            containers (Dict[str, str], optional): List field names mapped to an xpath expression selecting the one
+                element that holds every string of the field, e.g. by its id. A streamed page is only cut short once it
+                is closed, list fields without a container are read until the end of the page. Only declare a container
+                the page can hold once and the list expression can't match outside of.
+            sitemap_url (str, optional): The URL of the sitemap (or sitemap index) listing the strain pages of the website.
+        """
+        self.name = name
+        self.url_template = url_template
+        self.text_fields = {key: etree.XPath(xpath, smart_strings=False) for key, xpath in text_fields.items()}
+        self.list_fields = {key: etree.XPath(xpath, smart_strings=False) for key, xpath in list_fields.items()}
+        self.fallbacks = {key: etree.XPath(xpath, smart_strings=False) for key, xpath in (fallbacks or {}).items()}
+        self.containers = {key: etree.XPath(xpath, smart_strings=False) for key, xpath in (containers or {}).items()}
+        # The strings of list fields with a container know their element, so streaming can check they are inside it
+        self.contained_list_fields = {key: etree.XPath(list_fields[key]) for key in self.containers}
+        self.sitemap_url = sitemap_url
+
+    @property
+    def fields(self) -> List[str]:
+        """The names of the fields in the extracted strain information."""
+        return [*self.text_fields, *self.list_fields]
+
+    def url(self, strain_name: str) -> str:
+        """Returns the URL of the page of the given URL ending name."""
+        return self.url_template.format(strain_name=strain_name)
+
+    def strain_name_from_url(self, url: str) -> Optional[str]:
+        """Returns the URL ending name of a strain page URL, or None if the URL is no strain page of the website."""
+        prefix, _, suffix = self.url_template.rstrip("/").partition("{strain_name}")
+        match = re.fullmatch(re.escape(prefix) + r"([^/?#]+)" + re.escape(suffix) + r"/?", url)
+        return match.group(1) if match else None
+
+    def empty_result(self, reason: str = NOT_FOUND) -> Dict[str, Union[str, Dict[str, str]]]:
+        """Returns the strain information used when the page could not be scraped, every field missing for the given reason."""
+        strain_info = {key: 'None' for key in self.fields}
+        strain_info[MISSING_KEY] = {key: reason for key in self.fields}
+        return strain_info
+
+    def is_empty(self, strain_info: Dict[str, Union[str, List[str]]]) -> bool:
+        """Returns whether none of the fields of the strain information were scraped."""
+        return all(strain_info.get(key) == 'None' for key in self.fields)
+
+    @staticmethod
+    def _get_text(xpath: etree.XPath, doc: html.HtmlElement) -> str:
+        elements = xpath(doc)
+        if not elements:
+            return "None"
+        return remove_substrings(elements[0].text_content().strip("\n"))
+
+    def parse(self, content: bytes, encoding: Optional[str] = None) -> Dict[str, Union[str, List[str]]]:
+        """
+        Parses a downloaded page and extracts the strain information from it.
+
+        Args:
+            content (bytes): The raw page.
+            encoding (str, optional): The encoding of the page, detected from the page if omitted.
+
+        Returns:
+            Dict[str, Union[str, List[str]]]: The strain information, every field missing if the page could not be parsed.
+        """
+        try:
+            doc = html.fromstring(content, parser=html.HTMLParser(encoding=encoding))
+        except (etree.LxmlError, ValueError):
+            return self.empty_result(PARSE_ERROR)
+        return self.extract(doc)
+
+    def extract(self, doc: html.HtmlElement) -> Dict[str, Union[str, List[str]]]:
+        """
+        Extracts the strain information from a parsed page.
+
+        Args:
+            doc (html.HtmlElement): The root element of the page.
+
+        Returns:
+            Dict[str, Union[str, List[str]]]: The strain information. Fields the page does not hold are listed
+            under MISSING_KEY.
+        """
+        strain_info = {}
+        for key, xpath in self.text_fields.items():
+            strain_info[key] = self._get_text(xpath, doc)
+            if strain_info[key] == "None" and key in self.fallbacks:
+                strain_info[key] = self._get_text(self.fallbacks[key], doc)
+        for key, xpath in self.list_fields.items():
+            strain_info[key] = [value.replace('\n', '') for value in xpath(doc)]
+        strain_info[MISSING_KEY] = {key: NOT_ON_PAGE for key in self.fields if strain_info[key] in ('None', [])}
+        return strain_info
+
+
+def parse_page(website: str, content: bytes, encoding: Optional[str] = None) -> Dict[str, Union[str, List[str]]]:
+    """
+    Parses a downloaded page and extracts the strain information with the extractor registered for the website.
+
+    Only plain data goes in and out, so pages can be parsed in a thread or process pool. Extractors used
+    in a process pool have to be registered when the worker processes import their module.
+
+    Args:
+        website (str): The name of the website the page belongs to.
+        content (bytes): The raw page.
+        encoding (str, optional): The encoding of the page, detected from the page if omitted.
+
+    Returns:
+        Dict[str, Union[str, List[str]]]: The strain information.
+    """
+    return EXTRACTORS[website].parse(content, encoding)
+
+
+# Elements that never hold strain information, they are cleared as soon as they are parsed
+DISCARDED_TAGS = frozenset({"script", "style", "noscript", "template", "svg"})
+
+
+def _is_inside(value: Union[etree._Element, str], container: etree._Element) -> bool:
+    """Returns whether an element or a string selected by xpath lies inside the container."""
+    if isinstance(value, etree._Element):
+        element = value
+    else:
+        element = value.getparent()
+        if value.is_tail:  # the text after an element belongs to the element's parent
+            element = element.getparent()
+    while element is not None:
+        if element is container:
+            return True
+        element = element.getparent()
+    return False
+
+
+class IncrementalExtraction():
+    """
+    Extracts strain information from a page that is fed chunk by chunk into an lxml pull parser.
+
+    After every chunk the fields that are not yet found are looked up in the partially parsed page.
+    A text field is found once its element or the element of its fallback is closed. A list field is found once
+    its container is closed, if there is exactly one and it holds every string matched so far, list fields without
+    a container are only complete at the end of the page. Scripts, styles and other elements without strain
+    information are cleared as soon as they are parsed.
+    """
+    def __init__(self, extractor: SiteExtractor, encoding: Optional[str] = None) -> None:
+        """
+        Args:
+            extractor (SiteExtractor): The extractor of the website the page belongs to.
+            encoding (str, optional): The encoding of the page, detected from the page if omitted.
+        """
+        self.extractor = extractor
+        self._parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding,
+                                            remove_comments=True, remove_pis=True)
+        self._parser.set_element_class_lookup(html.HtmlElementClassLookup())
+        self._root: Optional[html.HtmlElement] = None
+        self._open_elements: Set[html.HtmlElement] = set()
+        self._missing_fields = set(extractor.fields)
+
+    @property
+    def complete(self) -> bool:
+        """True once every field of the extractor has been found."""
+        return not self._missing_fields
+
+    def _is_closed(self, xpath: etree.XPath) -> bool:
+        elements = xpath(self._root)
+        return bool(elements) and elements[0] not in self._open_elements
+
+    def _is_found(self, key: str) -> bool:
+        if key in self.extractor.text_fields:
+            return self._is_closed(self.extractor.text_fields[key]) or \
+                (key in self.extractor.fallbacks and self._is_closed(self.extractor.fallbacks[key]))
+        if key in self.extractor.containers:
+            containers = self.extractor.containers[key](self._root)
+            if len(containers) != 1 or containers[0] in self._open_elements:
+                return False
+            # A string outside of the container means it does not hold the whole list
+            return all(_is_inside(value, containers[0])
+                       for value in self.extractor.contained_list_fields[key](self._root))
+        return False
+
+    def feed(self, data: bytes) -> bool:
+        """
+        Parses the next chunk of the page.
+
+        Args:
+            data (bytes): The next chunk of the page.
+
+        Returns:
+            bool: True once every field has been found and the rest of the page can be skipped.
+        """
+        self._parser.feed(data)
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = element.getroottree().getroot()
+                self._open_elements.add(element)
+            else:
+                self._open_elements.discard(element)
+                if element.tag in DISCARDED_TAGS:
+                    element.clear(keep_tail=True)
+        if self._root is not None:
+            self._missing_fields = {key for key in self._missing_fields if not self._is_found(key)}
+        return self.complete
+
+    def close(self) -> Dict[str, Union[str, List[str]]]:
+        """
+        Finishes parsing and extracts the strain information from everything fed so far.
+
+        Returns:
+            Dict[str, Union[str, List[str]]]: The strain information.
+        """
+        try:
+            root = self._parser.close()
+        except (etree.LxmlError, ValueError):
+            root = None
+        self._open_elements.clear()
+        if root is None:
+            return self.extractor.empty_result(PARSE_ERROR)
+        return self.extractor.extract(root)
+
+
+EXTRACTORS: Dict[str, SiteExtractor] = {}
+
+
+def register_extractor(extractor: SiteExtractor) -> SiteExtractor:
+    """
+    Registers an extractor, every registered website is scraped in every lookup.
+    Registering an extractor under an existing name replaces it.
+
+    Args:
+        extractor (SiteExtractor): The extractor to register.
+
+    Returns:
+        SiteExtractor: The registered extractor.
+    """
+    EXTRACTORS[extractor.name] = extractor
+    return extractor
+
+
+def get_extractors() -> List[SiteExtractor]:
+    """Returns the registered extractors in registration order."""
+    return list(EXTRACTORS.values())
+
+
+register_extractor(SiteExtractor(
+    "Cannaconnection", "https://www.cannaconnection.com/strains/{strain_name}",
+    text_fields={
+        "Genetics": '//div[@class="feature-title" and text()="Genetics"]/following-sibling::div[@class="feature-value"]',
+        "THC": '//div[@class="feature-title" and text()="THC"]/following-sibling::div[@class="feature-value"]',
+        "CBD": '//div[@class="feature-title" and text()="CBD"]/following-sibling::div[@class="feature-value"]',
+    },
+    list_fields={
+        "Effects": '//div[@class="multifeature-wrapper"]/div[contains(text(), "Effect")]/following-sibling::div/text()',
+        "Other": '//div[@class="multifeature-wrapper"]/div[contains(text(), "Smell & flavour")]/following-sibling::div/text()',
+    },
+    sitemap_url="https://www.cannaconnection.com/sitemap.xml"))
+
+register_extractor(SiteExtractor(
+    "Leafly", "https://www.leafly.com/strains/{strain_name}",
+    text_fields={
+        "Genetics": '//div[@class="flex items-center mb-xs"]/a/span',
+        "THC": '//span[@data-testid="THC"]',
+        "CBD": '//span[@data-testid="CBD"]',
+    },
+    list_fields={
+        "Effects": '//div[contains(@class, "items-baseline") and (contains(text(), "Feelings:") or contains(text(), "Negatives:"))]//a/text()',
+        "Other": '//div[@id="helps-with-section"]/ul/li/div/a/text()',
+    },
+    fallbacks={
+        "CBD": '//span[@data-testid="CBG"]',
+    },
+    containers={
+        "Other": '//div[@id="helps-with-section"]',
+    },
+    sitemap_url="https://www.leafly.com/sitemap.xml"))
+
+register_extractor(SiteExtractor(
+    "Wikileaf", "https://www.wikileaf.com/strain/{strain_name}/",
+    text_fields={
+        "Genetics": '//div[contains(@class, "type-time")]/a[1]/div[@class="type"]/div[@class="status"]',
+        "THC": '//div[@aria-label="Progress Circle" and text()="THC"]/following-sibling::div//span[@class="compound-percentage"]',
+        "CBD": '//div[@aria-label="Progress Circle" and text()="CBD"]/following-sibling::div//span[@class="compound-percentage"]',
+    },
+    list_fields={
+        "Effects": '//div[@class="typicalEffectsItem"]//div[@class="effect-label"]/span[@class="underline"]/text()',
+        "Other": '//div[contains(@class, "time")]/div[contains(@class, "status")]/text()',
+    },
+    sitemap_url="https://www.wikileaf.com/sitemap.xml"))
@@ -0,0 +1,149 @@
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+PHASES = ("queue", "dns", "connect", "ttfb", "download", "parse", "total")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class SiteTiming():
+    """
+    The timings of scraping one strain from one website.
+
+    The network phases are recorded by the trace config of `create_trace_config`, the others by `get_strain_info`.
+    All durations are in seconds, phases that did not happen (e.g. DNS on a reused connection) are 0.
+
+    - queue: Waiting for a slot of the website from the `RequestScheduler`.
+    - dns: Resolving the host name.
+    - connect: Opening the connection, including the TLS handshake.
+    - ttfb: From the connection being ready until the response headers arrived.
+    - download: Reading the response body.
+    - parse: Parsing the page and extracting the strain information.
+    - total: The whole lookup.
+    """
+    def __init__(self, site: str, strain_name: str, url: str) -> None:
+        self.site = site
+        self.strain_name = strain_name
+        self.url = url
+        self.status: Optional[int] = None
+        self.bytes = 0
+        self.cache: Optional[str] = None  # "hit", "revalidated" or "miss" if a cache is used
+        self.error: Optional[str] = None  # the failure reason, e.g. "timeout", if the website did not answer
+        self.parse = 0.0
+        self.marks: Dict[str, float] = {"start": time.perf_counter()}
+
+    def mark(self, name: str) -> None:
+        """Records the current time under the given name."""
+        self.marks[name] = time.perf_counter()
+
+    def _between(self, start: str, end: str) -> float:
+        if start not in self.marks or end not in self.marks:
+            return 0.0
+        return max(0.0, self.marks[end] - self.marks[start])
+
+    @property
+    def durations(self) -> Dict[str, float]:
+        """The duration of every phase in seconds."""
+        dns = self._between("dns_start", "dns_end")
+        ready = next((name for name in ("connect_end", "reuse", "request_start", "granted") if name in self.marks), "start")
+        return {
+            "queue": self._between("queued", "granted"),
+            "dns": dns,
+            "connect": max(0.0, self._between("connect_start", "connect_end") - dns),
+            "ttfb": self._between(ready, "headers"),
+            "download": self._between("headers", "body"),
+            "parse": self.parse,
+            "total": self._between("start", "end"),
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the timings as a plain dictionary."""
+        return {"site": self.site, "strain_name": self.strain_name, "url": self.url, "status": self.status,
+                "bytes": self.bytes, "cache": self.cache, "error": self.error, **self.durations}
+
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    """
+    Creates a trace config recording the network phases of requests sent with `trace_request_ctx=SiteTiming(...)`.
+    Requests without a SiteTiming are not traced.
+
+    Returns:
+        aiohttp.TraceConfig: The trace config to pass to the client session.
+    """
+    def marker(name: str) -> Callable:
+        async def on_event(session: aiohttp.ClientSession, context: SimpleNamespace, params: Any) -> None:
+            if isinstance(context.trace_request_ctx, SiteTiming):
+                context.trace_request_ctx.mark(name)
+        return on_event
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(marker("request_start"))
+    trace_config.on_dns_resolvehost_start.append(marker("dns_start"))
+    trace_config.on_dns_resolvehost_end.append(marker("dns_end"))
+    trace_config.on_connection_create_start.append(marker("connect_start"))
+    trace_config.on_connection_create_end.append(marker("connect_end"))
+    trace_config.on_connection_reuseconn.append(marker("reuse"))
+    trace_config.on_request_end.append(marker("headers"))
+    return trace_config
+
+
+class DictMetricsSink():
+    """A metrics callback keeping every SiteTiming it receives as a plain dictionary in `records`."""
+    def __init__(self) -> None:
+        self.records: List[Dict[str, Any]] = []
+
+    def __call__(self, timing: SiteTiming) -> None:
+        self.records.append(timing.as_dict())
+
+    def clear(self) -> None:
+        self.records.clear()
+
+
+class MetricsRegistry():
+    """
+    A metrics callback aggregating the timings into Prometheus-style counters and histograms, labelled by website.
+
+    - potparser_requests_total{site, status}: Lookups per website and response status ("cached" for cache hits,
+      the failure reason for lookups without a response, e.g. "timeout").
+    - potparser_response_bytes_total{site}: Page bytes read per website.
+    - potparser_phase_seconds{site, phase}: Histogram of the duration of every phase.
+    """
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.requests: Dict[Tuple[str, str], int] = {}
+        self.response_bytes: Dict[str, int] = {}
+        # (site, phase) -> [count per bucket..., count of all, sum]
+        self.histograms: Dict[Tuple[str, str], List[float]] = {}
+
+    def __call__(self, timing: SiteTiming) -> None:
+        status = "cached" if timing.cache == "hit" else str(timing.status or timing.error)
+        self.requests[timing.site, status] = self.requests.get((timing.site, status), 0) + 1
+        self.response_bytes[timing.site] = self.response_bytes.get(timing.site, 0) + timing.bytes
+        for phase, duration in timing.durations.items():
+            histogram = self.histograms.setdefault((timing.site, phase), [0] * (len(self.buckets) + 2))
+            for idx, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    histogram[idx] += 1
+            histogram[-2] += 1
+            histogram[-1] += duration
+
+    def render(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format."""
+        lines = ["# TYPE potparser_requests_total counter"]
+        lines += [f'potparser_requests_total{{site="{site}",status="{status}"}} {count}'
+                  for (site, status), count in sorted(self.requests.items())]
+        lines.append("# TYPE potparser_response_bytes_total counter")
+        lines += [f'potparser_response_bytes_total{{site="{site}"}} {count}'
+                  for site, count in sorted(self.response_bytes.items())]
+        lines.append("# TYPE potparser_phase_seconds histogram")
+        for (site, phase), histogram in sorted(self.histograms.items()):
+            labels = f'site="{site}",phase="{phase}"'
+            for bound, count in zip(self.buckets, histogram):
+                lines.append(f'potparser_phase_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'potparser_phase_seconds_bucket{{{labels},le="+Inf"}} {histogram[-2]}')
+            lines.append(f'potparser_phase_seconds_count{{{labels}}} {histogram[-2]}')
+            lines.append(f'potparser_phase_seconds_sum{{{labels}}} {histogram[-1]}')
+        return "\n".join(lines) + "\n"
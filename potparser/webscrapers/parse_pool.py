@@ -0,0 +1,68 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
+
+from .extractors import SiteExtractor, parse_page
+
+
+class ParsePool():
+    """
+    Parses downloaded pages on a pool of worker threads or processes instead of the event loop thread.
+
+    lxml releases the GIL while it parses, so a thread pool already spreads the parsing over several cores.
+    A process pool also takes the extraction off the interpreter running the event loop.
+
+    The number of pages downloaded but not yet parsed is capped at `max_pending`. Once the cap is reached,
+    further downloads wait before they read their response body, so downloading cannot run far ahead of parsing.
+    """
+    def __init__(self, max_workers: Optional[int] = None, processes: bool = False, max_pending: Optional[int] = None,
+                 executor: Optional[Executor] = None) -> None:
+        """
+        Args:
+            max_workers (int, optional): The number of workers, defaults to the number of CPUs.
+            processes (bool): Whether to parse in worker processes instead of threads.
+            max_pending (int, optional): The maximum number of pages waiting for or being parsed, defaults to twice the number of workers.
+            executor (Executor, optional): An executor owned by the caller to parse on, `max_workers` and `processes` are ignored if given.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.max_workers
+        self._owns_executor = executor is None
+        if executor is None:
+            executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+            executor = executor_class(max_workers=self.max_workers)
+        self.executor = executor
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def slot(self) -> asyncio.Semaphore:
+        """
+        Returns the semaphore a download holds from reading its response body until its page is parsed.
+
+        The semaphore belongs to the running event loop and is recreated when the pool is used from another loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def parse(self, extractor: SiteExtractor, content: bytes, encoding: Optional[str] = None) -> Dict[str, Union[str, List[str]]]:
+        """
+        Parses a page on the pool.
+
+        Args:
+            extractor (SiteExtractor): The extractor of the website the page belongs to.
+            content (bytes): The raw page.
+            encoding (str, optional): The encoding of the page, detected from the page if omitted.
+
+        Returns:
+            Dict[str, Union[str, List[str]]]: The strain information.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, parse_page, extractor.name, content, encoding)
+
+    def shutdown(self) -> None:
+        """Shuts the workers down, unless the executor is owned by the caller."""
+        if self._owns_executor:
+            self.executor.shutdown()
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+
+class TokenBucket():
+    """
+    A token bucket allowing `rate` acquisitions per second on average and bursts of up to `capacity`.
+
+    Callers that find the bucket empty reserve the next token and sleep until it is due, so waiting
+    callers are served in the order they arrived.
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """
+        Args:
+            rate (float): The tokens added per second.
+            capacity (float, optional): The maximum number of tokens, i.e. the burst size. Defaults to max(1, rate).
+        """
+        self.rate = rate
+        self.capacity = max(1.0, rate) if capacity is None else capacity
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Takes a token if one is available right now, without waiting."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def delay(self) -> float:
+        """Returns the seconds until the next token is available, 0 if one is available now."""
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+    async def acquire(self) -> None:
+        """Takes a token, waiting until one is available."""
+        self._refill()
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+class HostRateLimiter():
+    """One token bucket per host, created on first use with the same rate and burst size."""
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        """
+        Args:
+            rate (float): The requests per second allowed to every host.
+            burst (float, optional): The number of requests a host may get at once after being idle.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, url: str) -> TokenBucket:
+        """Returns the token bucket of the host of a URL."""
+        host = urlsplit(url).netloc
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    async def acquire(self, url: str) -> None:
+        """Waits until a request to the host of the URL is allowed."""
+        await self.bucket(url).acquire()
@@ -0,0 +1,163 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_CACHE_PATH = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+                                  "potparser", "responses.sqlite3")
+
+
+class ResponseCache():
+    """
+    A persistent SQLite cache for scraped strain pages.
+
+    Every entry is keyed by website and URL ending name and holds the raw HTML, the extracted strain information
+    and the validators (ETag / Last-Modified) the website sent with it. Entries younger than `ttl` are served
+    without touching the network, older ones are revalidated with a conditional request. When more than
+    `max_entries` entries are stored the least recently used ones are evicted.
+
+    Cache hits only read the database. Their access times are collected in memory and written in one transaction
+    with the next `put`, at most every `touch_interval` seconds on a hit, on `flush` and on `close`.
+    """
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = 7 * 24 * 60 * 60, max_entries: int = 10000,
+                 touch_interval: float = 60.0) -> None:
+        """
+        Opens (and if needed creates) the cache database.
+
+        Args:
+            path (str): The path of the SQLite database file, ":memory:" keeps the cache in memory.
+            ttl (float): The number of seconds an entry is served without revalidation.
+            max_entries (int): The maximum number of entries kept in the cache.
+            touch_interval (float): The maximum number of seconds the access times of cache hits are held in memory.
+        """
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self._lock = threading.Lock()
+        self._touched: Dict[Tuple[str, str], float] = {}
+        self._flushed_at = time.monotonic()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                site TEXT NOT NULL,
+                slug TEXT NOT NULL,
+                html TEXT,
+                info TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (site, slug)
+            );
+            CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+        """)
+
+    def get(self, site: str, slug: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks up a cached page and marks it as recently used.
+
+        Args:
+            site (str): The name of the website, e.g. "Leafly".
+            slug (str): The URL ending name of the strain.
+
+        Returns:
+            Optional[Dict[str, Any]]: The entry with the keys "html", "info", "etag", "last_modified" and
+            "fetched_at", or None if the page is not cached.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT html, info, etag, last_modified, fetched_at FROM responses WHERE site = ? AND slug = ?",
+                (site, slug)).fetchone()
+            if row is None:
+                return None
+            self._touched[(site, slug)] = time.time()
+            if time.monotonic() - self._flushed_at >= self.touch_interval:
+                self._write_touches()
+                self._connection.commit()
+        html, info, etag, last_modified, fetched_at = row
+        return {"html": html, "info": json.loads(info), "etag": etag,
+                "last_modified": last_modified, "fetched_at": fetched_at}
+
+    def _write_touches(self) -> None:
+        # Called with the lock held, the caller commits
+        if self._touched:
+            self._connection.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE site = ? AND slug = ?",
+                [(accessed_at, site, slug) for (site, slug), accessed_at in self._touched.items()])
+            self._touched.clear()
+        self._flushed_at = time.monotonic()
+
+    def flush(self) -> None:
+        """Writes the access times of the cache hits held in memory."""
+        with self._lock:
+            self._write_touches()
+            self._connection.commit()
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Returns True if the entry is younger than the TTL and can be served without revalidation."""
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    @staticmethod
+    def revalidation_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Returns the conditional request headers to revalidate the entry with."""
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, site: str, slug: str, html: Optional[str], info: Dict[str, Any],
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Stores a freshly downloaded page and evicts the least recently used entries above the size cap.
+
+        Args:
+            site (str): The name of the website, e.g. "Leafly".
+            slug (str): The URL ending name of the strain.
+            html (Optional[str]): The raw HTML of the page.
+            info (Dict[str, Any]): The strain information extracted from the page.
+            etag (Optional[str]): The ETag header sent with the page.
+            last_modified (Optional[str]): The Last-Modified header sent with the page.
+        """
+        now = time.time()
+        with self._lock:
+            # The pending access times decide which entries are the least recently used
+            self._write_touches()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (site, slug, html, json.dumps(info), etag, last_modified, now, now))
+            self._connection.execute(
+                "DELETE FROM responses WHERE rowid IN "
+                "(SELECT rowid FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,))
+            self._connection.commit()
+
+    def refresh(self, site: str, slug: str) -> None:
+        """Marks an entry as fetched right now, after the website confirmed it is unchanged (304)."""
+        now = time.time()
+        with self._lock:
+            self._touched.pop((site, slug), None)
+            self._connection.execute("UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE site = ? AND slug = ?",
+                                     (now, now, site, slug))
+            self._connection.commit()
+
+    def clear(self) -> None:
+        """Removes every entry from the cache."""
+        with self._lock:
+            self._touched.clear()
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Writes the pending access times and closes the cache database."""
+        with self._lock:
+            self._write_touches()
+            self._connection.commit()
+            self._connection.close()
@@ -0,0 +1,200 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from .rate_limit import TokenBucket
+
+# Priority classes, a lower value is served first
+INTERACTIVE = 0  # a user waiting for the answer, e.g. the menu or the service
+PREFETCH = 1  # likely needed soon, e.g. warming the cache
+BULK = 2  # background batches and crawls
+PRIORITIES = {"interactive": INTERACTIVE, "prefetch": PREFETCH, "bulk": BULK}
+
+
+class _PriorityStats():
+    __slots__ = ("granted", "waited", "max_wait")
+
+    def __init__(self) -> None:
+        self.granted = 0
+        self.waited = 0.0
+        self.max_wait = 0.0
+
+
+class RequestScheduler():
+    """
+    Decides which waiting request may be sent next, so interactive lookups don't queue behind a background crawl.
+
+    Every request holds a slot of its host while it runs. A host runs at most `host_concurrency` requests at once
+    and, with `host_rate`, starts at most that many per second (token bucket). With `max_running`, at most that
+    many requests run at once over all hosts, e.g. the connection limit of the shared session. When a slot frees up:
+
+    - Waiting requests of a higher priority class always go first (INTERACTIVE > PREFETCH > BULK).
+    - Within a class, the hosts with waiting requests take turns, so one website with a long queue
+      doesn't hold up the others. This only matters with `max_running`, without it every host has its own
+      slots and never waits for another host.
+    - The last `interactive_reserve` slots of a host, and of `max_running`, are kept for interactive requests,
+      so an interactive request only waits for a free slot, never for a full queue of background requests to drain.
+
+    The scheduler belongs to the event loop it is first used on.
+    """
+    def __init__(self, host_concurrency: int = 4, host_rate: Optional[float] = None, host_burst: Optional[float] = None,
+                 interactive_reserve: int = 1, max_running: Optional[int] = None) -> None:
+        """
+        Args:
+            host_concurrency (int): The maximum number of requests running at once per host.
+            host_rate (float, optional): The maximum number of requests started per second per host. Unlimited if omitted.
+            host_burst (float, optional): The number of requests a host may get at once after being idle.
+            interactive_reserve (int): The number of slots per host (and of `max_running`) only interactive requests
+                may take.
+            max_running (int, optional): The maximum number of requests running at once over all hosts. Unlimited
+                if omitted.
+        """
+        if interactive_reserve >= host_concurrency:
+            raise ValueError("interactive_reserve must leave background requests at least one slot per host")
+        if max_running is not None and interactive_reserve >= max_running:
+            raise ValueError("interactive_reserve must leave background requests at least one of max_running")
+        self.host_concurrency = host_concurrency
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.interactive_reserve = interactive_reserve
+        self.max_running = max_running
+        self._queues: Dict[int, Dict[str, Deque[asyncio.Future]]] = {priority: {} for priority in PRIORITIES.values()}
+        self._running: Dict[str, int] = {}
+        self._total = 0
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._stats = {priority: _PriorityStats() for priority in PRIORITIES.values()}
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+    @staticmethod
+    def host(url: str) -> str:
+        """Returns the host requests to a URL are scheduled under."""
+        return urlsplit(url).netloc or url
+
+    def _bucket(self, host: str) -> Optional[TokenBucket]:
+        if self.host_rate is None:
+            return None
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.host_rate, self.host_burst)
+        return bucket
+
+    def _limit(self, priority: int, limit: int) -> int:
+        return limit if priority == INTERACTIVE else limit - self.interactive_reserve
+
+    def _dispatch(self) -> None:
+        """Grants slots to waiting requests, highest priority first and taking turns between hosts."""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        next_token = None
+        granted = True
+        while granted:  # every pass grants at most one slot per host and class
+            granted = False
+            for priority, hosts in self._queues.items():
+                if self.max_running is not None and self._total >= self._limit(priority, self.max_running):
+                    continue
+                for host in list(hosts):
+                    waiters = hosts[host]
+                    while waiters and waiters[0].done():  # cancelled while waiting
+                        waiters.popleft()
+                    if not waiters:
+                        del hosts[host]
+                        continue
+                    # A host serves its waiting requests of a higher class first
+                    if self._running.get(host, 0) >= self._limit(priority, self.host_concurrency) or \
+                            any(host in self._queues[higher] for higher in range(priority)):
+                        continue
+                    bucket = self._bucket(host)
+                    if bucket is not None and not bucket.try_acquire():
+                        delay = bucket.delay()
+                        next_token = delay if next_token is None else min(next_token, delay)
+                        continue
+                    self._running[host] = self._running.get(host, 0) + 1
+                    self._total += 1
+                    waiters.popleft().set_result(None)
+                    granted = True
+                    # Round robin: the host moves behind the other hosts waiting in its class
+                    del hosts[host]
+                    if waiters:
+                        hosts[host] = waiters
+                    if self.max_running is not None and self._total >= self._limit(priority, self.max_running):
+                        break
+        if next_token is not None:
+            self._wakeup = asyncio.get_running_loop().call_later(next_token, self._dispatch)
+
+    def _release(self, host: str) -> None:
+        self._running[host] -= 1
+        self._total -= 1
+        if not self._running[host]:
+            del self._running[host]
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, url: str, priority: int = INTERACTIVE, timing: Optional[Any] = None) -> AsyncIterator[None]:
+        """
+        Waits for a slot of the URL's host and holds it while the block runs.
+
+        Args:
+            url (str): The URL about to be requested.
+            priority (int): INTERACTIVE, PREFETCH or BULK.
+            timing (SiteTiming, optional): The timing of the lookup, the wait is recorded as its "queue" phase.
+        """
+        host = self.host(url)
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues[priority].setdefault(host, deque()).append(waiter)
+        queued_at = time.perf_counter()
+        if timing is not None:
+            timing.mark("queued")
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():  # granted just before the cancellation
+                self._release(host)
+            raise
+        waited = time.perf_counter() - queued_at
+        if timing is not None:
+            timing.mark("granted")
+        stats = self._stats[priority]
+        stats.granted += 1
+        stats.waited += waited
+        stats.max_wait = max(stats.max_wait, waited)
+        try:
+            yield
+        finally:
+            self._release(host)
+
+    def queue_depth(self, priority: Optional[int] = None) -> int:
+        """Returns the number of requests waiting, in one priority class or in all of them."""
+        priorities = PRIORITIES.values() if priority is None else (priority,)
+        return sum(not waiter.done() for priority in priorities
+                   for waiters in self._queues[priority].values() for waiter in waiters)
+
+    @property
+    def running(self) -> int:
+        """The number of requests holding a slot."""
+        return self._total
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the queue depth, the requests granted and the mean and maximum wait in seconds of every class."""
+        classes: Dict[str, Dict[str, Any]] = {}
+        for name, priority in PRIORITIES.items():
+            stats = self._stats[priority]
+            classes[name] = {
+                "queued": self.queue_depth(priority),
+                "granted": stats.granted,
+                "mean_wait": stats.waited / stats.granted if stats.granted else 0.0,
+                "max_wait": stats.max_wait,
+            }
+        hosts: List[str] = sorted(set(self._running) | {host for hosts in self._queues.values() for host in hosts})
+        return {
+            "running": self.running,
+            "queued": self.queue_depth(),
+            "classes": classes,
+            "hosts": {host: {"running": self._running.get(host, 0),
+                             "queued": sum(not waiter.done() for hosts in self._queues.values()
+                                           for waiter in hosts.get(host, ()))} for host in hosts},
+        }
@@ -0,0 +1,103 @@
+import asyncio
+import gzip
+import zlib
+from typing import Iterable, List, Optional, Set
+
+import aiohttp
+from lxml import etree
+
+from ..helpers.slug_index import SlugIndex
+from .extractors import SiteExtractor, get_extractors
+
+# Sitemap index entries followed first, websites split their sitemaps by page type
+STRAIN_SITEMAP_HINTS = ("strain",)
+
+LOC_XPATH = etree.XPath("//*[local-name()='loc']/text()", smart_strings=False)
+SITEMAP_INDEX_XPATH = etree.XPath("/*[local-name()='sitemapindex']", smart_strings=False)
+
+
+async def _fetch_sitemap(session: aiohttp.ClientSession, url: str) -> Optional[etree._Element]:
+    try:
+        async with session.get(url) as response:
+            if response.status != 200:
+                return None
+            content = await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return None
+    if content[:2] == b"\x1f\x8b":
+        try:
+            content = gzip.decompress(content)
+        except (gzip.BadGzipFile, EOFError, zlib.error):  # a corrupt or cut off download
+            return None
+    try:
+        return etree.fromstring(content, parser=etree.XMLParser(resolve_entities=False, huge_tree=True))
+    except etree.XMLSyntaxError:
+        return None
+
+
+async def fetch_site_slugs(session: aiohttp.ClientSession, extractor: SiteExtractor, max_sitemaps: int = 50) -> Set[str]:
+    """
+    Collects the URL ending names of every strain page listed in the sitemap of a website.
+
+    Sitemap indexes are followed, sitemaps whose URL hints at strains first.
+
+    Parameters:
+        session (aiohttp.ClientSession): The aiohttp client session.
+        extractor (SiteExtractor): The extractor of the website, it needs a `sitemap_url`.
+        max_sitemaps (int): The maximum number of sitemaps downloaded for the website.
+
+    Returns:
+        set: The URL ending names of the strain pages, empty if the website has no (reachable) sitemap.
+    """
+    slugs: Set[str] = set()
+    if extractor.sitemap_url is None:
+        return slugs
+    pending = [extractor.sitemap_url]
+    seen = set()
+    while pending and len(seen) < max_sitemaps:
+        url = pending.pop(0)
+        if url in seen:
+            continue
+        seen.add(url)
+        root = await _fetch_sitemap(session, url)
+        if root is None:
+            continue
+        locations = [location.strip() for location in LOC_XPATH(root)]
+        if SITEMAP_INDEX_XPATH(root):
+            hinted = [location for location in locations if any(hint in location for hint in STRAIN_SITEMAP_HINTS)]
+            pending = hinted + pending + [location for location in locations if location not in hinted]
+            continue
+        for location in locations:
+            slug = extractor.strain_name_from_url(location)
+            if slug is not None:
+                slugs.add(slug)
+    return slugs
+
+
+async def build_slug_index(extractors: Optional[Iterable[SiteExtractor]] = None,
+                           session: Optional[aiohttp.ClientSession] = None, min_score: float = 0.6) -> SlugIndex:
+    """
+    Builds a slug index from the sitemaps of the websites.
+
+    Websites whose sitemap lists no strain pages are left out of the index, so their strains are
+    still looked up by the name as entered.
+
+    Parameters:
+        extractors (Iterable[SiteExtractor], optional): The websites to index, defaults to every registered website.
+        session (aiohttp.ClientSession, optional): A session to send the requests with. A new one is created if omitted.
+        min_score (float): The minimum trigram similarity a suggestion of the index needs.
+
+    Returns:
+        SlugIndex: The slug index.
+    """
+    extractors: List[SiteExtractor] = list(get_extractors() if extractors is None else extractors)
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            return await build_slug_index(extractors, session, min_score)
+
+    results = await asyncio.gather(*(fetch_site_slugs(session, extractor) for extractor in extractors))
+    index = SlugIndex(min_score=min_score)
+    for extractor, slugs in zip(extractors, results):
+        if slugs:
+            index.add(extractor.name, slugs)
+    return index
@@ -1,139 +1,407 @@
 import asyncio
-from typing import Any, Dict, List, Union
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 import aiohttp
-from lxml import html
 
+from ..helpers.slug_index import SlugIndex
+from .circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from .extractors import (CIRCUIT_OPEN, CONNECTION_ERROR, DEADLINE, FAILURE_REASONS, HTTP_ERROR, MISSING_KEY, NOT_FOUND,
+                         QUORUM_REACHED, SLUG_KEY, TIMEOUT, UNRESOLVED, IncrementalExtraction, SiteExtractor, get_extractors)
+from .metrics import SiteTiming, create_trace_config
+from .parse_pool import ParsePool
+from .response_cache import ResponseCache
+from .scheduler import INTERACTIVE, RequestScheduler
 
-def remove_substrings(string: str) -> str:
-    """
-    Removes words from a string.
+STREAM_CHUNK_SIZE = 16 * 1024
 
-    Parameters:
-        string (str): The input string.
 
-    Returns:
-        str: The modified string with the specified words removed.
+async def get_strain_info(session: aiohttp.ClientSession, extractor: SiteExtractor, strain_name: str,
+                          cache: Optional[ResponseCache] = None, stream: bool = False,
+                          parse_pool: Optional[ParsePool] = None,
+                          metrics: Optional[Callable[[SiteTiming], None]] = None,
+                          slug_index: Optional[SlugIndex] = None, site_timeout: Optional[float] = None,
+                          breakers: Optional[CircuitBreakerRegistry] = None, scheduler: Optional[RequestScheduler] = None,
+                          priority: int = INTERACTIVE) -> Dict[str, Union[str, List[str]]]:
     """
-    remove_words = {"THC", "CBD", "CBG"}
-    return " ".join(word for word in string.split() if word not in remove_words)
+    Scrapes strain information from one website using its extractor.
 
+    In streaming mode the page is parsed chunk by chunk while it is downloaded and the download is
+    cut short as soon as every field has been found. The raw HTML of a page cut short is not cached.
 
-async def get_strain_info(session: aiohttp.ClientSession, url: str, xpath_dict: dict[str, str]) -> dict[str, str]:
-    """
-    Scrapes strain information from a given URL using specified xpaths.
+    Fields that could not be scraped are listed under MISSING_KEY with the reason, e.g. TIMEOUT or NOT_FOUND.
+    Fresh cached pages are served even while the website's circuit breaker is open. Only requests sent count
+    towards the breaker: timeouts, connection errors and error statuses as failures, every other answer as a success.
 
     Parameters:
         session (aiohttp.ClientSession): The aiohttp client session.
-        url (str): The URL to scrape strain information from.
-        xpath_dict (dict): A dictionary of keys and xpath expressions used to scrape information.
+        extractor (SiteExtractor): The extractor of the website to scrape.
+        strain_name (str): The URL ending name of the strain.
+        cache (ResponseCache, optional): A cache to serve and store the page and its strain information.
+        stream (bool): Whether to parse the page while it is downloaded.
+        parse_pool (ParsePool, optional): A pool to parse the page on instead of the event loop thread. Not used in streaming mode.
+        metrics (Callable[[SiteTiming], None], optional): A callback receiving the timings, byte count and status of the lookup.
+            The network phases are only recorded if the session was created with `create_trace_config`.
+        slug_index (SlugIndex, optional): An index resolving the strain name to the URL ending name the website uses,
+            which is recorded under SLUG_KEY. No request is sent if the website has no matching strain.
+        site_timeout (float, optional): Seconds the website gets to answer, including the download and the parsing
+            but not the wait for the scheduler.
+        breakers (CircuitBreakerRegistry, optional): The circuit breakers deciding whether the website is requested.
+        scheduler (RequestScheduler, optional): The scheduler the request waits for a slot of the website from.
+            Pages served from the cache don't wait.
+        priority (int): The priority class of the request, INTERACTIVE, PREFETCH or BULK.
 
     Returns:
         dict: A dictionary containing the scraped strain information.
     """
+    if slug_index is not None:
+        strain_name = slug_index.resolve(strain_name, extractor.name)
+        if strain_name is None:
+            return extractor.empty_result(UNRESOLVED)
+    breaker = breakers.get(extractor.name) if breakers is not None else None
+    timing = SiteTiming(extractor.name, strain_name, extractor.url(strain_name))
+    try:
+        strain_info = await _get_strain_info(session, extractor, strain_name, cache, stream, parse_pool, timing,
+                                             site_timeout, breaker, scheduler, priority)
+    except asyncio.TimeoutError:
+        timing.error = TIMEOUT
+        strain_info = extractor.empty_result(TIMEOUT)
+    finally:
+        timing.mark("end")
+        if metrics is not None:
+            metrics(timing)
+    if slug_index is not None:
+        strain_info = {**strain_info, SLUG_KEY: strain_name}  # cached results are shared, they are not modified
+    return strain_info
+
+
+async def _get_strain_info(session: aiohttp.ClientSession, extractor: SiteExtractor, strain_name: str,
+                           cache: Optional[ResponseCache], stream: bool, parse_pool: Optional[ParsePool],
+                           timing: SiteTiming, site_timeout: Optional[float], breaker: Optional[CircuitBreaker],
+                           scheduler: Optional[RequestScheduler], priority: int) -> Dict[str, Union[str, List[str]]]:
+    entry = None
+    if cache is not None:
+        entry = cache.get(extractor.name, strain_name)
+        timing.cache = "miss"
+        if entry is not None and cache.is_fresh(entry):
+            timing.cache = "hit"
+            return entry["info"]
+
+    # The breaker only gates the request, and only the website's answers count towards it
+    if breaker is not None and not breaker.allow():
+        return extractor.empty_result(CIRCUIT_OPEN)
     try:
-        async with session.get(url) as response:
+        strain_info = await _send_request(session, extractor, strain_name, cache, entry, stream, parse_pool, timing,
+                                          site_timeout, scheduler, priority)
+    except asyncio.TimeoutError:
+        if breaker is not None:
+            breaker.record_failure()
+        raise
+    if breaker is not None:
+        if timing.error in FAILURE_REASONS:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+    return strain_info
+
+
+async def _send_request(session: aiohttp.ClientSession, extractor: SiteExtractor, strain_name: str,
+                        cache: Optional[ResponseCache], entry: Optional[Dict[str, Any]], stream: bool,
+                        parse_pool: Optional[ParsePool], timing: SiteTiming, site_timeout: Optional[float],
+                        scheduler: Optional[RequestScheduler], priority: int) -> Dict[str, Union[str, List[str]]]:
+    fetch = _fetch_strain_info(session, extractor, strain_name, cache, entry, stream, parse_pool, timing)
+    if scheduler is None:
+        return await asyncio.wait_for(fetch, site_timeout)
+    try:
+        async with scheduler.slot(timing.url, priority, timing):
+            return await asyncio.wait_for(fetch, site_timeout)
+    finally:
+        fetch.close()  # never awaited if the wait for the slot was cancelled
+
+
+async def _fetch_strain_info(session: aiohttp.ClientSession, extractor: SiteExtractor, strain_name: str,
+                             cache: Optional[ResponseCache], entry: Optional[Dict[str, Any]], stream: bool,
+                             parse_pool: Optional[ParsePool], timing: SiteTiming) -> Dict[str, Union[str, List[str]]]:
+    try:
+        async with session.get(timing.url, headers=ResponseCache.revalidation_headers(entry),
+                               trace_request_ctx=timing) as response:
+            timing.status = response.status
+            if response.status == 304 and entry is not None:
+                timing.cache = "revalidated"
+                cache.refresh(extractor.name, strain_name)
+                return entry["info"]
             if response.status == 404:
-                return {'Genetics': 'None', 'THC': 'None', 'CBD': 'None', 'Effects': 'None', 'Other': 'None'}
-            html_content = await response.text()  # extract HTML content from response
-    except aiohttp.ClientError:
-        return {'Genetics': 'None', 'THC': 'None', 'CBD': 'None', 'Effects': 'None', 'Other': 'None'}
-
-        # Parse the HTML content using lxml
-    doc = html.fromstring(html_content)
-    strain_info = {}
-
-    def get_value(xpath: str) -> Any:
-        try:
-            value_element: Union[html.HtmlElement, List[html.HtmlElement]] = doc.xpath(xpath)[
-                0]
-            if isinstance(value_element, list):
-                value: List[str] = [remove_substrings(
-                    elem.text_content().strip("\n")) for elem in value_element]
+                return extractor.empty_result(NOT_FOUND)
+            if response.status >= 400:
+                timing.error = HTTP_ERROR
+                return extractor.empty_result(HTTP_ERROR)
+            if stream:
+                extraction = IncrementalExtraction(extractor, response.charset)
+                # A page read to the end is cached like a downloaded one, a page cut short is not
+                chunks = [] if cache is not None else None
+                found = False
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    timing.bytes += len(chunk)
+                    if chunks is not None:
+                        chunks.append(chunk)
+                    start = time.perf_counter()
+                    found = extraction.feed(chunk)
+                    timing.parse += time.perf_counter() - start
+                    if found:
+                        response.close()  # skip the rest of the page
+                        break
+                if chunks is not None and not found:
+                    content, encoding = b"".join(chunks), response.charset or "utf-8"
+                timing.mark("body")
+                start = time.perf_counter()
+                strain_info = extraction.close()
+                timing.parse += time.perf_counter() - start
+            elif parse_pool is None:
+                content = await response.read()
+                timing.mark("body")
+                timing.bytes = len(content)
+                encoding = response.get_encoding()
+                start = time.perf_counter()
+                strain_info = extractor.parse(content, encoding)
+                timing.parse = time.perf_counter() - start
             else:
-                value: str = remove_substrings(
-                    value_element.text_content().strip("\n"))
-        except IndexError:
-            value = "None"
-        return value
-
-    for key, xpath in xpath_dict.items():
-        if key in {"CBD", "THC", "Genetics"}:
-            strain_info[key] = get_value(xpath)
-            if strain_info[key] == "None" and key == "CBD":
-                strain_info[key] = get_value(xpath_dict["CBD_alt"])
-        elif key == "Effects":
-            value_element: List[html.HtmlElement] = doc.xpath(xpath)
-            value: List[str] = [elem.replace('\n', '')
-                                for elem in value_element]
-            strain_info[key] = value
-        elif key == "Flavor":
-            value_element: List[html.HtmlElement] = doc.xpath(xpath)
-            value: List[str] = [elem.replace('\n', '')
-                                for elem in value_element]
-            strain_info['Other'] = value
-        elif key == 'Other':
-            strain_info['Other']: Union[str, List[str]] = doc.xpath(xpath)
+                async with parse_pool.slot():
+                    content = await response.read()
+                    timing.mark("body")
+                    timing.bytes = len(content)
+                    encoding = response.get_encoding()
+                    start = time.perf_counter()
+                    strain_info = await parse_pool.parse(extractor, content, encoding)
+                    timing.parse = time.perf_counter() - start
+    except asyncio.TimeoutError:
+        raise  # aiohttp's own timeouts are reported like the per-site timeout
+    except aiohttp.ClientError:
+        timing.error = CONNECTION_ERROR
+        return extractor.empty_result(CONNECTION_ERROR)
 
+    if cache is not None and response.status == 200:
+        html_content = None if stream and found else content.decode(encoding, errors="replace")
+        cache.put(extractor.name, strain_name, html_content, strain_info,
+                  response.headers.get("ETag"), response.headers.get("Last-Modified"))
     return strain_info
 
 
-async def scrape_strain_info(strain_name: str) -> List[List[Dict[str, Union[str, List[str]]]]]:
+def create_client_session(concurrency: int = 100, per_host_limit: int = 10) -> aiohttp.ClientSession:
+    """
+    Creates a client session meant to be reused across many lookups.
+
+    The connector keeps connections alive between requests, caches DNS lookups and caps
+    the number of connections opened in total and per website. The session records the
+    network timings of every lookup, see `create_trace_config`.
+
+    Parameters:
+        concurrency (int): The maximum number of connections open at the same time.
+        per_host_limit (int): The maximum number of connections open to a single website.
+
+    Returns:
+        aiohttp.ClientSession: The client session. It has to be closed by the caller.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=concurrency, limit_per_host=per_host_limit, ttl_dns_cache=300, keepalive_timeout=30)
+    return aiohttp.ClientSession(connector=connector, trace_configs=[create_trace_config()])
+
+
+async def scrape_strain_info(strain_name: str, session: Optional[aiohttp.ClientSession] = None,
+                             cache: Optional[ResponseCache] = None, stream: bool = False,
+                             parse_pool: Optional[ParsePool] = None,
+                             metrics: Optional[Callable[[SiteTiming], None]] = None,
+                             slug_index: Optional[SlugIndex] = None, site_timeout: Optional[float] = None,
+                             deadline: Optional[float] = None, quorum: Optional[int] = None,
+                             breakers: Optional[CircuitBreakerRegistry] = None,
+                             scheduler: Optional[RequestScheduler] = None,
+                             priority: int = INTERACTIVE) -> List[Dict[str, Union[str, List[str]]]]:
     """
-    Scrapes strain information from multiple websites using specified xpaths.
+    Scrapes strain information from every registered website.
+
+    The lookup returns once every website answered, the deadline passed or `quorum` websites answered,
+    whichever comes first. Websites that did not answer by then are cancelled and get every field missing
+    with the reason DEADLINE or QUORUM_REACHED.
 
     Parameters:
         strain_name (str): The name of the strain to scrape information for.
+        session (aiohttp.ClientSession, optional): A session to send the requests with. A new one is created if omitted.
+        cache (ResponseCache, optional): A cache to serve and store the pages and their strain information.
+        stream (bool): Whether to parse the pages while they are downloaded.
+        parse_pool (ParsePool, optional): A pool to parse the pages on instead of the event loop thread.
+        metrics (Callable[[SiteTiming], None], optional): A callback receiving the timings of every website's lookup.
+        slug_index (SlugIndex, optional): An index resolving the strain name per website, websites without a match are skipped.
+        site_timeout (float, optional): Seconds every website gets to answer.
+        deadline (float, optional): Seconds the whole lookup may take.
+        quorum (int, optional): The number of websites whose answer is enough. Websites that failed
+            (timeout, error, open circuit breaker) do not count.
+        breakers (CircuitBreakerRegistry, optional): The circuit breakers deciding which websites are requested.
+        scheduler (RequestScheduler, optional): The scheduler every request waits for a slot of its website from.
+        priority (int): The priority class of the requests, INTERACTIVE, PREFETCH or BULK.
 
     Returns:
-        dict: A dictionary containing the scraped strain information. The keys are the following:
+        list: One dictionary per website containing the scraped strain information. The keys are the following:
               - "Genetics": The genetic lineage of the strain.
               - "THC": The THC content of the strain.
               - "CBD": The CBD content of the strain.
               - "Effects": A list of the positive and negative effects of the strain.
               - "Other": Additional information about the strain like flavour, medical aspects & suitable time.
     """
-    urls_xpath_dict = {
-        "Cannaconnection": {
-            "url": f"https://www.cannaconnection.com/strains/{strain_name}",
-            "xpath_dict": {
-                "Genetics": '//div[@class="feature-title" and text()="Genetics"]/following-sibling::div[@class="feature-value"]',
-                "THC": '//div[@class="feature-title" and text()="THC"]/following-sibling::div[@class="feature-value"]',
-                "CBD": '//div[@class="feature-title" and text()="CBD"]/following-sibling::div[@class="feature-value"]',
-                "Effects": '//div[@class="multifeature-wrapper"]/div[contains(text(), "Effect")]/following-sibling::div/text()',
-                "Flavor": '//div[@class="multifeature-wrapper"]/div[contains(text(), "Smell & flavour")]/following-sibling::div/text()',
-            }
-        },
-        "Leafly": {
-            "url": f"https://www.leafly.com/strains/{strain_name}",
-            "xpath_dict": {
-                "Genetics": '//div[@class="flex items-center mb-xs"]/a/span',
-                "THC": '//span[@data-testid="THC"]',
-                "CBD": '//span[@data-testid="CBD"]',
-                "CBD_alt": '//span[@data-testid="CBG"]',
-                "Effects": '//div[contains(@class, "items-baseline") and (contains(text(), "Feelings:") or contains(text(), "Negatives:"))]//a/text()',
-                "Other": '//div[@id="helps-with-section"]/ul/li/div/a/text()'
-            }
-        },
-        "Wikileaf": {
-            "url": f"https://www.wikileaf.com/strain/{strain_name}/",
-            "xpath_dict": {
-                "Genetics": '//div[contains(@class, "type-time")]/a[1]/div[@class="type"]/div[@class="status"]',
-                "THC": '//div[@aria-label="Progress Circle" and text()="THC"]/following-sibling::div//span[@class="compound-percentage"]',
-                "CBD": '//div[@aria-label="Progress Circle" and text()="CBD"]/following-sibling::div//span[@class="compound-percentage"]',
-                "Effects": '//div[@class="typicalEffectsItem"]//div[@class="effect-label"]/span[@class="underline"]/text()',
-                "Other": '//div[contains(@class, "time")]/div[contains(@class, "status")]/text()'
-            }
-        }
-    }
-
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for website, data in urls_xpath_dict.items():
-            url = data["url"]
-            xpath_dict = data["xpath_dict"]
-            tasks.append(asyncio.create_task(
-                get_strain_info(session, url, xpath_dict)))
-
-        results = await asyncio.gather(*tasks)
-        return results
+    if session is None:
+        async with aiohttp.ClientSession(trace_configs=[create_trace_config()]) as session:
+            return await scrape_strain_info(strain_name, session, cache, stream, parse_pool, metrics, slug_index,
+                                            site_timeout, deadline, quorum, breakers, scheduler, priority)
+
+    extractors = get_extractors()
+    tasks = {}
+    for extractor in extractors:
+        tasks[asyncio.create_task(
+            get_strain_info(session, extractor, strain_name, cache, stream, parse_pool, metrics, slug_index,
+                            site_timeout, breakers, scheduler, priority))] = extractor.name
+    if deadline is None and quorum is None:
+        return await asyncio.gather(*tasks)
+
+    loop = asyncio.get_running_loop()
+    end = None if deadline is None else loop.time() + deadline
+    results: Dict[str, Dict[str, Union[str, List[str]]]] = {}
+    pending = set(tasks)
+    answered = 0
+    reason = DEADLINE
+    try:
+        while pending:
+            timeout = None if end is None else max(0.0, end - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                strain_info = task.result()
+                results[tasks[task]] = strain_info
+                if not FAILURE_REASONS.intersection(strain_info.get(MISSING_KEY, {}).values()):
+                    answered += 1
+            if quorum is not None and answered >= quorum:
+                reason = QUORUM_REACHED
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return [results.get(extractor.name) or extractor.empty_result(reason) for extractor in extractors]
+
+
+async def iter_strain_info(strain_names: Iterable[str], session: Optional[aiohttp.ClientSession] = None,
+                           concurrency: int = 100, per_host_limit: int = 10, cache: Optional[ResponseCache] = None,
+                           stream: bool = False, parse_pool: Optional[ParsePool] = None,
+                           metrics: Optional[Callable[[SiteTiming], None]] = None,
+                           slug_index: Optional[SlugIndex] = None, site_timeout: Optional[float] = None,
+                           breakers: Optional[CircuitBreakerRegistry] = None,
+                           scheduler: Optional[RequestScheduler] = None,
+                           priority: int = INTERACTIVE) -> AsyncIterator[Tuple[str, str, Dict[str, Union[str, List[str]]]]]:
+    """
+    Scrapes strain information for many strains at once and yields every website's result as soon as it is done.
+
+    At most `concurrency` requests run at the same time, the next one is only started when one of them is done,
+    so a long list of strains does not create all of its requests up front. Requests that are still running when
+    the iteration is stopped early are cancelled.
+
+    Parameters:
+        strain_names (Iterable[str]): The URL ending names of the strains to scrape information for.
+        session (aiohttp.ClientSession, optional): A session to send the requests with. A pooled session is created
+            (and closed afterwards) if omitted.
+        concurrency (int): The maximum number of requests running at the same time.
+        per_host_limit (int): The maximum number of connections open to a single website, if the session is created here.
+        cache (ResponseCache, optional): A cache to serve and store the pages and their strain information.
+        stream (bool): Whether to parse the pages while they are downloaded.
+        parse_pool (ParsePool, optional): A pool to parse the pages on instead of the event loop thread.
+        metrics (Callable[[SiteTiming], None], optional): A callback receiving the timings of every website's lookup.
+        slug_index (SlugIndex, optional): An index resolving the strain names per website, websites without a match are skipped.
+        site_timeout (float, optional): Seconds every website gets to answer, not counting the wait for a free slot.
+        breakers (CircuitBreakerRegistry, optional): The circuit breakers deciding which websites are requested, so a
+            failing website is skipped for the rest of the batch instead of timing out for every strain.
+        scheduler (RequestScheduler, optional): The scheduler every request waits for a slot of its website from,
+            e.g. one shared with interactive lookups so a batch only uses the capacity they leave.
+        priority (int): The priority class of the requests, INTERACTIVE, PREFETCH or BULK.
+
+    Yields:
+        tuple: The strain name, the website name and the scraped strain information.
+    """
+    owns_session = session is None
+    if owns_session:
+        session = create_client_session(concurrency, per_host_limit)
+    extractors = get_extractors()
+
+    def unique(names: Iterable[str]) -> Iterator[str]:
+        seen: Set[str] = set()
+        for name in names:
+            if name not in seen:
+                seen.add(name)
+                yield name
+
+    lookups = ((extractor, strain_name) for strain_name in unique(strain_names) for extractor in extractors)
+    running: Set[asyncio.Task] = set()
+
+    async def named_get_strain_info(extractor: SiteExtractor, strain_name: str) -> Tuple[str, str, Dict[str, Union[str, List[str]]]]:
+        return strain_name, extractor.name, await get_strain_info(session, extractor, strain_name, cache, stream,
+                                                                parse_pool, metrics, slug_index, site_timeout,
+                                                                breakers, scheduler, priority)
+
+    def start_next() -> None:
+        lookup = next(lookups, None)
+        if lookup is not None:
+            running.add(asyncio.create_task(named_get_strain_info(*lookup)))
+
+    try:
+        for _ in range(concurrency):
+            start_next()
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                running.discard(task)
+                start_next()
+                yield task.result()
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        if owns_session:
+            await session.close()
+
+
+async def scrape_strains_info(strain_names: Iterable[str], concurrency: int = 100, per_host_limit: int = 10,
+                              cache: Optional[ResponseCache] = None, stream: bool = False,
+                              session: Optional[aiohttp.ClientSession] = None,
+                              parse_pool: Optional[ParsePool] = None,
+                              metrics: Optional[Callable[[SiteTiming], None]] = None,
+                              slug_index: Optional[SlugIndex] = None, site_timeout: Optional[float] = None,
+                              breakers: Optional[CircuitBreakerRegistry] = None,
+                              scheduler: Optional[RequestScheduler] = None,
+                              priority: int = INTERACTIVE) -> Dict[str, List[Dict[str, Union[str, List[str]]]]]:
+    """
+    Scrapes strain information for many strains at once over a single pooled client session.
+
+    At most `concurrency` requests run at the same time, the next one is started when one of them is done.
+
+    Parameters:
+        strain_names (Iterable[str]): The URL ending names of the strains to scrape information for.
+        concurrency (int): The maximum number of requests running at the same time.
+        per_host_limit (int): The maximum number of connections open to a single website, if the session is created here.
+        cache (ResponseCache, optional): A cache to serve and store the pages and their strain information.
+        stream (bool): Whether to parse the pages while they are downloaded.
+        session (aiohttp.ClientSession, optional): A session to send the requests with. A pooled session is created
+            (and closed afterwards) if omitted.
+        parse_pool (ParsePool, optional): A pool to parse the pages on instead of the event loop thread.
+        metrics (Callable[[SiteTiming], None], optional): A callback receiving the timings of every website's lookup.
+        slug_index (SlugIndex, optional): An index resolving the strain names per website, websites without a match are skipped.
+        site_timeout (float, optional): Seconds every website gets to answer, not counting the wait for a free slot.
+        breakers (CircuitBreakerRegistry, optional): The circuit breakers deciding which websites are requested.
+        scheduler (RequestScheduler, optional): The scheduler every request waits for a slot of its website from.
+        priority (int): The priority class of the requests, INTERACTIVE, PREFETCH or BULK.
+
+    Returns:
+        dict: A dictionary mapping every strain name to its results as returned by `scrape_strain_info`.
+    """
+    websites = [extractor.name for extractor in get_extractors()]
+    results = {strain_name: {} for strain_name in strain_names}
+    async for strain_name, website, strain_info in iter_strain_info(results, session, concurrency, per_host_limit,
+                                                                    cache, stream, parse_pool, metrics, slug_index,
+                                                                    site_timeout, breakers, scheduler, priority):
+        results[strain_name][website] = strain_info
+    return {strain_name: [site_results[website] for website in websites] for strain_name, site_results in results.items()}
@@ -27,4 +27,7 @@ setup(
         'Operating System :: OS Independent',
     ],
     install_requires=get_requirements('requirements.txt'),
+    extras_require={
+        'grid': ['numpy>=1.21'],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,54 @@
+import asyncio
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, ContextManager, Iterator
+
+import pytest
+
+# The stand-in server of the benchmarks serves the fixture pages under the websites' URL schemes
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+
+from run_benchmarks import stand_in_urls  # noqa: E402
+from server import StandInServer  # noqa: E402
+
+
+@pytest.fixture
+def stand_in() -> Callable[[Callable[[StandInServer], Awaitable[Any]]], Any]:
+    """
+    Runs a coroutine function against a fresh stand-in server, with every extractor pointed at it.
+
+    The coroutine function receives the server, e.g. `stand_in(lambda server: scrape_strain_info("og-kush"))`.
+    """
+    def run(test: Callable[[StandInServer], Awaitable[Any]]) -> Any:
+        async def main() -> Any:
+            async with StandInServer() as server:
+                with stand_in_urls(server):
+                    return await test(server)
+        return asyncio.run(main())
+    return run
+
+
+@pytest.fixture
+def threaded_stand_in() -> Callable[[], ContextManager[StandInServer]]:
+    """
+    Runs a stand-in server on an event loop of its own for the duration of a block, with every extractor pointed at it,
+    so code starting its own event loop (like the CLI commands) can run against it, e.g. `with threaded_stand_in() as server:`.
+    """
+    @contextmanager
+    def run() -> Iterator[StandInServer]:
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        server = StandInServer()
+        asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+        try:
+            with stand_in_urls(server):
+                yield server
+        finally:
+            asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+    return run
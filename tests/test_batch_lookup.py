@@ -0,0 +1,56 @@
+import asyncio
+
+from potparser import PotParser
+from potparser.webscrapers import create_client_session
+
+
+def test_get_strains_returns_every_website_of_every_strain(stand_in):
+    async def test(server):
+        async with create_client_session() as session:
+            return await PotParser().aget_strains(["OG Kush", "blue dream", "nope-nope"], session)
+
+    results = stand_in(test)
+    assert list(results) == ["OG Kush", "blue dream", "nope-nope"]
+    assert [info["THC"] for info in results["OG Kush"]] == ["20-25%", "19%", "21%"]
+    assert all(info["Missing"]["THC"] == "not_found" for info in results["nope-nope"])
+
+
+def test_batch_shares_one_session(stand_in):
+    async def test(server):
+        async with create_client_session(per_host_limit=2) as session:
+            await PotParser().aget_strains([f"og-kush-{idx}" for idx in range(10)], session)
+            return session.closed, server.requests
+
+    closed, requests = stand_in(test)
+    assert not closed  # a session owned by the caller is left open
+    assert requests == 30
+
+
+def test_results_arrive_in_completion_order(stand_in):
+    async def test(server):
+        server.site_latency["leafly"] = 0.2
+        return [website async for _, website, _ in PotParser().iter_strains(["og-kush", "blue-dream"])]
+
+    websites = stand_in(test)
+    assert sorted(websites[:4]) == ["Cannaconnection", "Cannaconnection", "Wikileaf", "Wikileaf"]
+    assert websites[4:] == ["Leafly", "Leafly"]
+
+
+def lookup_tasks():
+    return [task for task in asyncio.all_tasks() if "iter_strain_info" in task.get_coro().__qualname__]
+
+
+def test_lookups_start_lazily_and_stop_with_the_loop(stand_in):
+    async def test(server):
+        results = PotParser().iter_strains([f"og-kush-{idx}" for idx in range(100)], concurrency=4)
+        async for _ in results:
+            running = len(lookup_tasks())
+            break
+        await results.aclose()
+        await asyncio.sleep(0.05)
+        return running, lookup_tasks(), server.requests
+
+    running, left, requests = stand_in(test)
+    assert running <= 4
+    assert left == []
+    assert requests <= 5
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from potparser.cli import main
+from potparser.views.batch_scrape import EXIT_FAILED, EXIT_NOT_FOUND
+from potparser.webscrapers import RequestScheduler
+
+
+def scrape(tmp_path, capsys, strain_names, *args):
+    names = tmp_path / "names.txt"
+    names.write_text("\n".join(strain_names) + "\n")
+    output = tmp_path / "strains.jsonl"
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--site-timeout", "2", "scrape", "--input", str(names), "--output", str(output), *args])
+    lines = output.read_text().splitlines()
+    return exit_info.value.code, [json.loads(line) for line in lines], capsys.readouterr().err.strip()
+
+
+def test_every_strain_found(tmp_path, capsys, threaded_stand_in):
+    with threaded_stand_in():
+        code, strains, summary = scrape(tmp_path, capsys, ["og-kush", "blue-dream"])
+    assert code == 0
+    assert len(strains) == 2
+    assert summary == "2 of 2 strains scraped, 0 not found, 0 failed"
+
+
+def test_unknown_strains_are_not_found(tmp_path, capsys, threaded_stand_in):
+    with threaded_stand_in():
+        code, strains, summary = scrape(tmp_path, capsys, ["og-kush", "nope-nope"])
+    assert code == EXIT_NOT_FOUND
+    assert summary == "2 of 2 strains scraped, 1 not found, 0 failed"
+
+
+def test_websites_not_answering_are_failures_not_unknown_strains(tmp_path, capsys, threaded_stand_in):
+    with threaded_stand_in() as server:
+        server.error_rate = 1.0
+        code, strains, summary = scrape(tmp_path, capsys, ["og-kush", "blue-dream"])
+    assert code == EXIT_FAILED
+    assert summary.startswith("2 of 2 strains scraped, 0 not found, 2 failed")
+
+
+def test_fail_fast_names_the_cause(tmp_path, capsys, threaded_stand_in):
+    with threaded_stand_in() as server:
+        server.error_rate = 1.0
+        code, strains, summary = scrape(tmp_path, capsys, ["og-kush"] + [f"og-kush-{idx}" for idx in range(20)],
+                                        "--fail-fast", "--concurrency", "3")
+    assert code == EXIT_FAILED
+    assert len(strains) < 21
+    assert "1 failed, stopped at the first strain that could not be scraped (--fail-fast)" in summary
+
+    with threaded_stand_in():
+        code, strains, summary = scrape(tmp_path, capsys, ["nope-nope"] + [f"og-kush-{idx}" for idx in range(20)],
+                                        "--fail-fast", "--concurrency", "3")
+    assert code == EXIT_NOT_FOUND
+    assert "1 not found, 0 failed, stopped at the first strain that was not found (--fail-fast)" in summary
+
+
+def test_requests_go_through_the_process_scheduler(tmp_path, capsys, monkeypatch, threaded_stand_in):
+    import potparser.cli
+    schedulers = []
+
+    def create_scheduler(args):
+        schedulers.append(RequestScheduler(args.per_host_limit, max_running=args.concurrency, interactive_reserve=0))
+        return schedulers[-1]
+
+    monkeypatch.setattr(potparser.cli, "create_scheduler", create_scheduler)
+    with threaded_stand_in():
+        scrape(tmp_path, capsys, ["og-kush", "blue-dream"], "--per-host-limit", "2")
+    assert len(schedulers) == 1
+    stats = schedulers[0].stats()
+    assert stats["classes"]["interactive"]["granted"] == 6
+    assert stats["running"] == 0
@@ -0,0 +1,52 @@
+from potparser.webscrapers import CircuitBreakerRegistry, ResponseCache, scrape_strain_info
+
+
+def open_breakers(reset_timeout=600.0):
+    breakers = CircuitBreakerRegistry(failure_threshold=1, reset_timeout=reset_timeout)
+    for site in ("Cannaconnection", "Leafly", "Wikileaf"):
+        breakers.get(site).record_failure()
+    return breakers
+
+
+def test_open_breaker_serves_fresh_cached_pages(stand_in):
+    async def test(server):
+        cache = ResponseCache(":memory:", ttl=600)
+        await scrape_strain_info("og-kush", cache=cache)
+        requests = server.requests
+        results = await scrape_strain_info("og-kush", cache=cache, breakers=open_breakers())
+        return results, server.requests - requests
+
+    results, requests = stand_in(test)
+    assert [info["THC"] for info in results] == ["20-25%", "19%", "21%"]
+    assert requests == 0
+
+
+def test_open_breaker_blocks_uncached_pages(stand_in):
+    async def test(server):
+        return await scrape_strain_info("og-kush", cache=ResponseCache(":memory:"), breakers=open_breakers()), \
+            server.requests
+
+    results, requests = stand_in(test)
+    assert all(info["Missing"]["THC"] == "circuit_open" for info in results)
+    assert requests == 0
+
+
+def test_cache_hit_does_not_close_half_open_breaker(stand_in):
+    async def test(server):
+        cache = ResponseCache(":memory:", ttl=600)
+        await scrape_strain_info("og-kush", cache=cache)
+        breakers = open_breakers(reset_timeout=0.0)
+        await scrape_strain_info("og-kush", cache=cache, breakers=breakers)
+        return breakers.states()
+
+    assert set(stand_in(test).values()) == {"open"}
+
+
+def test_failed_request_opens_breaker(stand_in):
+    async def test(server):
+        server.error_rate = 1.0
+        breakers = CircuitBreakerRegistry(failure_threshold=1)
+        await scrape_strain_info("og-kush", breakers=breakers)
+        return breakers.states()
+
+    assert set(stand_in(test).values()) == {"open"}
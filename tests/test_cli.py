@@ -0,0 +1,16 @@
+import pytest
+
+from potparser.cli import UNATTENDED_SITE_TIMEOUT, parse_args
+
+
+@pytest.mark.parametrize("argv, site_timeout", [
+    ([], None),
+    (["scrape"], None),
+    (["query"], None),
+    (["serve"], UNATTENDED_SITE_TIMEOUT),
+    (["crawl"], UNATTENDED_SITE_TIMEOUT),
+    (["--site-timeout", "3", "serve"], 3.0),
+    (["--site-timeout", "3", "scrape"], 3.0),
+])
+def test_site_timeout_only_defaults_for_unattended_commands(argv, site_timeout):
+    assert parse_args(argv).site_timeout == site_timeout
@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import pytest
+
+from potparser.webscrapers import CatalogueCrawler, ChangeLog, CrawlState
+
+
+def write_entries(path, count):
+    changelog = ChangeLog(str(path))
+    for idx in range(count):
+        changelog.append("added", "Leafly", f"strain-{idx}", {"THC": f"{idx}%"}, None, f"hash-{idx}")
+    changelog.close()
+
+
+def read_seqs(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["seq"] for line in f]
+
+
+def test_changelog_continues_the_sequence(tmp_path):
+    path = tmp_path / "changes.jsonl"
+    write_entries(path, 3)
+    write_entries(path, 2)
+    assert read_seqs(path) == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.parametrize("block_size", [16, 64 * 1024])
+def test_changelog_drops_a_partly_written_entry(tmp_path, block_size):
+    path = tmp_path / "changes.jsonl"
+    write_entries(path, 3)
+    with open(path, "ab") as f:
+        f.write(b'{"seq": 4, "time": 1.0, "change": "upd')  # the crash cut the entry short
+    with open(path, "rb+") as f:
+        assert ChangeLog._recover(f, block_size) == 3
+    write_entries(path, 1)
+    assert read_seqs(path) == [1, 2, 3, 4]
+
+
+def test_changelog_of_only_a_partly_written_entry(tmp_path):
+    path = tmp_path / "changes.jsonl"
+    path.write_bytes(b'{"seq": 1, "ti')
+    write_entries(path, 1)
+    assert read_seqs(path) == [1]
+
+
+def crawl(stand_in, tmp_path, pairs, prepare=None):
+    async def test(server):
+        if prepare is not None:
+            prepare(server)
+        state, changelog = CrawlState(str(tmp_path / "crawl.sqlite3")), ChangeLog(str(tmp_path / "changes.jsonl"))
+        try:
+            return await CatalogueCrawler(state, changelog, rate=1000).crawl(pairs)
+        finally:
+            changelog.close()
+            state.close()
+
+    return stand_in(test)
+
+
+def read_changes(tmp_path):
+    path = tmp_path / "changes.jsonl"
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return sorted((entry["change"], entry["site"], entry["slug"]) for entry in map(json.loads, f))
+
+
+PAIRS = [("Leafly", "og-kush"), ("Wikileaf", "og-kush")]
+
+
+def test_crawl_logs_changes_once(stand_in, tmp_path):
+    assert crawl(stand_in, tmp_path, PAIRS)["added"] == 2
+    assert crawl(stand_in, tmp_path, PAIRS).get("added") is None
+    assert read_changes(tmp_path) == [("added", "Leafly", "og-kush"), ("added", "Wikileaf", "og-kush")]
+
+
+def test_failed_pages_stay_pending(stand_in, tmp_path):
+    def fail(server):
+        server.error_rate = 1.0
+
+    assert crawl(stand_in, tmp_path, PAIRS, fail)["errors"] == 2
+    assert read_changes(tmp_path) == []
+    stats = crawl(stand_in, tmp_path, PAIRS)
+    assert stats["added"] == 2
+    assert stats["skipped"] == 0
+
+
+def test_unparsable_pages_are_not_logged(stand_in, tmp_path):
+    def empty_page(server):
+        server._fixtures["leafly"]["og-kush"] = b""
+
+    crawl(stand_in, tmp_path, PAIRS)
+    stats = crawl(stand_in, tmp_path, PAIRS, empty_page)
+    assert stats["errors"] == 1
+    assert read_changes(tmp_path) == [("added", "Leafly", "og-kush"), ("added", "Wikileaf", "og-kush")]
+    # the resumed run skips the page crawled before and retries the one that failed
+    stats = crawl(stand_in, tmp_path, PAIRS)
+    assert stats["skipped"] == 1
+    assert "errors" not in stats
+
+
+def test_interrupted_crawl_resumes_the_pending_pages(stand_in, tmp_path):
+    async def interrupted(server):
+        server.site_latency = {"wikileaf": 1}
+        state, changelog = CrawlState(str(tmp_path / "crawl.sqlite3")), ChangeLog(str(tmp_path / "changes.jsonl"))
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(CatalogueCrawler(state, changelog, rate=1000).crawl(PAIRS), 0.3)
+        finally:
+            changelog.close()
+            state.close()
+
+    stand_in(interrupted)
+    assert read_changes(tmp_path) == [("added", "Leafly", "og-kush")]
+    stats = crawl(stand_in, tmp_path, PAIRS)
+    assert stats["skipped"] == 1 and stats["added"] == 1
+    assert read_changes(tmp_path) == [("added", "Leafly", "og-kush"), ("added", "Wikileaf", "og-kush")]
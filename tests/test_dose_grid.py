@@ -0,0 +1,24 @@
+import subprocess
+import sys
+
+RUN_CLI = "import sys; from potparser.cli import main; main(sys.argv[1:])"
+WITHOUT_NUMPY = "import sys; sys.modules['numpy'] = None; " + RUN_CLI
+
+
+def dose_grid(script: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-c", script, "dose-grid", *args], input="20\n", capture_output=True, text=True)
+
+
+def test_dose_grid(tmp_path):
+    output = tmp_path / "grid.csv"
+    result = dose_grid(RUN_CLI, "--doses", "1", "--output", str(output))
+    assert result.returncode == 0, result.stderr
+    assert "200" in output.read_text()
+
+
+def test_dose_grid_without_numpy(tmp_path):
+    output = tmp_path / "grid.csv"
+    result = dose_grid(WITHOUT_NUMPY, "--output", str(output))
+    assert result.returncode == 2
+    assert "pip install .[grid]" in result.stderr and "Traceback" not in result.stderr
+    assert not output.exists()
@@ -0,0 +1,11 @@
+import pytest
+
+from check_import_time import BUDGET_MS, FORBIDDEN, SCENARIOS, measure
+
+
+@pytest.mark.parametrize("scenario", ["package", "help", "calculator"])
+def test_fast_start_paths(scenario):
+    runs = [measure(SCENARIOS[scenario]) for _ in range(3)]
+    imported = set().union(*(modules for _, modules in runs))
+    assert not [module for module in FORBIDDEN if module in imported]
+    assert min(ms for ms, _ in runs) < BUDGET_MS
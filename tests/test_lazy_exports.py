@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Every import order has to leave the functions bound under the names they share with their modules
+IMPORT_ORDERS = [
+    "",
+    "from potparser.helpers import DoseGrid",
+    "from potparser.helpers import METHOD_COEFFICIENTS",
+    "import potparser.helpers.dose_grid",
+    "import potparser.helpers.mg_calculator",
+    "from potparser.helpers.dose_grid import DoseGrid",
+    "from potparser.cli import main",
+    "from potparser import PotParser",
+]
+
+
+def run(code):
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+
+
+@pytest.mark.parametrize("first_import", IMPORT_ORDERS)
+def test_functions_shadow_their_modules(first_import):
+    output = run(f"{first_import}\n"
+                 "import types\n"
+                 "from potparser.helpers import dose_grid, mg_calculator\n"
+                 "import potparser.helpers as helpers\n"
+                 "print(all(callable(f) and not isinstance(f, types.ModuleType)\n"
+                 "          for f in (dose_grid, mg_calculator, helpers.dose_grid, helpers.mg_calculator)))")
+    assert output.strip() == "True"
+
+
+def test_submodules_stay_importable():
+    output = run("import sys\n"
+                 "from potparser.helpers import mg_calculator\n"
+                 "import potparser.helpers.dose_grid\n"
+                 "print(sys.modules['potparser.helpers.dose_grid'].DoseGrid.__name__, mg_calculator(20, 0.5))")
+    assert output.split()[0] == "DoseGrid"
+
+
+def test_exports_are_listed():
+    output = run("import potparser.helpers as helpers\nprint('StrainStore' in dir(helpers))")
+    assert output.strip() == "True"
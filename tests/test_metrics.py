@@ -0,0 +1,75 @@
+import re
+
+import pytest
+
+from potparser.cli import main
+from potparser.webscrapers import DictMetricsSink, MetricsRegistry, SiteTiming
+
+SAMPLE_LINE = re.compile(r'^[a-z_]+\{([a-z]+="[^"]*",?)+\} [0-9.e+-]+$')
+
+
+def timing(site, total, status=200, cache=None, error=None, size=100):
+    timing = SiteTiming(site, "og-kush", f"https://{site.lower()}/og-kush")
+    timing.marks = {"start": 0.0, "end": total}
+    timing.status, timing.cache, timing.error, timing.bytes = status, cache, error, size
+    return timing
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    for total in (0.05, 0.5, 2.0):
+        registry(timing("Leafly", total))
+    rendered = registry.render()
+    assert 'potparser_phase_seconds_bucket{site="Leafly",phase="total",le="0.1"} 1\n' in rendered
+    assert 'potparser_phase_seconds_bucket{site="Leafly",phase="total",le="1.0"} 2\n' in rendered
+    assert 'potparser_phase_seconds_bucket{site="Leafly",phase="total",le="+Inf"} 3\n' in rendered
+    assert 'potparser_phase_seconds_count{site="Leafly",phase="total"} 3\n' in rendered
+    assert registry.histograms["Leafly", "total"][-1] == pytest.approx(2.55)
+
+
+def test_counters_are_labelled_by_site_and_status():
+    registry = MetricsRegistry()
+    registry(timing("Leafly", 0.1))
+    registry(timing("Leafly", 0.1))
+    registry(timing("Leafly", 0.0, status=None, cache="hit", size=0))
+    registry(timing("Wikileaf", 5.0, status=None, error="timeout", size=0))
+    registry(timing("Wikileaf", 0.1, status=404, size=20))
+    assert registry.requests == {("Leafly", "200"): 2, ("Leafly", "cached"): 1,
+                                 ("Wikileaf", "timeout"): 1, ("Wikileaf", "404"): 1}
+    assert registry.response_bytes == {"Leafly": 200, "Wikileaf": 20}
+
+
+def test_render_uses_the_exposition_format():
+    registry = MetricsRegistry()
+    registry(timing("Leafly", 0.1))
+    lines = registry.render().splitlines()
+    assert [line for line in lines if line.startswith("#")] == [
+        "# TYPE potparser_requests_total counter",
+        "# TYPE potparser_response_bytes_total counter",
+        "# TYPE potparser_phase_seconds histogram",
+    ]
+    assert all(SAMPLE_LINE.match(line) for line in lines if not line.startswith("#"))
+    assert 'potparser_requests_total{site="Leafly",status="200"} 1' in lines
+
+
+def test_dict_sink_keeps_plain_records():
+    sink = DictMetricsSink()
+    sink(timing("Leafly", 0.25, size=2048))
+    assert sink.records[0]["site"] == "Leafly" and sink.records[0]["bytes"] == 2048
+    assert sink.records[0]["total"] == 0.25
+    sink.clear()
+    assert sink.records == []
+
+
+def test_timings_option_prints_the_breakdown_under_the_strain_table(capsys, monkeypatch, threaded_stand_in):
+    answers = iter(["1", "og-kush", "exit"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    with threaded_stand_in():
+        with pytest.raises(SystemExit):
+            main(["--timings"])
+    output = capsys.readouterr().out
+    table_end = output.index("Wikileaf")
+    timings = output[output.index("Queue"):]
+    assert output.index("Queue") > table_end
+    assert all(re.search(site + r"\W+200\W", timings) for site in ("Cannaconnection", "Leafly", "Wikileaf"))
+    assert "TTFB" in timings and "Total (ms)" in timings
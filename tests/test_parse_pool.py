@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from potparser import PotParser
+from potparser.webscrapers import EXTRACTORS, ParsePool
+
+from server import load_fixtures
+
+FIXTURES = load_fixtures()
+PAGES = [(site, content) for site in EXTRACTORS for content in FIXTURES[site.lower()].values()]
+
+
+class SlowExecutor(ThreadPoolExecutor):
+    """Parses slowly and records the most pages it held at once."""
+    def __init__(self) -> None:
+        super().__init__(max_workers=1)
+        self.held = self.max_held = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        with self._lock:
+            self.held += 1
+            self.max_held = max(self.max_held, self.held)
+
+        def slow_parse():
+            time.sleep(0.005)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.held -= 1
+        return super().submit(slow_parse)
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_pool_parses_like_the_extractor(processes):
+    pool = ParsePool(max_workers=2, processes=processes)
+
+    async def parse_all():
+        return await asyncio.gather(*(pool.parse(EXTRACTORS[site], content, "utf-8") for site, content in PAGES))
+
+    try:
+        results = asyncio.run(parse_all())
+    finally:
+        pool.shutdown()
+    assert results == [EXTRACTORS[site].parse(content, "utf-8") for site, content in PAGES]
+
+
+def test_downloads_wait_for_the_parser(stand_in):
+    executor = SlowExecutor()
+    pool = ParsePool(max_pending=2, executor=executor)
+
+    async def test(server):
+        return await PotParser(parse_pool=pool).aget_strains([f"og-kush-{idx}" for idx in range(10)])
+
+    try:
+        results = stand_in(test)
+    finally:
+        executor.shutdown()
+    assert len(results) == 10 and all(info["THC"] != "None" for infos in results.values() for info in infos)
+    assert executor.max_held == 2
+
+
+def test_shutdown_is_idempotent_and_leaves_the_callers_executor_alone():
+    pool = ParsePool(max_workers=1)
+    pool.shutdown()
+    pool.shutdown()
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    ParsePool(executor=executor).shutdown()
+    assert executor.submit(sum, [1, 2]).result() == 3
+    executor.shutdown()
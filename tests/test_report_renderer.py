@@ -0,0 +1,59 @@
+import csv
+import io
+
+from potparser.helpers import StrainRecord
+from potparser.utils import CsvReport, GridReport, HtmlReport, MarkdownReport
+
+SITES = ["Leafly"]
+
+
+def record(name: str, genetics: str = "Hybrid", effects=("Relaxed",)) -> StrainRecord:
+    return StrainRecord.from_results(name, SITES, [{"Genetics": genetics, "THC": "20%", "CBD": "1%",
+                                                   "Effects": list(effects), "Missing": {}}])
+
+
+def render(report_class, records, **kwargs) -> str:
+    output = io.StringIO()
+    report_class(output, SITES, **kwargs).write_all(records)
+    return output.getvalue()
+
+
+def test_markdown_escapes_pipes():
+    lines = render(MarkdownReport, [record("og-kush", genetics="Indica | Sativa")]).splitlines()
+    assert "Indica \\| Sativa" in lines[2]
+    assert len(lines[2].replace("\\|", "").split("|")) == len(lines[0].split("|"))
+
+
+def test_html_escapes_cells():
+    report = render(HtmlReport, [record("og-kush", effects=["<b>Happy</b> & relaxed"])])
+    assert "<td>&lt;b&gt;Happy&lt;/b&gt; &amp; relaxed</td>" in report
+    assert "<b>" not in report
+
+
+def test_csv_quotes_cells():
+    report = render(CsvReport, [record("og-kush", effects=["Happy, relaxed", 'So "chill"'])])
+    rows = list(csv.reader(io.StringIO(report)))
+    assert rows[1][-1] == 'Happy, relaxed, So "chill"'
+
+
+def test_widths_are_sampled_from_the_first_rows():
+    records = [record("og-kush"), record("blue-dream", effects=["Relaxed", "Happy", "Euphoric", "Uplifted"])]
+    long_effects = "A very long list of effects well past the sampled width"
+    records += [record("gelato", effects=[long_effects])]
+    output = io.StringIO()
+    report = GridReport(output, SITES, sample_rows=2)
+    report.write(records[0])
+    assert output.getvalue() == ""  # held back while sampling
+    report.write_all(records[1:])
+    lines = output.getvalue().splitlines()
+    width = len("Relaxed, Happy, Euphoric, Uplifted")
+    assert report.widths[-1] == width
+    assert len({len(line) for line in lines}) == 1
+    assert f"│ {long_effects[:width - 1]}… │" in lines[-2]
+
+
+def test_narrow_columns_fit_their_cells():
+    lines = render(GridReport, [record("og-kush")], widths=0).splitlines()
+    assert len({len(line) for line in lines}) == 1
+    assert "│ … │" in lines[1]
+    assert render(GridReport, [record("og-kush")], widths=7).count("│ Relaxed │") == 1
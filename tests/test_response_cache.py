@@ -0,0 +1,53 @@
+import sqlite3
+
+from potparser.webscrapers import ResponseCache
+
+
+def accessed_at(path: str, slug: str) -> float:
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("SELECT accessed_at FROM responses WHERE slug = ?", (slug,)).fetchone()[0]
+    finally:
+        connection.close()
+
+
+def test_hits_do_not_write(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+    cache.put("Leafly", "og-kush", "<html></html>", {"THC": "19%"})
+    changes = cache._connection.total_changes
+    for _ in range(100):
+        assert cache.get("Leafly", "og-kush")["info"] == {"THC": "19%"}
+    assert cache._connection.total_changes == changes
+    cache.close()
+
+
+def test_hits_are_written_on_close(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    cache = ResponseCache(path)
+    cache.put("Leafly", "og-kush", "<html></html>", {})
+    stored = accessed_at(path, "og-kush")
+    cache.get("Leafly", "og-kush")
+    assert accessed_at(path, "og-kush") == stored
+    cache.close()
+    assert accessed_at(path, "og-kush") > stored
+
+
+def test_hits_are_written_after_the_interval(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    cache = ResponseCache(path, touch_interval=0)
+    cache.put("Leafly", "og-kush", "<html></html>", {})
+    stored = accessed_at(path, "og-kush")
+    cache.get("Leafly", "og-kush")
+    assert accessed_at(path, "og-kush") > stored
+    cache.close()
+
+
+def test_eviction_counts_pending_hits(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"), max_entries=2)
+    cache.put("Leafly", "og-kush", "<html></html>", {})
+    cache.put("Leafly", "gelato", "<html></html>", {})
+    cache.get("Leafly", "og-kush")
+    cache.put("Leafly", "zkittlez", "<html></html>", {})
+    assert cache.get("Leafly", "og-kush") is not None
+    assert cache.get("Leafly", "gelato") is None
+    cache.close()
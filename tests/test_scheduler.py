@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from potparser.webscrapers import BULK, INTERACTIVE, RequestScheduler
+
+
+async def run_requests(scheduler: RequestScheduler, requests, duration: float = 0.01):
+    order = []
+
+    async def request(url: str, priority: int) -> None:
+        async with scheduler.slot(url, priority):
+            order.append(url)
+            assert scheduler.max_running is None or scheduler.running <= scheduler.max_running
+            await asyncio.sleep(duration)
+
+    await asyncio.gather(*(request(url, priority) for url, priority in requests))
+    return order
+
+
+def test_hosts_take_turns_for_the_running_limit():
+    scheduler = RequestScheduler(host_concurrency=4, max_running=2, interactive_reserve=0)
+    requests = [("http://leafly/", BULK)] * 6 + [("http://wikileaf/", BULK)] * 2
+    order = asyncio.run(run_requests(scheduler, requests))
+    # Once both hosts wait, Wikileaf gets every other slot instead of waiting for Leafly's queue to drain
+    assert [idx for idx, url in enumerate(order) if url == "http://wikileaf/"] == [3, 5]
+
+
+def test_running_limit_keeps_a_slot_for_interactive_requests():
+    async def test():
+        scheduler = RequestScheduler(host_concurrency=8, max_running=3)
+        bulk = asyncio.ensure_future(run_requests(scheduler, [("http://leafly/", BULK)] * 20, duration=0.05))
+        await asyncio.sleep(0.01)
+        assert scheduler.running == 2
+        start = asyncio.get_running_loop().time()
+        await run_requests(scheduler, [("http://wikileaf/", INTERACTIVE)])
+        waited = asyncio.get_running_loop().time() - start
+        await bulk
+        return waited
+
+    assert asyncio.run(test()) < 0.04
+
+
+def test_running_limit_must_leave_background_slots():
+    with pytest.raises(ValueError):
+        RequestScheduler(host_concurrency=4, max_running=1, interactive_reserve=1)
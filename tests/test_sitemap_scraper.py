@@ -0,0 +1,62 @@
+import asyncio
+import gzip
+
+import aiohttp
+from aiohttp import web
+
+from potparser.webscrapers import SiteExtractor
+from potparser.webscrapers.sitemap_scraper import fetch_site_slugs
+
+INDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>{base}/slow-strains.xml</loc></sitemap>
+  <sitemap><loc>{base}/corrupt-strains.xml.gz</loc></sitemap>
+  <sitemap><loc>{base}/cut-strains.xml.gz</loc></sitemap>
+  <sitemap><loc>{base}/strains.xml</loc></sitemap>
+</sitemapindex>"""
+
+SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>{base}/strains/og-kush</loc></url>
+  <url><loc>{base}/strains/blue-dream</loc></url>
+</urlset>"""
+
+
+def test_slow_and_corrupt_sitemaps_are_skipped():
+    async def test():
+        async def index(request):
+            return web.Response(text=INDEX.format(base=base), content_type="application/xml")
+
+        async def slow(request):
+            await asyncio.sleep(1)
+            return web.Response(text=SITEMAP.format(base=base), content_type="application/xml")
+
+        async def sitemap(request):
+            return web.Response(text=SITEMAP.format(base=base), content_type="application/xml")
+
+        compressed = gzip.compress(b"<urlset><url><loc>https://example.com/strains/gelato</loc></url></urlset>")
+
+        async def corrupt(request):
+            return web.Response(body=compressed[:10] + b"x" * 20 + compressed[30:])
+
+        async def cut(request):
+            return web.Response(body=compressed[:20])
+
+        app = web.Application()
+        app.router.add_get("/sitemap.xml", index)
+        app.router.add_get("/slow-strains.xml", slow)
+        app.router.add_get("/strains.xml", sitemap)
+        app.router.add_get("/corrupt-strains.xml.gz", corrupt)
+        app.router.add_get("/cut-strains.xml.gz", cut)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        base = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        extractor = SiteExtractor("Example", base + "/strains/{strain_name}", {}, {}, sitemap_url=base + "/sitemap.xml")
+        try:
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=0.2)) as session:
+                return await fetch_site_slugs(session, extractor)
+        finally:
+            await runner.cleanup()
+
+    assert asyncio.run(test()) == {"og-kush", "blue-dream"}
@@ -0,0 +1,59 @@
+from potparser import PotParser
+from potparser.helpers import SlugIndex
+
+SLUGS = ["og-kush", "gelato", "gelato-41", "girl-scout-cookies", "blue-dream", "sour-diesel"]
+
+
+def test_resolves_exact_names():
+    index = SlugIndex({"Leafly": SLUGS})
+    assert index.resolve("OG Kush", "Leafly") == "og-kush"
+    assert index.resolve("gelato", "Leafly") == "gelato"
+
+
+def test_resolves_acronyms():
+    index = SlugIndex({"Leafly": SLUGS})
+    assert index.resolve("GSC", "Leafly") == "girl-scout-cookies"
+    assert index.resolve("sd", "Leafly") == "sour-diesel"
+
+
+def test_similar_names_are_only_suggested():
+    index = SlugIndex({"Leafly": SLUGS})
+    for name in ("kush", "Gelato 33", "girl scout cooky"):
+        assert index.resolve(name, "Leafly") is None
+    assert index.suggest("girl scout cooky", "Leafly")[0][0] == "girl-scout-cookies"
+    assert index.suggest_all("Gelato 33")[:2] == ["gelato", "gelato-41"]
+
+
+def test_suggestions_need_the_minimum_score():
+    index = SlugIndex({"Leafly": SLUGS}, min_score=0.6)
+    assert all(score >= 0.6 for _, score in index.suggest("blue dreams", "Leafly"))
+    assert index.suggest("zkittlez", "Leafly") == []
+
+
+def test_websites_without_slugs_get_the_name_as_given():
+    index = SlugIndex({"Leafly": SLUGS})
+    assert index.resolve_all("Gelato 33", ["Leafly", "Wikileaf"]) == {"Leafly": None, "Wikileaf": "gelato-33"}
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "slugs.json.gz")
+    SlugIndex({"Leafly": SLUGS, "Wikileaf": ["og-kush"]}).save(path)
+    index = SlugIndex.load(path, min_score=0.5)
+    assert index.sites == ["Leafly", "Wikileaf"]
+    assert index.slugs("Leafly") == set(SLUGS) and len(index) == len(SLUGS) + 1
+    assert index.min_score == 0.5
+    assert index.resolve("GSC", "Leafly") == "girl-scout-cookies"
+
+
+def test_lookup_records_the_resolved_slug(stand_in):
+    index = SlugIndex({"Cannaconnection": ["girl-scout-cookies"], "Leafly": ["girl-scout-cookies"],
+                       "Wikileaf": ["blue-dream"]})
+
+    async def test(server):
+        return await PotParser(slug_index=index).aget_record("GSC"), server.requests
+
+    record, requests = stand_in(test)
+    assert requests == 2  # Wikileaf has no match and is not requested
+    assert [source.slug for source in record.sources] == ["girl-scout-cookies", "girl-scout-cookies", None]
+    assert record.source("Leafly").effects
+    assert record.source("Wikileaf").reason("Effects") == "unresolved"
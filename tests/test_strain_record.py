@@ -0,0 +1,66 @@
+import io
+import sqlite3
+
+import pytest
+
+from potparser.helpers import StrainRecord, StrainStore
+from potparser.helpers.strain_record import _shared_tuple, intern_strings
+from potparser.utils import GridReport, create_strain_info_table
+
+TEXTS = ["<1%", "0.10%", "THC 18-22%", "High"]
+
+
+def record(thc: str, cbd: str = "None") -> StrainRecord:
+    return StrainRecord.from_results("og-kush", ["Leafly"], [{"Genetics": "Hybrid", "THC": thc, "CBD": cbd,
+                                                             "Effects": ["Relaxed"], "Missing": {}}])
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_table_shows_the_websites_text(text):
+    source = record(text, text).sources[0]
+    assert source.thc == source.cbd == text
+    assert source.to_strain_info()["THC"] == text
+    table = create_strain_info_table(record(text, text))
+    assert table.count(text) == 2 and "not a percentage" not in table
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_report_shows_the_websites_text(text):
+    output = io.StringIO()
+    GridReport(output, ["Leafly"], widths=40).write_all([record(text)])
+    assert f" {text} " in output.getvalue()
+
+
+def test_percentages_parsed_for_ranges():
+    assert record("<1%").thc_range == (0.0, 1.0)
+    assert record("THC 18-22%").thc_range == (18.0, 22.0)
+    assert record("High").thc_range == (None, None)
+    assert record("High").sources[0].reason("THC") == "not_a_percentage"
+
+
+def test_store_keeps_the_websites_text(tmp_path):
+    store = StrainStore(str(tmp_path / "strains.sqlite3"))
+    store.put(record("THC 18-22%", "<1%"))
+    stored = store.get("OG Kush")
+    assert stored.sources[0].thc == "THC 18-22%" and stored.sources[0].cbd == "<1%"
+    assert [found.name for found in store.query(min_thc=20, max_cbd=0.5)] == ["og-kush"]
+    store.close()
+
+
+def test_store_created_without_texts_is_upgraded(tmp_path):
+    path = str(tmp_path / "strains.sqlite3")
+    StrainStore(path).close()
+    connection = sqlite3.connect(path)
+    connection.executescript("ALTER TABLE sources DROP COLUMN thc_text; ALTER TABLE sources DROP COLUMN cbd_text;")
+    connection.close()
+    store = StrainStore(path)
+    store.put(record("19%"))
+    assert store.get("og-kush").sources[0].thc == "19%"
+    store.close()
+
+
+def test_equal_lists_are_shared_but_not_kept_forever():
+    assert intern_strings(["Relaxed", "Happy"]) is intern_strings(["Relaxed", "Happy"])
+    for idx in range(5000):
+        intern_strings([f"effect-{idx}"])
+    assert _shared_tuple.cache_info().currsize <= 4096
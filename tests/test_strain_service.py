@@ -0,0 +1,69 @@
+import asyncio
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from potparser import PotParser
+from potparser.views.strain_service import StrainService
+
+
+def lookup_repeatedly(stand_in, parser, lookups=5, site_latency=None):
+    async def test(server):
+        server.site_latency = site_latency or {}
+        service = StrainService(parser)
+        await service._start(None)
+        try:
+            for _ in range(lookups):
+                await service.get_record("og-kush")
+        finally:
+            await service._stop(None)
+        return len(service.results), server.requests
+
+    return stand_in(test)
+
+
+def test_complete_results_are_kept(stand_in):
+    assert lookup_repeatedly(stand_in, PotParser()) == (1, 3)
+
+
+def test_quorum_results_are_kept(stand_in):
+    assert lookup_repeatedly(stand_in, PotParser(quorum=2), site_latency={"wikileaf": 0.5}) == (1, 3)
+
+
+def test_deadline_results_are_kept_if_any_website_answered(stand_in):
+    assert lookup_repeatedly(stand_in, PotParser(deadline=0.2), site_latency={"wikileaf": 0.5}) == (1, 3)
+
+
+def test_deadline_results_without_any_answer_are_retried(stand_in):
+    assert lookup_repeatedly(stand_in, PotParser(deadline=0.05), 2, {"cannaconnection": 0.5, "leafly": 0.5,
+                                                                     "wikileaf": 0.5}) == (0, 6)
+
+
+def test_failed_results_are_retried(stand_in):
+    async def test(server):
+        server.error_rate = 1.0
+        service = StrainService(PotParser())
+        await service._start(None)
+        try:
+            await service.get_record("og-kush")
+            await service.get_record("og-kush")
+        finally:
+            await service._stop(None)
+        return len(service.results), server.requests
+
+    assert stand_in(test) == (0, 6)
+
+
+def test_dose_rejects_non_finite_values():
+    async def test():
+        client = TestClient(TestServer(StrainService(PotParser()).create_app()))
+        await client.start_server()
+        try:
+            return {query: (await client.get(f"/dose?{query}")).status
+                    for query in ("thc=20&grams=1", "thc=inf&grams=1", "thc=20&grams=nan", "thc=-inf&grams=1",
+                                  "thc=1e400&grams=1", "thc=20&grams=-1", "thc=high&grams=1")}
+        finally:
+            await client.close()
+
+    statuses = asyncio.run(test())
+    assert statuses.pop("thc=20&grams=1") == 200
+    assert set(statuses.values()) == {400}
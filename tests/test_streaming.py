@@ -0,0 +1,82 @@
+import pytest
+
+from potparser.webscrapers import ResponseCache, SiteExtractor, scrape_strain_info
+from potparser.webscrapers.extractors import EXTRACTORS, IncrementalExtraction
+
+from server import load_fixtures
+
+FIXTURES = load_fixtures()
+CHUNK_SIZE = 1024
+
+EXAMPLE = SiteExtractor(
+    "Example", "https://strains.example.com/{strain_name}",
+    text_fields={"THC": '//dd[@class="thc"]', "CBD": '//dd[@class="cbd"]'},
+    list_fields={"Effects": '//div[contains(@class, "effects")]//li/text()'},
+    fallbacks={"CBD": '//dd[@class="cbg"]'},
+    containers={"Effects": '//div[@id="effects"]'})
+
+
+def stream(extractor, page):
+    """Feeds the page chunk by chunk, returns the strain information and the number of bytes read."""
+    extraction = IncrementalExtraction(extractor, "utf-8")
+    read = 0
+    for start in range(0, len(page), CHUNK_SIZE):
+        read = min(start + CHUNK_SIZE, len(page))
+        if extraction.feed(page[start:read]):
+            break
+    return extraction.close(), read
+
+
+def page(body):
+    filler = "<p>" + "lorem ipsum " * 2000 + "</p>"
+    return f"<html><body>{body}{filler}</body></html>".encode()
+
+
+@pytest.mark.parametrize("site, strain_name", [(site, strain_name) for site in EXTRACTORS
+                                               for strain_name in FIXTURES[site.lower()]])
+def test_streamed_fixture_matches_full_parse(site, strain_name):
+    content = FIXTURES[site.lower()][strain_name]
+    assert stream(EXTRACTORS[site], content)[0] == EXTRACTORS[site].parse(content, "utf-8")
+
+
+def test_stops_once_every_field_is_found():
+    content = page('<dd class="thc">20%</dd><dd class="cbg">1%</dd>'
+                   '<div id="effects" class="effects"><ul><li>Relaxed</li><li>Happy</li></ul></div>')
+    strain_info, read = stream(EXAMPLE, content)
+    assert read < len(content)
+    assert strain_info == EXAMPLE.parse(content, "utf-8")
+    assert strain_info["CBD"] == "1%"  # found through the fallback
+
+
+@pytest.mark.parametrize("effects", [
+    # a string of the list outside of the container
+    '<div class="effects"><ul><li>Dry mouth</li></ul></div>'
+    '<div id="effects" class="effects"><ul><li>Relaxed</li></ul></div>',
+    # the container expression matching more than one element
+    '<div id="effects" class="effects"><ul><li>Dry mouth</li></ul></div>'
+    '<div id="effects" class="effects"><ul><li>Relaxed</li></ul></div>',
+])
+def test_reads_to_the_end_if_the_container_does_not_hold_the_whole_list(effects):
+    content = page('<dd class="thc">20%</dd><dd class="cbd">1%</dd>' + effects)
+    strain_info, read = stream(EXAMPLE, content)
+    assert read == len(content)
+    assert strain_info["Effects"] == ["Dry mouth", "Relaxed"]
+
+
+def test_streamed_lookup_matches_downloaded_lookup(stand_in):
+    async def test(server):
+        return await scrape_strain_info("blue-dream", stream=True), await scrape_strain_info("blue-dream")
+
+    streamed, downloaded = stand_in(test)
+    assert streamed == downloaded
+
+
+def test_streamed_page_read_to_the_end_is_cached_with_its_html(stand_in):
+    cache = ResponseCache(":memory:")
+
+    async def test(server):
+        return await scrape_strain_info("blue-dream", cache=cache, stream=True)
+
+    stand_in(test)
+    # The effects have no container, so the whole page is read and worth keeping
+    assert all(cache.get(site, "blue-dream")["html"] for site in EXTRACTORS)